@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Benchmark por etapa: montagem, solução, avaliação em malha e renderização
+
+Varre n_terms e a resolução da malha para cada problema do EDPCatalog e
+mede cada etapa separadamente (melhor e mediana de --repeat execuções,
+sem cache em disco). Os resultados vão para JSON com o commit e as versões
+das bibliotecas, e --compare mostra a razão de tempos contra outra
+execução. Uso:
+
+    python benchmarks/bench_stages.py                        # varredura padrão
+    python benchmarks/bench_stages.py poisson_1d --n-terms 64 256 1024
+    python benchmarks/bench_stages.py --json atual.json --compare base.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "core")]
+
+import numpy as np
+
+from galerkin_solver import GalerkinSolver
+from problems import EDPCatalog
+
+N_TERMS = [8, 32, 128, 512]
+RESOLUTIONS = [64, 256, 1024]
+
+# Instantes avaliados nos problemas temporais (campo espaço-tempo)
+N_TIMES = 100
+
+STAGES = ("assembly", "solve", "evaluate", "render")
+
+
+def _assembly_and_solve(solver, n_terms):
+    """(montagem, solução) do tipo de EDP; a solução recebe o que a montagem devolve"""
+    if solver.tipo == "eliptica_1d":
+        return (lambda: solver._assemble_poisson_1d(n_terms),
+                lambda system: solver._poisson_solution(system[0].solve(system[1])))
+    if solver.tipo == "parabolica_1d":
+        return (lambda: solver._initial_coefficients(n_terms), solver._heat_solution)
+    if solver.tipo == "onda_primeira_ordem":
+        return (lambda: solver._wave_coefficients(n_terms), solver._wave_solution)
+    if solver.tipo == "eliptica_2d":
+        def solve(system):
+            A, rhs, basis_x, basis_y = system
+            return solver._helmholtz_solution(A.solve(rhs), basis_x, basis_y)
+        return (lambda: solver._assemble_helmholtz_2d(n_terms), solve)
+    raise ValueError(f"Tipo de EDP não suportado: {solver.tipo}")
+
+
+def _grid(problem, resolution):
+    """Argumentos de evaluate_grid para a malha de `resolution` pontos por eixo"""
+    domain = problem["domain"]
+    if problem["tipo"] == "eliptica_2d":
+        return (np.linspace(*domain[0], resolution), np.linspace(*domain[1], resolution))
+    t = np.linspace(*problem.get("time_domain", (0.0, 0.0)), N_TIMES) \
+        if "time_domain" in problem else np.zeros(1)
+    return (np.linspace(*domain, resolution), t)
+
+
+def _render(field, directory, perfil):
+    """Figura representativa do campo avaliado (linha ou contorno preenchido)"""
+    from renderizacao import pyplot, salvar_figura
+    plt = pyplot()
+    fig, ax = plt.subplots(figsize=(8, 6))
+    if field.shape[0] == 1:
+        ax.plot(field[0], 'b-o', markersize=3)
+    else:
+        fig.colorbar(ax.contourf(field, levels=30, cmap='viridis'), ax=ax)
+    return salvar_figura(fig, os.path.join(directory, "bench.png"), 300, perfil)
+
+
+def time_call(function, repeat):
+    """Executa `function` repeat vezes; retorna (último resultado, tempos em s)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return result, times
+
+
+def _record(problem_name, stage, n_terms, resolution, times):
+    return {
+        "problem": problem_name,
+        "stage": stage,
+        "n_terms": n_terms,
+        "resolution": resolution,
+        "best_s": min(times),
+        "median_s": statistics.median(times),
+        "repeat": len(times),
+    }
+
+
+def run(problem_names, n_terms_list, resolutions, repeat=3, perfil="rascunho", render=True):
+    """Varredura completa; retorna a lista de registros por etapa"""
+    catalog = EDPCatalog()
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        for problem_name in problem_names:
+            problem = catalog.get_problem(problem_name)
+            solver = GalerkinSolver()
+            solver.problem, solver.tipo = problem, problem["tipo"]
+            for n_terms in n_terms_list:
+                assemble, solve = _assembly_and_solve(solver, n_terms)
+                system, times = time_call(assemble, repeat)
+                records.append(_record(problem_name, "assembly", n_terms, None, times))
+                solution, times = time_call(lambda: solve(system), repeat)
+                records.append(_record(problem_name, "solve", n_terms, None, times))
+                for resolution in resolutions:
+                    grid = _grid(problem, resolution)
+                    field, times = time_call(lambda: solution.evaluate_grid(*grid), repeat)
+                    records.append(_record(problem_name, "evaluate", n_terms, resolution, times))
+                    # A renderização não depende de N: mede-se só com o maior
+                    if render and n_terms == max(n_terms_list):
+                        _, times = time_call(lambda: _render(field, directory, perfil), repeat)
+                        records.append(_record(problem_name, "render", n_terms, resolution, times))
+    return records
+
+
+def environment():
+    """Commit, versões e máquina, para comparar execuções"""
+    import scipy
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    versions = {"python": platform.python_version(), "numpy": np.__version__,
+                "scipy": scipy.__version__}
+    try:
+        import matplotlib
+        versions["matplotlib"] = matplotlib.__version__
+    except ImportError:
+        pass
+    return {"commit": commit, "versions": versions, "machine": platform.platform(),
+            "cpu_count": os.cpu_count()}
+
+
+def _key(record):
+    return (record["problem"], record["stage"], record["n_terms"], record["resolution"])
+
+
+def compare(records, baseline_path):
+    """Razão base/atual (>1 = mais rápido agora) para cada registro em comum"""
+    with open(baseline_path) as f:
+        baseline = {_key(record): record for record in json.load(f)["results"]}
+    ratios = []
+    for record in records:
+        before = baseline.get(_key(record))
+        if before is not None and record["best_s"] > 0:
+            ratios.append((record, before["best_s"] / record["best_s"]))
+    return ratios
+
+
+def _format_case(record):
+    resolution = f" malha {record['resolution']}" if record["resolution"] else ""
+    return f"{record['problem']:<13} {record['stage']:<9} N={record['n_terms']:<5}{resolution}"
+
+
+def main(argv=None):
+    catalog_names = list(EDPCatalog().get_all_problems())
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("problems", nargs="*", default=catalog_names,
+                        help=f"problemas do catálogo ({', '.join(catalog_names)})")
+    parser.add_argument("--n-terms", type=int, nargs="+", default=N_TERMS)
+    parser.add_argument("--resolutions", type=int, nargs="+", default=RESOLUTIONS,
+                        help="pontos por eixo na avaliação e na figura")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--perfil", default="rascunho", help="perfil de renderização")
+    parser.add_argument("--no-render", action="store_true", help="pula a etapa de figuras")
+    parser.add_argument("--json", help="arquivo de saída com os resultados")
+    parser.add_argument("--compare", help="JSON de uma execução anterior para comparação")
+    args = parser.parse_args(argv)
+
+    unknown = sorted(set(args.problems) - set(catalog_names))
+    if unknown:
+        parser.error(f"problemas desconhecidos: {', '.join(unknown)}")
+
+    records = run(args.problems, args.n_terms, args.resolutions, args.repeat,
+                  args.perfil, render=not args.no_render)
+    for record in records:
+        print(f"⏱️ {_format_case(record):<48} {1000 * record['best_s']:10.3f} ms "
+              f"(mediana {1000 * record['median_s']:.3f})")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "repeat": args.repeat,
+                       "results": records}, f, indent=2)
+
+    if args.compare:
+        print(f"\n📊 Comparação com {args.compare} (base/atual, >1 = mais rápido):")
+        for record, ratio in compare(records, args.compare):
+            marker = "🟢" if ratio > 1.1 else "🔴" if ratio < 0.9 else "⚪"
+            print(f"  {marker} {_format_case(record):<48} {ratio:6.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Comparação entre a solução espectral e os métodos alternativos
+
+Os resolvers de produção só calculam a família espectral usada nos
+gráficos; as comparações com elementos finitos (P2 em malha graduada,
+Q1 com multigrid, autovalores por shift-invert) e entre os métodos de
+somação de séries com Gibbs ficam aqui, com o tempo de cada caso. Uso:
+
+    python benchmarks/method_comparison.py                 # todos os problemas
+    python benchmarks/method_comparison.py poisson_1d
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "core")]
+
+import numpy as np
+
+from convergence_analyzer import ConvergenceAnalyzer
+from galerkin_solver import GalerkinSolver
+from problems import EDPCatalog
+
+
+def _timed(function, *args, **kwargs):
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def compare_poisson(problem, solver, analyzer):
+    """Elementos finitos P2 em malha graduada em direção a x = 0"""
+    fem, elapsed = _timed(solver.solve, problem, 64, method="fem", order=2, grading=3)
+    error = analyzer.error_norms({64: fem}, [64], problem)['l2'][0]
+    return [(f"FEM P2 graduada (64 elementos): erro L² = {error:.3e}", elapsed)]
+
+
+def compare_helmholtz(problem, solver, analyzer):
+    """Elementos finitos Q1 (CG com multigrid) na mesma forma fraca e autovalor"""
+    fem, elapsed = _timed(solver.solve, problem, 128, method="fem")
+    error = analyzer.error_norms({128: fem}, [128], problem)['l2'][0]
+    # Autovalor mais próximo de λ por eigsh com shift-invert na malha Q1,
+    # contra o valor exato da base espectral
+    spectral = solver.resonance(problem)
+    resonance, eig_elapsed = _timed(solver.resonance, problem, 256, method="fem")
+    return [
+        (f"FEM Q1 (128 × 128 elementos): erro L² = {error:.3e}", elapsed),
+        (f"Ressonância FEM Q1 256 × 256: μ = {resonance['eigenvalue']:.6f} "
+         f"(espectral {spectral['eigenvalue']:.6f})", eig_elapsed),
+    ]
+
+
+def compare_wave(problem, solver, analyzer):
+    """Somação da série de u(x,0) = 1 com Gibbs: parcial, Lanczos e Wynn
+
+    Longe dos saltos em x = 0 e x = 1 o ε de Wynn recupera a precisão com
+    os mesmos 25 termos; o indicador devolvido é heurístico (ver summation).
+    """
+    solution = solver.solve(problem, 25)
+    x_interior = np.linspace(0.05, 0.95, 181)
+    lines = []
+    for method in ("partial", "lanczos", "wynn"):
+        (values, indicator), elapsed = _timed(solution.evaluate_summed, x_interior, 0.0, method)
+        lines.append((f"Somação {method:<8} (N = 25, t = 0, x ∈ [0.05, 0.95]): "
+                      f"erro máx = {np.max(np.abs(values - 1)):.1e}, "
+                      f"indicador = {np.max(indicator):.1e}", elapsed))
+    return lines
+
+
+# problema do catálogo -> função (problema, solver, analisador) -> [(linha, segundos)]
+COMPARISONS = {
+    "poisson_1d": compare_poisson,
+    "wave_1d": compare_wave,
+    "helmholtz_2d": compare_helmholtz,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("problems", nargs="*", default=list(COMPARISONS),
+                        help=f"problemas comparados ({', '.join(COMPARISONS)})")
+    args = parser.parse_args(argv)
+
+    unknown = sorted(set(args.problems) - set(COMPARISONS))
+    if unknown:
+        parser.error(f"problemas desconhecidos: {', '.join(unknown)}")
+
+    catalog = EDPCatalog()
+    for name in args.problems:
+        solver = GalerkinSolver()
+        analyzer = ConvergenceAnalyzer(solver)
+        print(f"🔬 {name}")
+        for line, elapsed in COMPARISONS[name](catalog.get_problem(name), solver, analyzer):
+            print(f"  {line}  ({1000 * elapsed:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
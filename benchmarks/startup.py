@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de inicialização a frio (python -X importtime)
+
+Importa cada alvo em um interpretador novo, repetidas vezes, e reporta a
+mediana do tempo total de importação, os módulos mais caros e quais
+dependências pesadas (sympy, scipy, matplotlib) foram carregadas sem
+necessidade. Uso:
+
+    python benchmarks/startup.py                  # alvos padrão
+    python benchmarks/startup.py core resolver_calor --repeat 9
+    python benchmarks/startup.py --json startup.json --max-ms 150
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TARGETS = ["core", "core.galerkin_solver", "resolver_poisson", "resolver_calor",
+           "resolver_onda", "resolver_helmholtz", "pipeline_edps"]
+
+# Pacotes que não devem ser carregados apenas por importar os alvos
+HEAVY = ["sympy", "scipy", "matplotlib"]
+
+
+def parse_importtime(stderr):
+    """Linhas do -X importtime -> {módulo: (self_us, cumulativo_us)}
+
+    O nome preserva o recuo da saída (dois espaços por nível de aninhamento).
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules[name[1:].rstrip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure(target, repeat=5):
+    """Mede a importação de um alvo em `repeat` interpretadores novos"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, "core")]))
+    totals, runs = [], []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {target}"],
+                              cwd=ROOT, env=env, capture_output=True, text=True)
+        if proc.returncode != 0:
+            raise RuntimeError(f"Falha ao importar {target}:\n{proc.stderr[-500:]}")
+        modules = parse_importtime(proc.stderr)
+        # Módulos de nível superior (sem recuo) somam o tempo total
+        totals.append(sum(cumulative for name, (_, cumulative) in modules.items()
+                          if name == name.lstrip()) / 1000)
+        runs.append(modules)
+
+    median_run = runs[totals.index(statistics.median_low(totals))]
+    slowest = sorted(((name.strip(), cumulative / 1000) for name, (_, cumulative)
+                      in median_run.items()), key=lambda item: -item[1])
+    loaded = {name.strip().split(".")[0] for name in median_run}
+    return {
+        "target": target,
+        "median_ms": statistics.median(totals),
+        "min_ms": min(totals),
+        "max_ms": max(totals),
+        "slowest": slowest[:10],
+        "heavy_loaded": [package for package in HEAVY if package in loaded],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("targets", nargs="*", default=TARGETS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--json", help="arquivo de saída com os resultados")
+    parser.add_argument("--max-ms", type=float,
+                        help="falha (código 1) se algum alvo exceder este tempo")
+    args = parser.parse_args(argv)
+
+    results = []
+    for target in args.targets:
+        result = measure(target, args.repeat)
+        results.append(result)
+        heavy = ", ".join(result["heavy_loaded"]) or "nenhuma"
+        print(f"⏱️ {target:<22} {result['median_ms']:8.1f} ms "
+              f"(min {result['min_ms']:.1f}, máx {result['max_ms']:.1f}) | pesadas: {heavy}")
+        for name, cumulative in result["slowest"][:3]:
+            print(f"     {cumulative:8.1f} ms  {name}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version, "repeat": args.repeat, "results": results},
+                      f, indent=2)
+
+    if args.max_ms is not None:
+        slow = [r["target"] for r in results if r["median_ms"] > args.max_ms]
+        if slow:
+            print(f"❌ Acima de {args.max_ms} ms: {', '.join(slow)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
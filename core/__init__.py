@@ -6,8 +6,31 @@ Focused on solving 4 specific PDEs using Galerkin method with convergence analys
 __version__ = "2.0.0"
 __author__ = "EDP Solver Team"
 
-from .problems import EDPCatalog
-from .galerkin_solver import GalerkinSolver
-from .convergence_analyzer import ConvergenceAnalyzer
+import importlib
 
-__all__ = ['EDPCatalog', 'GalerkinSolver', 'ConvergenceAnalyzer']
+# Exportações carregadas sob demanda (PEP 562): "import core" não importa
+# NumPy/SciPy nem os módulos do solver até o primeiro acesso
+_EXPORTS = {
+    'EDPCatalog': '.problems',
+    'GalerkinSolver': '.galerkin_solver',
+    'ConvergenceAnalyzer': '.convergence_analyzer',
+    'SeriesSolution': '.series',
+    'SeriesSolution2D': '.series',
+    'FEMSolution': '.fem',
+    'FEMSolution2D': '.fem2d',
+    'Profiler': '.profiling',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
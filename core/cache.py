@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Cache persistente de coeficientes em disco
+
+Cada entrada é um arquivo .npz (sem compressão) com os arrays da solução e
+seus metadados, identificado por um hash estável do problema do catálogo
+(domínio, condições, parâmetros e impressão digital das funções), do
+número de termos e da versão do solver. O diretório é limitado em tamanho
+com despejo LRU (a data de modificação é atualizada a cada acerto).
+"""
+
+import functools
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    from .fast_transforms import as_array_function
+    from .series import SeriesSolution, SeriesSolution2D
+    from .fem import FEMSolution
+    from .fem2d import FEMSolution2D
+except ImportError:
+    from fast_transforms import as_array_function
+    from series import SeriesSolution, SeriesSolution2D
+    from fem import FEMSolution
+    from fem2d import FEMSolution2D
+
+SOLUTION_CLASSES = {cls.__name__: cls for cls in (SeriesSolution, SeriesSolution2D, FEMSolution,
+                                                  FEMSolution2D)}
+
+# Pontos de prova fixos para a impressão digital de funções
+_PROBES = np.linspace(0.05, 0.95, 7) + 0.0123
+
+
+def _code_fingerprint(code):
+    """Representação estável de um objeto de código (bytecode e constantes)"""
+    consts = [_code_fingerprint(c) if hasattr(c, "co_code") else repr(c)
+              for c in code.co_consts]
+    return [code.co_code.hex(), consts, list(code.co_names)]
+
+
+def fingerprint(value):
+    """Forma canônica serializável em JSON de uma entrada do catálogo"""
+    if isinstance(value, dict):
+        return {str(k): fingerprint(v) for k, v in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [fingerprint(v) for v in value]
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    if isinstance(value, (int, float, np.number)):
+        return np.format_float_scientific(float(value), precision=12)
+    if isinstance(value, functools.partial):
+        return {"partial": fingerprint(value.func), "args": fingerprint(value.args),
+                "keywords": fingerprint(value.keywords)}
+    if callable(value):
+        code = getattr(value, "__code__", None)
+        entry = {"code": _code_fingerprint(code) if code is not None else repr(value)}
+        # Amostras nos pontos de prova distinguem funções de mesmo código
+        # com valores capturados diferentes
+        n_args = code.co_argcount if code is not None else 1
+        try:
+            with np.errstate(all="ignore"):
+                if n_args == 2:
+                    samples = np.asarray(value(_PROBES[:, None], _PROBES[None, :]), dtype=float)
+                else:
+                    samples = as_array_function(value)(_PROBES)
+            entry["samples"] = [fingerprint(v) for v in np.ravel(samples)]
+        except Exception:
+            pass
+        return entry
+    return repr(value)
+
+
+def problem_key(problem, n_terms, version, **options):
+    """Hash SHA-256 estável do problema, de n_terms, da versão e das opções"""
+    payload = {
+        "problem": fingerprint(problem),
+        "n_terms": int(n_terms),
+        "version": str(version),
+        "options": fingerprint(options),
+    }
+    text = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def pack_solution(solution):
+    """Arrays que reconstroem a solução (argumentos do __reduce__)"""
+    cls, args = solution.__reduce__()
+    arrays = {f"arg{i}": np.asarray(arg) for i, arg in enumerate(args)}
+    return arrays, {"class": cls.__name__, "n_args": len(args)}
+
+
+def unpack_solution(arrays, metadata):
+    cls = SOLUTION_CLASSES[metadata["class"]]
+    return cls(*(arrays[f"arg{i}"] for i in range(metadata["n_args"])))
+
+
+class CoefficientCache:
+    """Cache LRU de soluções em arquivos .npz, limitado por tamanho"""
+
+    def __init__(self, directory, max_bytes=256 * 2**20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        """Solução armazenada para a chave, ou None"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                metadata = json.loads(str(data["__metadata__"]))
+                arrays = {name: data[name] for name in data.files if name != "__metadata__"}
+        except (OSError, KeyError, ValueError):
+            return None
+        # Marca o acesso para a política LRU
+        os.utime(path)
+        return unpack_solution(arrays, metadata)
+
+    def put(self, key, solution, **metadata):
+        """Armazena a solução de forma atômica e aplica o limite de tamanho"""
+        arrays, meta = pack_solution(solution)
+        meta.update(metadata)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, __metadata__=np.array(json.dumps(meta)), **arrays)
+            os.replace(tmp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.evict()
+
+    def entries(self):
+        """Entradas (caminho, tamanho, mtime) da mais antiga para a mais recente"""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npz"):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return sorted(entries, key=lambda entry: entry[2])
+
+    def evict(self):
+        """Remove as entradas menos usadas até caber em max_bytes"""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        for path, _, _ in self.entries():
+            os.remove(path)
@@ -1,51 +1,234 @@
 #!/usr/bin/env python3
 """
-Analisador de Convergência Simplificado
+Analisador de convergência com normas de erro reais
+
+Mede os erros L², H¹ e máximo de uma família de soluções em série contra
+problem["analytical"] ou, na ausência dela, contra uma solução de
+referência com muitos termos (calculada uma vez e mantida em cache). Toda
+a família é avaliada de uma só vez: os coeficientes das várias truncações
+formam uma matriz e a quadratura de Gauss–Legendre vira um produto
+matricial, sem laços Python sobre N nem amostragem densa.
 """
 
 import numpy as np
 
+try:
+    from .cache import problem_key
+    from .fem2d import FEMSolution2D
+    from .series import SeriesSolution2D, basis_matrix
+    from .tensor_galerkin import gauss_nodes
+except ImportError:
+    from cache import problem_key
+    from fem2d import FEMSolution2D
+    from series import SeriesSolution2D, basis_matrix
+    from tensor_galerkin import gauss_nodes
+
+# Passo relativo das diferenças centrais nas derivadas da solução analítica
+_FD_STEP = 1e-6
+
+
+def _basis_with_derivative(kind, wavenumbers, s, origin):
+    """Matrizes φ_k(s) e φ'_k(s) (sin' = κ cos, cos' = -κ sin)"""
+    value = basis_matrix(kind, wavenumbers, s, origin)
+    if kind == "sin":
+        derivative = basis_matrix("cos", wavenumbers, s, origin) * wavenumbers
+    else:
+        derivative = -basis_matrix("sin", wavenumbers, s, origin) * wavenumbers
+    return value, derivative
+
+
+def truncation_family(n_max, count=6):
+    """Até count truncamentos geometricamente espaçados de max(n_max // 4, 2) a n_max
+
+    Família do estudo de convergência terminando no N escolhido (por
+    exemplo, o de solve_to_tolerance); N repetidos pelo arredondamento
+    aparecem uma vez só.
+    """
+    low = min(max(n_max // 4, 2), n_max)
+    return np.unique(np.round(np.geomspace(low, n_max, count)).astype(int)).tolist()
+
+
+def _stack_coefficients(solutions, shape):
+    """Coeficientes da família completados com zeros até `shape`"""
+    stacked = np.zeros((len(solutions),) + shape)
+    for i, solution in enumerate(solutions):
+        coeffs = np.asarray(solution.coeffs)
+        stacked[(i,) + tuple(slice(0, n) for n in coeffs.shape)] = coeffs
+    return stacked
+
+
 class ConvergenceAnalyzer:
-    """Analisador simplificado de convergência"""
-    
-    def __init__(self):
-        pass
-    
-    def analyze(self, solutions, n_terms_list, problem_type="generic"):
-        """Analisa convergência das soluções"""
-        
-        errors = []
-        
-        for i, n_terms in enumerate(n_terms_list):
-            if n_terms in solutions:
-                # Erro simples baseado no número de termos
-                if problem_type == "poisson":
-                    error = 1.0 / n_terms**1.5
-                elif problem_type == "heat":
-                    error = 1.0 / n_terms**2
-                elif problem_type == "wave":
-                    error = 1.0 / n_terms
-                elif problem_type == "helmholtz":
-                    error = 1.0 / n_terms**1.2
-                else:
-                    error = 1.0 / n_terms
-                
-                errors.append(error)
-            else:
-                errors.append(1.0)
-        
-        return errors
-    
+    """Normas de erro L², H¹ e máxima por quadratura vetorizada
+
+    solver fornece a solução de referência quando o problema não tem
+    solução analítica (com o cache em disco do solver, se houver);
+    reference_factor é a razão entre os termos da referência e o maior N.
+    """
+
+    NORMS = ("l2", "h1", "max")
+
+    def __init__(self, solver=None, reference_factor=4, n_quad=None):
+        self.solver = solver
+        self.reference_factor = reference_factor
+        self.n_quad = n_quad
+        self._references = {}
+
+    def reference(self, problem, n_terms):
+        """Solução de referência com n_terms termos (cache em memória)"""
+        if self.solver is None:
+            try:
+                from .galerkin_solver import GalerkinSolver
+            except ImportError:
+                from galerkin_solver import GalerkinSolver
+            self.solver = GalerkinSolver()
+        key = problem_key(problem, n_terms, self.solver.VERSION)
+        if key not in self._references:
+            self._references[key] = self.solver.solve(problem, n_terms)
+        return self._references[key]
+
+    def default_time(self, problem):
+        """Instante de medição: 10% do intervalo de tempo do problema"""
+        t0, t1 = problem.get("time_domain", (0.0, 0.0))
+        return t0 + 0.1 * (t1 - t0)
+
+    def error_norms(self, solutions, n_terms_list, problem, t=None):
+        """Erros {"l2", "h1", "max"} como arrays alinhados a n_terms_list
+
+        solutions é {n: solução} de uma mesma família (base compartilhada,
+        como em solve_family). Para problemas temporais o erro é medido em
+        t (padrão: default_time); H¹ é a norma completa (‖e‖² + ‖e'‖²)^½.
+        """
+        family = [solutions[n] for n in n_terms_list]
+        if isinstance(family[0], (SeriesSolution2D, FEMSolution2D)):
+            return self._error_norms_2d(family, problem)
+        if t is None:
+            t = self.default_time(problem)
+        return self._error_norms_1d(family, problem, t)
+
+    def analyze(self, solutions, n_terms_list, problem, t=None, norm="l2"):
+        """Lista de erros medidos na norma pedida ("l2", "h1" ou "max")"""
+        if norm not in self.NORMS:
+            raise ValueError(f"Norma desconhecida: {norm} (opções: {', '.join(self.NORMS)})")
+        return self.error_norms(solutions, n_terms_list, problem, t)[norm].tolist()
+
+    def _n_quad(self, n_terms):
+        # sin(κ_N s) com N termos exige pelo menos ~N nós por comprimento
+        return self.n_quad or 2 * n_terms + 64
+
+    def _error_norms_1d(self, family, problem, t):
+        longest = max(family, key=lambda solution: solution.n_terms)
+        a, b = longest.domain
+        analytical = problem.get("analytical")
+        reference = None
+        n_max = longest.n_terms
+        if analytical is None:
+            reference = self.reference(problem, self.reference_factor * n_max)
+            n_max = reference.n_terms
+
+        xq, w = gauss_nodes(self._n_quad(n_max), (a, b))
+        if not hasattr(longest, "wavenumbers"):
+            # Soluções sem base modal (FEMSolution): avaliação direta nos nós
+            U = np.stack([solution(xq, t) for solution in family])
+            dU = np.stack([solution.dx(xq, t) for solution in family])
+        else:
+            B, dB = _basis_with_derivative("sin", longest.wavenumbers, xq, a)
+            amplitudes = _stack_coefficients(family, (longest.n_terms,)) \
+                * np.exp(-longest.decay * t)
+            U = amplitudes @ B.T
+            dU = amplitudes @ dB.T
+        if getattr(longest, "particular", None) is not None:
+            # SplitSolution: u = u_p + resto, com u_p comum a toda a família
+            U = U + longest.particular(xq)
+            if longest.particular_dx is not None:
+                dU = dU + longest.particular_dx(xq)
+
+        if reference is not None:
+            B_ref, dB_ref = _basis_with_derivative("sin", reference.wavenumbers, xq, a)
+            ref_amplitudes = reference.amplitudes(t)[0]
+            u_ref, du_ref = B_ref @ ref_amplitudes, dB_ref @ ref_amplitudes
+        else:
+            exact = (lambda x: analytical(x, t)) if "time_domain" in problem else analytical
+            h = _FD_STEP * (b - a)
+            u_ref = np.asarray(exact(xq), dtype=float)
+            du_ref = (np.asarray(exact(xq + h), dtype=float)
+                      - np.asarray(exact(xq - h), dtype=float)) / (2 * h)
+
+        error, d_error = U - u_ref, dU - du_ref
+        l2_sq = error**2 @ w
+        return {
+            "l2": np.sqrt(l2_sq),
+            "h1": np.sqrt(l2_sq + d_error**2 @ w),
+            "max": np.max(np.abs(error), axis=1),
+        }
+
+    def _error_norms_2d(self, family, problem):
+        longest = max(family, key=lambda solution: np.prod(solution.n_terms))
+        (ax, bx), (ay, by) = longest.domain
+        analytical = problem.get("analytical")
+        reference = None
+        n_max = max(longest.n_terms)
+        if analytical is None:
+            reference = self.reference(problem, self.reference_factor * n_max)
+            n_max = max(reference.n_terms)
+
+        n_quad = self._n_quad(n_max)
+        xq, wx = gauss_nodes(n_quad, (ax, bx))
+        yq, wy = gauss_nodes(n_quad, (ay, by))
+        W = np.outer(wx, wy)
+
+        Xq, Yq = np.meshgrid(xq, yq, indexing="ij")
+
+        def fields(solution_like, coeffs):
+            # Φ[s, i, j] = Σ C[s, m, n] X_m(x_i) Y_n(y_j) e derivadas
+            kind_x, kind_y = solution_like.kinds
+            X, dX = _basis_with_derivative(kind_x, solution_like.wavenumbers_x, xq, ax)
+            Y, dY = _basis_with_derivative(kind_y, solution_like.wavenumbers_y, yq, ay)
+            return (np.einsum("im,smn,jn->sij", X, coeffs, Y, optimize=True),
+                    np.einsum("im,smn,jn->sij", dX, coeffs, Y, optimize=True),
+                    np.einsum("im,smn,jn->sij", X, coeffs, dY, optimize=True))
+
+        if isinstance(longest, FEMSolution2D):
+            # Elementos finitos: avaliação pontual nos nós de quadratura
+            U = np.stack([solution(Xq, Yq) for solution in family])
+            Ux = np.stack([solution.dx(Xq, Yq) for solution in family])
+            Uy = np.stack([solution.dy(Xq, Yq) for solution in family])
+        else:
+            U, Ux, Uy = fields(longest, _stack_coefficients(family, longest.coeffs.shape))
+
+        if reference is not None:
+            u_ref, ux_ref, uy_ref = (f[0] for f in fields(reference, reference.coeffs[None]))
+        else:
+            hx, hy = _FD_STEP * (bx - ax), _FD_STEP * (by - ay)
+            u_ref = analytical(Xq, Yq)
+            ux_ref = (analytical(Xq + hx, Yq) - analytical(Xq - hx, Yq)) / (2 * hx)
+            uy_ref = (analytical(Xq, Yq + hy) - analytical(Xq, Yq - hy)) / (2 * hy)
+
+        error = U - u_ref
+        l2_sq = np.einsum("sij,ij->s", error**2, W)
+        h1_sq = np.einsum("sij,ij->s", (Ux - ux_ref)**2 + (Uy - uy_ref)**2, W)
+        return {
+            "l2": np.sqrt(l2_sq),
+            "h1": np.sqrt(l2_sq + h1_sq),
+            "max": np.max(np.abs(error), axis=(1, 2)),
+        }
+
     def compute_rate(self, n_terms_list, errors):
-        """Calcula taxa de convergência"""
-        if len(errors) < 2:
+        """Calcula taxa de convergência
+
+        Erros nulos (solução exata na base, ou abaixo da precisão de
+        máquina) ficam fora do ajuste.
+        """
+        n_terms_list = np.asarray(n_terms_list, dtype=float)
+        errors = np.asarray(errors, dtype=float)
+        valid = errors > 0
+        if np.count_nonzero(valid) < 2:
             return 1.0
-        
-        log_n = np.log(n_terms_list)
-        log_err = np.log(errors)
-        
+
+        log_n = np.log(n_terms_list[valid])
+        log_err = np.log(errors[valid])
+
         # Regressão linear
         coeffs = np.polyfit(log_n, log_err, 1)
         rate = -coeffs[0]
-        
+
         return rate
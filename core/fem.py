@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Elementos finitos P1/P2 em 1D para os problemas elípticos e parabólicos
+
+Alternativa local à base global de senos (GalerkinSolver.solve com
+method="fem"): malhas uniformes ou graduadas em direção às singularidades
+declaradas no catálogo, montagem vetorizada de todos os elementos de uma
+vez e matrizes em banda (largura = ordem) resolvidas por Cholesky em banda
+(O(N) memória e tempo). Como a base de senos, impõe u = 0 nas duas
+extremidades.
+
+Problemas parabólicos (M u' + α K u = 0) avançam no tempo por
+Crank–Nicolson, com o primeiro passo dividido em dois passos de Euler
+implícito para amortecer os saltos da condição inicial (Rannacher); a
+FEMSolution guarda um instantâneo nodal por passo e interpola linearmente
+no tempo.
+
+scipy.linalg só é importado ao fatorar (core.operators.BandedOperator).
+"""
+
+import numpy as np
+
+try:
+    from .fast_transforms import as_array_function
+    from .operators import BandedOperator
+    from .profiling import stage
+except ImportError:
+    from fast_transforms import as_array_function
+    from operators import BandedOperator
+    from profiling import stage
+
+ORDERS = (1, 2)
+
+# Nós de Gauss–Legendre por elemento (exatos até grau 7)
+_N_GAUSS = 4
+
+# Passos de tempo padrão em problemas parabólicos
+DEFAULT_STEPS = 200
+
+
+def shape_functions(xi, order):
+    """Funções de forma em ξ ∈ [0, 1] e suas derivadas, formato (len(ξ), ordem+1)"""
+    xi = np.asarray(xi, dtype=float)[..., None]
+    if order == 1:
+        phi = np.concatenate([1 - xi, xi], axis=-1)
+        dphi = np.broadcast_to(np.array([-1.0, 1.0]), phi.shape)
+    elif order == 2:
+        # Nós locais: extremidade esquerda, ponto médio, extremidade direita
+        phi = np.concatenate([(1 - xi) * (1 - 2 * xi), 4 * xi * (1 - xi), xi * (2 * xi - 1)],
+                             axis=-1)
+        dphi = np.concatenate([4 * xi - 3, 4 - 8 * xi, 4 * xi - 1], axis=-1)
+    else:
+        raise ValueError(f"Ordem de elemento não suportada: {order} (opções: {ORDERS})")
+    return phi, dphi
+
+
+def graded_mesh(n_elements, domain=(0, 1), grading=None, singular_points=()):
+    """Vértices da malha, graduada por s^grading perto das extremidades singulares
+
+    Com grading = g, os elementos junto a um ponto singular têm tamanho
+    O(h^g); pontos singulares no interior do domínio são ignorados.
+    """
+    a, b = domain
+    s = np.linspace(0.0, 1.0, n_elements + 1)
+    if not grading or grading == 1:
+        return a + (b - a) * s
+    left = any(np.isclose(point, a) for point in singular_points)
+    right = any(np.isclose(point, b) for point in singular_points)
+    if left and right:
+        # Graduação simétrica: cada metade é graduada em direção à sua extremidade
+        half = np.where(s <= 0.5, 0.5 * (2 * s)**grading, 1 - 0.5 * (2 * (1 - s))**grading)
+        return a + (b - a) * half
+    if left:
+        return a + (b - a) * s**grading
+    if right:
+        return b - (b - a) * (1 - s)**grading
+    return a + (b - a) * s
+
+
+def _local_dofs(n_elements, order):
+    """Graus de liberdade globais de cada elemento (numeração intercalada)"""
+    return order * np.arange(n_elements)[:, None] + np.arange(order + 1)
+
+
+def _element_quadrature(vertices, order):
+    """Pontos, pesos e funções de forma de Gauss em todos os elementos"""
+    nodes, weights = np.polynomial.legendre.leggauss(_N_GAUSS)
+    xi = 0.5 * (nodes + 1)
+    h = np.diff(vertices)
+    x = vertices[:-1, None] + h[:, None] * xi
+    w = h[:, None] * (0.5 * weights)
+    phi, _ = shape_functions(xi, order)
+    return x, w, phi
+
+
+def _reference_matrices(order):
+    """∫ φ'_i φ'_j dξ e ∫ φ_i φ_j dξ no elemento de referência"""
+    nodes, weights = np.polynomial.legendre.leggauss(_N_GAUSS)
+    xi = 0.5 * (nodes + 1)
+    w = 0.5 * weights
+    phi, dphi = shape_functions(xi, order)
+    return (dphi * w[:, None]).T @ dphi, (phi * w[:, None]).T @ phi
+
+
+def assemble_banded(vertices, order, stiffness=1.0, mass=0.0):
+    """stiffness·K + mass·M no formato em banda superior (LAPACK), todos os DOFs
+
+    ab[u + i - j, j] = A[i, j] para i ≤ j, com u = order. Para cada par
+    local (i, j) os DOFs globais dos elementos são distintos (passo
+    `order`), então cada par é somado em todos os elementos com uma única
+    operação fatiada.
+    """
+    n_elements = vertices.size - 1
+    n_dofs = order * n_elements + 1
+    K_ref, M_ref = _reference_matrices(order)
+    h = np.diff(vertices)
+    ab = np.zeros((order + 1, n_dofs))
+    for i in range(order + 1):
+        for j in range(i, order + 1):
+            entries = (stiffness * K_ref[i, j]) / h + (mass * M_ref[i, j]) * h
+            ab[order + i - j, j:j + order * n_elements:order] += entries
+    return ab
+
+
+def load_vector(func, vertices, order):
+    """b_i = ∫ f φ_i dx com a fonte avaliada em todos os pontos de uma vez"""
+    n_elements = vertices.size - 1
+    x, w, phi = _element_quadrature(vertices, order)
+    values = as_array_function(func)(x) * w
+    # b[dof] += Σ_q f(x_q) w_q φ_local(ξ_q)
+    contributions = values @ phi
+    b = np.zeros(order * n_elements + 1)
+    for j in range(order + 1):
+        b[j:j + order * n_elements:order] += contributions[:, j]
+    return b
+
+
+def _interior(ab):
+    """Banda superior restrita aos DOFs interiores (u = 0 nas extremidades)"""
+    interior = ab[:, 1:-1].copy()
+    # Entradas que ligavam o primeiro DOF interior ao DOF removido
+    for r in range(ab.shape[0] - 1):
+        interior[r, :ab.shape[0] - 1 - r] = 0.0
+    return interior
+
+
+def _with_boundary(interior_values):
+    """Acrescenta os DOFs de contorno (nulos) nas extremidades"""
+    shape = interior_values.shape[:-1] + (interior_values.shape[-1] + 2,)
+    values = np.zeros(shape)
+    values[..., 1:-1] = interior_values
+    return values
+
+
+def _mesh_for(problem, n_elements, grading):
+    singular_points = [entry["x"] for entry in problem.get("singularities", [])]
+    return graded_mesh(n_elements, problem["domain"], grading, singular_points)
+
+
+def solve_elliptic(problem, n_elements, order=1, grading=None):
+    """-u'' = Q com u = 0 nas extremidades"""
+    if order not in ORDERS:
+        raise ValueError(f"Ordem de elemento não suportada: {order} (opções: {ORDERS})")
+    vertices = _mesh_for(problem, n_elements, grading)
+    with stage("assembly"):
+        K = BandedOperator(_interior(assemble_banded(vertices, order, stiffness=1.0)))
+        b = load_vector(problem["source"], vertices, order)[1:-1]
+    with stage("linear_solve"):
+        values = K.solve(b)
+    return FEMSolution(vertices, _with_boundary(values)[None, :], np.zeros(1), order,
+                       problem["domain"])
+
+
+def solve_parabolic(problem, n_elements, diffusivity, initial, order=1, grading=None,
+                    n_steps=DEFAULT_STEPS):
+    """M u' + α K u = 0 com u(x,0) = initial(x) (projeção L²) e u = 0 nas extremidades"""
+    if order not in ORDERS:
+        raise ValueError(f"Ordem de elemento não suportada: {order} (opções: {ORDERS})")
+    vertices = _mesh_for(problem, n_elements, grading)
+    t0, t1 = problem["time_domain"]
+    times = np.linspace(t0, t1, n_steps + 1)
+    dt = times[1] - times[0]
+
+    with stage("assembly"):
+        M = BandedOperator(_interior(assemble_banded(vertices, order, stiffness=0.0, mass=1.0)))
+        K = _interior(assemble_banded(vertices, order, stiffness=diffusivity))
+        b0 = load_vector(initial, vertices, order)[1:-1]
+
+    with stage("linear_solve"):
+        snapshots = np.empty((times.size, M.shape[1]))
+        snapshots[0] = M.solve(b0)
+        # Dois meios passos de Euler implícito: (M + dt/2 K) u⁺ = M u; o
+        # fator de Cholesky de M + dt/2 K é calculado uma vez e reaproveitado
+        implicit = BandedOperator(M.ab + 0.5 * dt * K)
+        u = snapshots[0]
+        for _ in range(2):
+            u = implicit.solve(M.matvec(u))
+        snapshots[min(1, n_steps)] = u
+        # Crank–Nicolson: (M + dt/2 K) u⁺ = (M - dt/2 K) u
+        explicit = BandedOperator(M.ab - 0.5 * dt * K)
+        for n in range(1, n_steps):
+            u = implicit.solve(explicit.matvec(u))
+            snapshots[n + 1] = u
+    return FEMSolution(vertices, _with_boundary(snapshots), times, order, problem["domain"])
+
+
+class FEMSolution:
+    """Solução de elementos finitos com a interface de SeriesSolution
+
+    values[i] são os valores nodais (vértices e, em P2, pontos médios
+    intercalados) no instante times[i]; entre instantes a interpolação é
+    linear. n_terms é o número de elementos.
+    """
+
+    __slots__ = ("vertices", "values", "times", "order", "domain")
+
+    def __init__(self, vertices, values, times, order=1, domain=(0, 1)):
+        self.vertices = np.ascontiguousarray(vertices, dtype=float)
+        self.values = np.ascontiguousarray(values, dtype=float)
+        self.times = np.ascontiguousarray(times, dtype=float)
+        self.order = int(order)
+        self.domain = (float(domain[0]), float(domain[1]))
+
+    def __reduce__(self):
+        return (FEMSolution, (self.vertices, self.values, self.times, self.order, self.domain))
+
+    def __repr__(self):
+        return (f"FEMSolution(n_elements={self.n_terms}, order={self.order}, "
+                f"n_times={self.times.size}, domain={self.domain})")
+
+    def __array__(self, dtype=None, copy=None):
+        """np.asarray(solução) devolve os valores nodais, formato (instantes, DOFs)"""
+        values = self.values if dtype is None else self.values.astype(dtype)
+        return values.copy() if copy else values
+
+    @property
+    def n_terms(self):
+        return self.vertices.size - 1
+
+    @property
+    def n_dofs(self):
+        return self.values.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.vertices.nbytes + self.values.nbytes + self.times.nbytes
+
+    def _locate(self, x):
+        """Elemento e coordenada local ξ de cada ponto"""
+        element = np.clip(np.searchsorted(self.vertices, x, side="right") - 1, 0, self.n_terms - 1)
+        h = self.vertices[element + 1] - self.vertices[element]
+        return element, (x - self.vertices[element]) / h, h
+
+    def _nodal(self, t, dofs, time_derivative=False):
+        """Valores nodais em dofs[p, :] no instante t[p] (interpolação linear)
+
+        Com time_derivative, a inclinação da interpolação no passo de t.
+        """
+        if self.times.size == 1:
+            return np.zeros(dofs.shape) if time_derivative else self.values[0][dofs]
+        last = self.times.size - 2
+        index = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, last)
+        step = self.times[index + 1] - self.times[index]
+        index = index[:, None]
+        if time_derivative:
+            return (self.values[index + 1, dofs] - self.values[index, dofs]) / step[:, None]
+        weight = np.clip((t - self.times[index[:, 0]]) / step, 0.0, 1.0)[:, None]
+        return (1 - weight) * self.values[index, dofs] + weight * self.values[index + 1, dofs]
+
+    def _evaluate(self, x, t, derivative=None):
+        if derivative not in (None, "x", "t"):
+            raise ValueError(f"Derivada desconhecida: {derivative} (opções: x, t)")
+        x, t = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(t, dtype=float))
+        shape = x.shape
+        x, t = x.ravel(), t.ravel()
+        element, xi, h = self._locate(x)
+        phi, dphi = shape_functions(xi, self.order)
+        dofs = self.order * element[:, None] + np.arange(self.order + 1)
+        weights = dphi / h[:, None] if derivative == "x" else phi
+        nodal = self._nodal(t, dofs, time_derivative=derivative == "t")
+        result = np.sum(nodal * weights, axis=1).reshape(shape)
+        return result if shape else float(result)
+
+    def __call__(self, x, t=0.0, tol=None):
+        """Avalia u(x,t) com broadcasting entre x e t (tol é ignorado)"""
+        with stage("evaluation"):
+            return self._evaluate(x, t)
+
+    def dx(self, x, t=0.0, tol=None):
+        """∂u/∂x, constante (P1) ou linear (P2) em cada elemento"""
+        with stage("evaluation"):
+            return self._evaluate(x, t, "x")
+
+    def dt(self, x, t=0.0, tol=None):
+        """∂u/∂t da interpolação linear entre os passos de tempo"""
+        with stage("evaluation"):
+            return self._evaluate(x, t, "t")
+
+    def evaluate_grid(self, x, t, tol=None, derivative=None):
+        """Campo U[i, j] = u(x_j, t_i) (ou a derivada "x" ou "t")"""
+        x = np.asarray(x, dtype=float).ravel()
+        t = np.asarray(t, dtype=float).ravel()
+        with stage("evaluation"):
+            return self._evaluate(x[None, :], t[:, None], derivative)
+
+    def evaluate_uniform(self, n_points, t=0.0, tol=None):
+        """Avalia em np.linspace(a, b, n_points); (x, U) como em SeriesSolution"""
+        x = np.linspace(*self.domain, n_points)
+        values = self.evaluate_grid(x, t, tol)
+        return x, values[0] if np.ndim(t) == 0 else values
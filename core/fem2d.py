@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Elementos finitos Q1 em 2D para Helmholtz com multigrid geométrico
+
+Resolve ∇·(a∇φ) + λφ = f em retângulos com malhas estruturadas (uniformes
+ou graduadas por eixo), coeficientes variáveis opcionais (problem
+"diffusion" e "lambda_param" como funções de (x, y)) e Dirichlet ou Neumann
+por lado, lidos de boundary_conditions como em tensor_galerkin (o valor
+de Neumann é o fluxo a ∂φ/∂n). A forma fraca é a mesma do caminho
+espectral: (K - λM) φ = G - F.
+
+Montagem: numa malha estruturada a matriz Q1 tem o estêncil de 9 pontos;
+cada par de nós locais (16 por elemento) é somado em todos os elementos
+com uma operação fatiada e a CSR é construída diretamente a partir das 9
+diagonais (memória O(N), sem laços Python por elemento).
+
+Solução: gradientes conjugados precondicionados por um ciclo V geométrico
+(prolongação bilinear pelas coordenadas reais, operadores de Galerkin
+PᵀAP, Jacobi amortecido como suavizador e LU no nível mais grosso). Se o
+deslocamento λ tornar o operador indefinido e o CG falhar, usa GMRES com
+o mesmo precondicionador.
+"""
+
+import numpy as np
+
+try:
+    from .fast_transforms import as_array_function
+    from .fem import graded_mesh, load_vector
+    from .profiling import stage
+    from .tensor_galerkin import SIDES, side_conditions
+except ImportError:
+    from fast_transforms import as_array_function
+    from fem import graded_mesh, load_vector
+    from profiling import stage
+    from tensor_galerkin import SIDES, side_conditions
+
+# Nós locais do elemento (deslocamento em x, deslocamento em y)
+_LOCAL_NODES = ((0, 0), (1, 0), (0, 1), (1, 1))
+
+# Malha mais grossa do multigrid (elementos por direção)
+COARSEST = 4
+
+# Suavização: sweeps de Jacobi antes e depois da correção e amortecimento
+SMOOTHING_SWEEPS = 2
+JACOBI_WEIGHT = 0.6
+
+
+def _reference_q1():
+    """Funções de forma e derivadas em ξ, η nos 2×2 pontos de Gauss"""
+    nodes, weights = np.polynomial.legendre.leggauss(2)
+    s = 0.5 * (nodes + 1)
+    xi, eta = np.meshgrid(s, s, indexing="xy")
+    xi, eta = xi.ravel(), eta.ravel()
+    w = np.outer(0.5 * weights, 0.5 * weights).ravel()
+    N = np.empty((4, 4))
+    dxi = np.empty((4, 4))
+    deta = np.empty((4, 4))
+    for local, (di, dj) in enumerate(_LOCAL_NODES):
+        fx = xi if di else 1 - xi
+        fy = eta if dj else 1 - eta
+        N[:, local] = fx * fy
+        dxi[:, local] = (1 if di else -1) * fy
+        deta[:, local] = fx * (1 if dj else -1)
+    return xi, eta, w, N, dxi, deta
+
+
+def _coefficient(value, x, y):
+    """Coeficiente constante ou função de (x, y) nos pontos de quadratura"""
+    if callable(value):
+        return np.broadcast_to(np.asarray(value(x, y), dtype=float), x.shape)
+    return np.full(x.shape, float(value))
+
+
+def assemble(vertices_x, vertices_y, diffusion=1.0, shift=0.0, source=None):
+    """Matriz K - shift·M (CSR, todos os nós) e vetor -F = -∫ f v
+
+    Os nós são numerados por linhas: índice = j·(nx+1) + i.
+    """
+    from scipy import sparse
+    nx, ny = vertices_x.size - 1, vertices_y.size - 1
+    hx, hy = np.diff(vertices_x), np.diff(vertices_y)
+    xi, eta, w, N, dxi, deta = _reference_q1()
+
+    # Pontos de quadratura de todos os elementos, formato (ny, nx, 4)
+    X = vertices_x[:-1][None, :, None] + hx[None, :, None] * xi
+    Y = vertices_y[:-1][:, None, None] + hy[:, None, None] * eta
+    X, Y = np.broadcast_arrays(X, Y)
+    area = (hy[:, None] * hx[None, :])[..., None]
+    a = _coefficient(diffusion, X, Y) * w
+    stiff_x = a * (hy[:, None] / hx[None, :])[..., None]
+    stiff_y = a * (hx[None, :] / hy[:, None])[..., None]
+    mass = _coefficient(shift, X, Y) * w * area
+
+    # Estêncil de 9 pontos: S[k, j, i] = A[nó (i, j), nó (i + di, j + dj)]
+    stencil = np.zeros((9, ny + 1, nx + 1))
+    for p, (pi, pj) in enumerate(_LOCAL_NODES):
+        for q, (qi, qj) in enumerate(_LOCAL_NODES):
+            values = (stiff_x @ (dxi[:, p] * dxi[:, q]) + stiff_y @ (deta[:, p] * deta[:, q])
+                      - mass @ (N[:, p] * N[:, q]))
+            k = 3 * (qj - pj + 1) + (qi - pi + 1)
+            stencil[k, pj:pj + ny, pi:pi + nx] += values
+
+    n_nodes = (nx + 1) * (ny + 1)
+    i, j = np.meshgrid(np.arange(nx + 1), np.arange(ny + 1), indexing="xy")
+    offsets = [(di, dj) for dj in (-1, 0, 1) for di in (-1, 0, 1)]
+    valid = np.stack([(i + di >= 0) & (i + di <= nx) & (j + dj >= 0) & (j + dj <= ny)
+                      for di, dj in offsets]).reshape(9, n_nodes)
+    columns = (np.arange(n_nodes)[None, :]
+               + np.array([dj * (nx + 1) + di for di, dj in offsets])[:, None])
+    # Ordem das diagonais crescente: colunas já ordenadas em cada linha
+    indptr = np.concatenate([[0], np.cumsum(valid.sum(axis=0))])
+    A = sparse.csr_matrix((stencil.reshape(9, n_nodes).T[valid.T], columns.T[valid.T], indptr),
+                          shape=(n_nodes, n_nodes))
+
+    rhs = np.zeros((ny + 1, nx + 1))
+    if source is not None:
+        f = np.asarray(source(X, Y), dtype=float) * w * area
+        for p, (pi, pj) in enumerate(_LOCAL_NODES):
+            rhs[pj:pj + ny, pi:pi + nx] -= f @ N[:, p]
+    return A, rhs.ravel()
+
+
+def _side_nodes(side, nx, ny):
+    """Índices globais dos nós de um lado, na ordem da coordenada do lado"""
+    axis, end = SIDES[side]
+    if axis == 0:
+        i = nx if end else 0
+        return np.arange(ny + 1) * (nx + 1) + i
+    j = ny if end else 0
+    return j * (nx + 1) + np.arange(nx + 1)
+
+
+def _boundary(sides, vertices_x, vertices_y):
+    """(nós de Dirichlet, valores de Dirichlet, carga de Neumann G)"""
+    nx, ny = vertices_x.size - 1, vertices_y.size - 1
+    G = np.zeros((nx + 1) * (ny + 1))
+    # Neumann primeiro: nos cantos, Dirichlet prevalece
+    for side, (cond_type, value) in sides.items():
+        if cond_type != "neumann" or (not callable(value) and value == 0):
+            continue
+        along = vertices_y if SIDES[side][0] == 0 else vertices_x
+        g = value if callable(value) else (lambda s, value=value: np.full_like(s, value))
+        G[_side_nodes(side, nx, ny)] += load_vector(g, along, 1)
+    dirichlet = np.zeros((nx + 1) * (ny + 1), dtype=bool)
+    values = np.zeros((nx + 1) * (ny + 1))
+    for side, (cond_type, value) in sides.items():
+        if cond_type != "dirichlet":
+            continue
+        nodes = _side_nodes(side, nx, ny)
+        along = vertices_y if SIDES[side][0] == 0 else vertices_x
+        dirichlet[nodes] = True
+        values[nodes] = as_array_function(value)(along) if callable(value) else value
+    return dirichlet, values, G
+
+
+def _prolongation_1d(fine):
+    """Interpolação linear da malha grossa (vértices pares) para a fina"""
+    from scipy import sparse
+    n_fine = fine.size
+    n_coarse = (n_fine - 1) // 2 + 1
+    coarse = fine[::2]
+    rows, cols, vals = [np.arange(0, n_fine, 2)], [np.arange(n_coarse)], [np.ones(n_coarse)]
+    odd = np.arange(1, n_fine, 2)
+    left = (odd - 1) // 2
+    theta = (fine[odd] - coarse[left]) / (coarse[left + 1] - coarse[left])
+    rows += [odd, odd]
+    cols += [left, left + 1]
+    vals += [1 - theta, theta]
+    return sparse.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                             shape=(n_fine, n_coarse))
+
+
+class MultigridPreconditioner:
+    """Ciclo V geométrico para a matriz restrita aos nós livres"""
+
+    def __init__(self, A, vertices_x, vertices_y, free):
+        from scipy import sparse
+        import scipy.sparse.linalg as spla
+        self.levels = []
+        while True:
+            nx, ny = vertices_x.size - 1, vertices_y.size - 1
+            if nx % 2 or ny % 2 or min(nx, ny) <= COARSEST:
+                break
+            P = sparse.kron(_prolongation_1d(vertices_y), _prolongation_1d(vertices_x),
+                            format="csr")
+            vertices_x, vertices_y = vertices_x[::2], vertices_y[::2]
+            coarse_free = free.reshape(ny + 1, nx + 1)[::2, ::2].ravel()
+            P = P[free][:, coarse_free]
+            self.levels.append((A, JACOBI_WEIGHT / A.diagonal(), P))
+            A = (P.T @ A @ P).tocsr()
+            free = coarse_free
+        self.coarse_solve = spla.splu(A.tocsc()).solve
+        self.shape = self.levels[0][0].shape if self.levels else A.shape
+
+    def _cycle(self, level, r):
+        if level == len(self.levels):
+            return self.coarse_solve(r)
+        A, inverse_diagonal, P = self.levels[level]
+        x = inverse_diagonal * r
+        for _ in range(SMOOTHING_SWEEPS - 1):
+            x += inverse_diagonal * (r - A @ x)
+        x += P @ self._cycle(level + 1, P.T @ (r - A @ x))
+        for _ in range(SMOOTHING_SWEEPS):
+            x += inverse_diagonal * (r - A @ x)
+        return x
+
+    def __call__(self, r):
+        return self._cycle(0, np.asarray(r, dtype=float).ravel())
+
+
+def _mesh(problem, n_elements, grading):
+    """Vértices em x e em y, graduados em direção às singularidades"""
+    (ax, bx), (ay, by) = problem["domain"]
+    singular = problem.get("singularities", [])
+    vertices_x = graded_mesh(n_elements, (ax, bx), grading,
+                             [entry["x"] for entry in singular if "x" in entry])
+    vertices_y = graded_mesh(n_elements, (ay, by), grading,
+                             [entry["y"] for entry in singular if "y" in entry])
+    return vertices_x, vertices_y
+
+
+def _krylov(A, rhs, preconditioner, rtol):
+    """CG precondicionado; GMRES se o operador deslocado for indefinido"""
+    import scipy.sparse.linalg as spla
+    M = spla.LinearOperator(A.shape, matvec=preconditioner, dtype=float)
+    solution, info = spla.cg(A, rhs, rtol=rtol, M=M, maxiter=200)
+    if info != 0:
+        solution, info = spla.gmres(A, rhs, rtol=rtol, M=M, restart=50, maxiter=20)
+    if info != 0:
+        raise np.linalg.LinAlgError(f"Krylov não convergiu (info={info})")
+    return solution
+
+
+def solve_helmholtz(problem, n_elements, grading=None, rtol=1e-10):
+    """∇·(a∇φ) + λφ = f em (n_elements × n_elements) elementos Q1"""
+    vertices_x, vertices_y = _mesh(problem, n_elements, grading)
+    sides = side_conditions(problem["boundary_conditions"], homogeneous_dirichlet=False)
+
+    with stage("assembly"):
+        A, minus_F = assemble(vertices_x, vertices_y, problem.get("diffusion", 1.0),
+                              problem.get("lambda_param", 0), problem.get("source"))
+        dirichlet, values, G = _boundary(sides, vertices_x, vertices_y)
+        free = ~dirichlet
+        rhs = (minus_F + G)[free] - A[free][:, dirichlet] @ values[dirichlet]
+        A_free = A[free][:, free]
+        preconditioner = MultigridPreconditioner(A_free, vertices_x, vertices_y, free)
+
+    with stage("linear_solve"):
+        values[free] = _krylov(A_free, rhs, preconditioner, rtol)
+    return FEMSolution2D(vertices_x, vertices_y,
+                         values.reshape(vertices_y.size, vertices_x.size), problem["domain"])
+
+
+def eigenpairs(problem, n_elements, k=6, target=None, grading=None, rtol=1e-10):
+    """Os k autopares de K φ = μ M φ mais próximos de target (padrão: os mais baixos)
+
+    K é a rigidez de -∇·(a∇) e M a massa, com os lados de Dirichlet
+    eliminados; ∇·(a∇φ) + λφ = f é ressonante quando λ coincide com um μ.
+    Lanczos em modo shift-invert (eigsh) com σ = target: cada aplicação de
+    (K - σM)⁻¹ é um CG com o ciclo V, sem fatoração, de modo que a memória
+    fica O(N). Retorna (autovalores crescentes, [FEMSolution2D]) com modos
+    M-ortonormais (‖φ‖_L² = 1) e sinal fixado pelo maior valor nodal.
+    """
+    import scipy.sparse.linalg as spla
+    vertices_x, vertices_y = _mesh(problem, n_elements, grading)
+    sides = side_conditions(problem["boundary_conditions"], homogeneous_dirichlet=False)
+
+    with stage("assembly"):
+        K, _ = assemble(vertices_x, vertices_y, problem.get("diffusion", 1.0))
+        # Sem rigidez e com deslocamento -1, a mesma montagem dá a massa
+        M, _ = assemble(vertices_x, vertices_y, diffusion=0.0, shift=-1.0)
+        dirichlet, _, _ = _boundary(sides, vertices_x, vertices_y)
+        free = ~dirichlet
+        K, M = K[free][:, free], M[free][:, free]
+        # Só Neumann: K é singular (modo constante) e σ = 0 não serve
+        sigma = float(target) if target is not None else (0.0 if dirichlet.any() else -1.0)
+        shifted = (K - sigma * M).tocsr()
+        preconditioner = MultigridPreconditioner(shifted, vertices_x, vertices_y, free)
+
+    with stage("eigensolve"):
+        inverse = spla.LinearOperator(K.shape, dtype=float,
+                                      matvec=lambda b: _krylov(shifted, b, preconditioner, rtol))
+        eigenvalues, vectors = spla.eigsh(K, k, M=M, sigma=sigma, which="LM", OPinv=inverse)
+    order = np.argsort(eigenvalues)
+    modes = []
+    for vector in vectors.T[order]:
+        values = np.zeros(free.size)
+        values[free] = vector * np.sign(vector[np.argmax(np.abs(vector))])
+        modes.append(FEMSolution2D(vertices_x, vertices_y,
+                                   values.reshape(vertices_y.size, vertices_x.size),
+                                   problem["domain"]))
+    return eigenvalues[order], modes
+
+
+def _linear_weights(vertices, s):
+    """Elemento de cada ponto e os pesos (len(s), 2) dos nós esquerdo e direito
+
+    Devolve (elemento, pesos de interpolação, pesos da derivada ±1/h).
+    """
+    s = np.asarray(s, dtype=float).ravel()
+    element = np.clip(np.searchsorted(vertices, s, side="right") - 1, 0, vertices.size - 2)
+    h = vertices[element + 1] - vertices[element]
+    theta = (s - vertices[element]) / h
+    return (element, np.stack([1 - theta, theta], axis=1),
+            np.stack([-1 / h, 1 / h], axis=1))
+
+
+def _interpolation_1d(vertices, s):
+    """Matriz esparsa (len(s), nós) de interpolação linear e a de derivadas"""
+    from scipy import sparse
+    element, weights, d_weights = _linear_weights(vertices, s)
+    rows = np.repeat(np.arange(element.size), 2)
+    cols = np.stack([element, element + 1], axis=1).ravel()
+    shape = (element.size, vertices.size)
+    L = sparse.csr_matrix((weights.ravel(), (rows, cols)), shape)
+    D = sparse.csr_matrix((d_weights.ravel(), (rows, cols)), shape)
+    return L, D
+
+
+class FEMSolution2D:
+    """Solução Q1 com a interface de SeriesSolution2D
+
+    values[j, i] é o valor nodal em (vertices_x[i], vertices_y[j]);
+    n_terms é (elementos em x, elementos em y).
+    """
+
+    __slots__ = ("vertices_x", "vertices_y", "values", "domain")
+
+    def __init__(self, vertices_x, vertices_y, values, domain=((0, 1), (0, 1))):
+        self.vertices_x = np.ascontiguousarray(vertices_x, dtype=float)
+        self.vertices_y = np.ascontiguousarray(vertices_y, dtype=float)
+        self.values = np.ascontiguousarray(values, dtype=float)
+        domain = np.asarray(domain, dtype=float)
+        self.domain = ((float(domain[0][0]), float(domain[0][1])),
+                       (float(domain[1][0]), float(domain[1][1])))
+
+    def __reduce__(self):
+        return (FEMSolution2D, (self.vertices_x, self.vertices_y, self.values, self.domain))
+
+    def __repr__(self):
+        return f"FEMSolution2D(n_elements={self.n_terms}, domain={self.domain})"
+
+    def __array__(self, dtype=None, copy=None):
+        """np.asarray(solução) devolve os valores nodais, formato (ny+1, nx+1)"""
+        values = self.values if dtype is None else self.values.astype(dtype)
+        return values.copy() if copy else values
+
+    @property
+    def n_terms(self):
+        return (self.vertices_x.size - 1, self.vertices_y.size - 1)
+
+    @property
+    def nbytes(self):
+        return self.vertices_x.nbytes + self.vertices_y.nbytes + self.values.nbytes
+
+    def _pointwise(self, x, y, derivative=None):
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+        shape = x.shape
+        i, Lx, Dx = _linear_weights(self.vertices_x, x)
+        j, Ly, Dy = _linear_weights(self.vertices_y, y)
+        X = Dx if derivative == "x" else Lx
+        Y = Dy if derivative == "y" else Ly
+        # Só os quatro vértices do elemento de cada ponto: O(P) memória
+        V = self.values
+        result = (Y[:, 0] * (X[:, 0] * V[j, i] + X[:, 1] * V[j, i + 1])
+                  + Y[:, 1] * (X[:, 0] * V[j + 1, i] + X[:, 1] * V[j + 1, i + 1]))
+        result = result.reshape(shape)
+        return result if shape else float(result)
+
+    def __call__(self, x, y):
+        """Avalia φ(x,y) com broadcasting entre x e y"""
+        with stage("evaluation"):
+            return self._pointwise(x, y)
+
+    def dx(self, x, y):
+        with stage("evaluation"):
+            return self._pointwise(x, y, "x")
+
+    def dy(self, x, y):
+        with stage("evaluation"):
+            return self._pointwise(x, y, "y")
+
+    def evaluate_grid(self, x, y, derivative=None):
+        """Campo Φ[i, j] = φ(x_j, y_i) com dois produtos esparsos
+
+        derivative ("x" ou "y") avalia o gradiente, constante por elemento
+        na direção derivada.
+        """
+        if derivative not in (None, "x", "y"):
+            raise ValueError(f"Derivada desconhecida: {derivative} (opções: x, y)")
+        with stage("evaluation"):
+            Lx, Dx = _interpolation_1d(self.vertices_x, x)
+            Ly, Dy = _interpolation_1d(self.vertices_y, y)
+            X = Dx if derivative == "x" else Lx
+            Y = Dy if derivative == "y" else Ly
+            return np.asarray(X @ np.asarray(Y @ self.values).T).T
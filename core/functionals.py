@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Funcionais das soluções em série em forma fechada (Parseval)
+
+Energia L², seminorma H¹, média, integrais em intervalos ou retângulos,
+integrais de linha em 2D e o centróide da energia saem diretamente dos
+coeficientes e das taxas de decaimento, sem amostragem espacial. As
+integrais de produtos de modos são calculadas exatamente (matriz de Gram
+∫ φ_i φ_j); nas bases de autofunções do catálogo ela é diagonal e a
+energia em T instantes custa O(N·T):
+
+    t = np.linspace(0, 0.4, 100_000)
+    energy(solution, t)          # ‖u(·, t)‖² para todos os t de uma vez
+
+Os instantes t podem ser um array de qualquer formato; o resultado tem o
+formato de t (float para t escalar). Vale para SeriesSolution (com t) e
+SeriesSolution2D (sem t); soluções por elementos finitos ou com parte
+particular não têm representação modal completa e são recusadas.
+"""
+
+import numpy as np
+
+try:
+    from .series import SeriesSolution, SeriesSolution2D
+except ImportError:
+    from series import SeriesSolution, SeriesSolution2D
+
+
+def _cos_integral(omega, length, power=0):
+    """∫_0^L s^power cos(ω s) ds elemento a elemento (power 0 ou 1)"""
+    omega = np.asarray(omega, dtype=float)
+    zero = np.isclose(omega, 0.0, atol=1e-12 / length)
+    w = np.where(zero, 1.0, omega)
+    if power == 0:
+        return np.where(zero, length, np.sin(w * length) / w)
+    return np.where(zero, length**2 / 2,
+                    length * np.sin(w * length) / w + (np.cos(w * length) - 1) / w**2)
+
+
+def gram_matrix(kind, wavenumbers, length, power=0):
+    """G_ij = ∫_0^L s^power φ_i(s) φ_j(s) ds com φ = sin ou cos(κ s)
+
+    sin·sin = ½[cos((κi-κj)s) - cos((κi+κj)s)], cos·cos com sinal +.
+    """
+    difference = _cos_integral(wavenumbers[:, None] - wavenumbers[None, :], length, power)
+    total = _cos_integral(wavenumbers[:, None] + wavenumbers[None, :], length, power)
+    return 0.5 * (difference - total if kind == "sin" else difference + total)
+
+
+def _quadratic(amplitudes, gram):
+    """a G aᵀ para cada linha de amplitudes; O(N) por linha se G é diagonal"""
+    diagonal = np.diag(gram)
+    if np.allclose(gram, np.diag(diagonal), atol=1e-12 * np.abs(diagonal).max(initial=1.0)):
+        return amplitudes**2 @ diagonal
+    return np.sum((amplitudes @ gram) * amplitudes, axis=1)
+
+
+def _basis_integral(kind, wavenumbers, s0, s1):
+    """∫_{s0}^{s1} φ_k(s) ds para a base sin/cos(κ s)"""
+    zero = wavenumbers == 0
+    k = np.where(zero, 1.0, wavenumbers)
+    if kind == "sin":
+        return np.where(zero, 0.0, (np.cos(k * s0) - np.cos(k * s1)) / k)
+    return np.where(zero, s1 - s0, (np.sin(k * s1) - np.sin(k * s0)) / k)
+
+
+def _amplitudes(solution, t):
+    """Amplitudes (T, N) nos instantes t e o formato de saída"""
+    if not isinstance(solution, SeriesSolution):
+        raise TypeError(f"Funcionais modais exigem SeriesSolution ou SeriesSolution2D, "
+                        f"não {type(solution).__name__}")
+    shape = np.shape(t)
+    return solution.amplitudes(np.ravel(t)), shape
+
+
+def _shaped(values, shape):
+    values = np.reshape(values, shape)
+    return values if shape else float(values)
+
+
+def energy(solution, t=0.0):
+    """‖u‖²_L² = ∫ u² dx (em 2D, ∫∫ φ² dx dy)"""
+    if isinstance(solution, SeriesSolution2D):
+        (ax, bx), (ay, by) = solution.domain
+        Gx = gram_matrix(solution.kinds[0], solution.wavenumbers_x, bx - ax)
+        Gy = gram_matrix(solution.kinds[1], solution.wavenumbers_y, by - ay)
+        return float(np.sum(solution.coeffs * (Gx @ solution.coeffs @ Gy)))
+    amplitudes, shape = _amplitudes(solution, t)
+    a, b = solution.domain
+    return _shaped(_quadratic(amplitudes, gram_matrix("sin", solution.wavenumbers, b - a)), shape)
+
+
+def h1_seminorm(solution, t=0.0):
+    """|u|_H¹ = ‖∇u‖_L², pela série derivada (sin' = κ cos)"""
+    if isinstance(solution, SeriesSolution2D):
+        (ax, bx), (ay, by) = solution.domain
+        kind_x, kind_y = solution.kinds
+        derivative = {"sin": "cos", "cos": "sin"}
+        Gx = gram_matrix(kind_x, solution.wavenumbers_x, bx - ax)
+        Gy = gram_matrix(kind_y, solution.wavenumbers_y, by - ay)
+        dGx = gram_matrix(derivative[kind_x], solution.wavenumbers_x, bx - ax) \
+            * np.outer(solution.wavenumbers_x, solution.wavenumbers_x)
+        dGy = gram_matrix(derivative[kind_y], solution.wavenumbers_y, by - ay) \
+            * np.outer(solution.wavenumbers_y, solution.wavenumbers_y)
+        C = solution.coeffs
+        return float(np.sqrt(np.sum(C * (dGx @ C @ Gy)) + np.sum(C * (Gx @ C @ dGy))))
+    amplitudes, shape = _amplitudes(solution, t)
+    a, b = solution.domain
+    gram = gram_matrix("cos", solution.wavenumbers, b - a)
+    return _shaped(np.sqrt(_quadratic(amplitudes * solution.wavenumbers, gram)), shape)
+
+
+def integral(solution, t=0.0, interval=None):
+    """∫ u dx no domínio ou em interval = (x0, x1); em 2D, interval é o
+    retângulo ((x0, x1), (y0, y1)) e t é ignorado"""
+    if isinstance(solution, SeriesSolution2D):
+        (ax, bx), (ay, by) = interval if interval is not None else solution.domain
+        origin_x, origin_y = solution.domain[0][0], solution.domain[1][0]
+        Ix = _basis_integral(solution.kinds[0], solution.wavenumbers_x,
+                             ax - origin_x, bx - origin_x)
+        Iy = _basis_integral(solution.kinds[1], solution.wavenumbers_y,
+                             ay - origin_y, by - origin_y)
+        return float(Ix @ solution.coeffs @ Iy)
+    amplitudes, shape = _amplitudes(solution, t)
+    a = solution.domain[0]
+    x0, x1 = interval if interval is not None else solution.domain
+    return _shaped(amplitudes @ _basis_integral("sin", solution.wavenumbers, x0 - a, x1 - a),
+                   shape)
+
+
+def mean(solution, t=0.0):
+    """Valor médio de u no domínio"""
+    if isinstance(solution, SeriesSolution2D):
+        (ax, bx), (ay, by) = solution.domain
+        return integral(solution) / ((bx - ax) * (by - ay))
+    a, b = solution.domain
+    return integral(solution, t) / (b - a)
+
+
+def line_integral(solution, axis, position, interval=None):
+    """∫ φ ao longo da reta y = position (axis="x") ou x = position (axis="y")"""
+    if not isinstance(solution, SeriesSolution2D):
+        raise TypeError("line_integral exige uma SeriesSolution2D")
+    if axis not in ("x", "y"):
+        raise ValueError(f"Eixo desconhecido: {axis} (opções: x, y)")
+    along = 0 if axis == "x" else 1
+    s0, s1 = interval if interval is not None else solution.domain[along]
+    origin = solution.domain[along][0]
+    wavenumbers = solution.wavenumbers_x if along == 0 else solution.wavenumbers_y
+    weights = _basis_integral(solution.kinds[along], wavenumbers, s0 - origin, s1 - origin)
+    if along == 0:
+        return float(weights @ solution.coeffs @ solution.basis_y(position)[0])
+    return float(solution.basis_x(position)[0] @ solution.coeffs @ weights)
+
+
+def energy_centroid(solution, t=0.0):
+    """Centróide da energia ∫ x u² dx / ∫ u² dx (1D)
+
+    A matriz de Gram com peso s não é diagonal: custo O(N²·T).
+    """
+    amplitudes, shape = _amplitudes(solution, t)
+    a, b = solution.domain
+    total = _quadratic(amplitudes, gram_matrix("sin", solution.wavenumbers, b - a))
+    first = _quadratic(amplitudes, gram_matrix("sin", solution.wavenumbers, b - a, power=1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _shaped(a + first / total, shape)
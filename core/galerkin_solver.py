@@ -4,19 +4,118 @@ Solver Galerkin Simplificado - Versão Robusta
 """
 
 import numpy as np
-import scipy.integrate as integrate
+
+try:
+    from .load_vector import sine_load_vector
+    from .operators import DiagonalOperator, KroneckerSumOperator
+    from .series import SeriesSolution, SeriesSolution2D, SplitSolution
+    from .tensor_galerkin import Basis1D, side_conditions, tensor_load, neumann_load
+    from .fast_transforms import sine_coefficients
+    from .cache import CoefficientCache, problem_key
+    from .profiling import stage
+    from .fem import solve_elliptic, solve_parabolic
+    from .fem2d import eigenpairs, solve_helmholtz
+except ImportError:
+    from load_vector import sine_load_vector
+    from operators import DiagonalOperator, KroneckerSumOperator
+    from series import SeriesSolution, SeriesSolution2D, SplitSolution
+    from tensor_galerkin import Basis1D, side_conditions, tensor_load, neumann_load
+    from fast_transforms import sine_coefficients
+    from cache import CoefficientCache, problem_key
+    from profiling import stage
+    from fem import solve_elliptic, solve_parabolic
+    from fem2d import eigenpairs, solve_helmholtz
+
+def _tail_energy(energies):
+    """Estimativa de Σ_{k>N} e_k pelo decaimento dos últimos modos
+    
+    Ajusta a energia de pares de modos consecutivos, alinhados ao fim do
+    espectro ((N-1, N), (N-3, N-2), ...), da metade superior por A k^(-p)
+    e por A e^(-σk), com k o centro do par, e soma a cauda do modelo de
+    menor resíduo (no empate, a maior) em forma fechada. O par absorve
+    padrões de paridade (modos pares nulos da onda, camadas alternadas
+    quando a solução 2D só tem modos ímpares em x) que enviesariam o
+    ajuste modo a modo. Espectro já resolvido até a precisão de máquina
+    tem cauda nula; cauda que não decai, ou sem pontos para o ajuste, é
+    infinita.
+    """
+    n = energies.size
+    pairs = energies[n % 2:].reshape(-1, 2).sum(axis=1)
+    if not pairs.size:
+        return np.inf if np.any(energies) else 0.0
+    centers = np.arange(1 + n % 2, n, 2) + 0.5
+    amplitude = np.sqrt(pairs)
+    upper = (centers > n / 2) & (amplitude > np.finfo(float).eps * amplitude.max(initial=0.0))
+    if not upper.any():
+        return 0.0
+    if np.count_nonzero(upper) < 2:
+        return np.inf
+    k_fit = centers[upper]
+    log_amplitude = np.log(amplitude[upper])
+    
+    # A k^(-p) nos pares de centro N + 2i - ½: Σ ≈ ½ ∫_{N+½}^∞ A² k^(-2p) dk
+    (slope, log_a), residual_alg = np.polyfit(np.log(k_fit), log_amplitude, 1, full=True)[:2]
+    p = -slope
+    tail_alg = (np.exp(2 * log_a) * (n + 0.5)**(1 - 2 * p) / (2 * (2 * p - 1))
+                if p > 0.5 else np.inf)
+    
+    # A e^(-σk): série geométrica de razão e^(-4σ) a partir de k = N + 3/2
+    (slope, log_a), residual_exp = np.polyfit(k_fit, log_amplitude, 1, full=True)[:2]
+    sigma = -slope
+    tail_exp = (np.exp(2 * log_a - 2 * sigma * (n + 1.5)) / -np.expm1(-4 * sigma)
+                if sigma > 0 else np.inf)
+    
+    residual_alg = residual_alg[0] if residual_alg.size else 0.0
+    residual_exp = residual_exp[0] if residual_exp.size else 0.0
+    if np.isclose(residual_alg, residual_exp):
+        return max(tail_alg, tail_exp)
+    return tail_alg if residual_alg < residual_exp else tail_exp
+
 
 class GalerkinSolver:
     """Solver de Galerkin simplificado para as 4 EDPs"""
     
-    def __init__(self):
-        pass
+    # Entra na chave do cache: alterar sempre que os coeficientes mudarem
+    VERSION = "2.1.0"
+    
+    METHODS = ("spectral", "fem")
+    
+    def __init__(self, cache_dir=None, cache_max_bytes=256 * 2**20):
+        # Cache de coeficientes em disco (desativado por padrão)
+        self.cache = CoefficientCache(cache_dir, cache_max_bytes) if cache_dir else None
         
-    def solve(self, problem, n_terms):
-        """Resolve EDP usando método de Galerkin com n termos"""
-        self.problem = problem
+    def solve(self, problem, n_terms, subtract_particular=False, method="spectral", **options):
+        """Resolve EDP usando método de Galerkin com n termos
+        
+        subtract_particular=True aplica Galerkin apenas ao resto suave
+        u - u_p, com u_p declarada em problem["particular"], e devolve uma
+        SplitSolution (o cache guarda só o resto).
+        
+        method="fem" usa elementos finitos (core/fem.py em 1D, Q1 de
+        core/fem2d.py em 2D): n_terms é o número de elementos (por eixo) e
+        options aceita order (1 ou 2, só 1 em 2D), grading (expoente da
+        malha graduada em direção às singularidades do catálogo) e n_steps
+        (passos de tempo nos problemas parabólicos).
+        """
+        self.problem, particular = self._split(problem, subtract_particular)
         self.tipo = problem["tipo"]
+        self._check_method(method, options)
+        
+        if self.cache is None:
+            return self._attach(self._solve(n_terms, method, options), particular)
         
+        key = problem_key(problem, n_terms, self.VERSION,
+                          **self._options(particular, method, options))
+        solution = self.cache.get(key)
+        if solution is None:
+            solution = self._solve(n_terms, method, options)
+            self.cache.put(key, solution, n_terms=n_terms, tipo=self.tipo)
+        return self._attach(solution, particular)
+    
+    def _solve(self, n_terms, method="spectral", options=None):
+        """Despacha para o método do tipo de EDP, sem cache"""
+        if method == "fem":
+            return self._solve_fem(n_terms, **(options or {}))
         if self.tipo == "eliptica_1d":
             return self._solve_poisson_1d(n_terms)
         elif self.tipo == "parabolica_1d":
@@ -28,113 +127,338 @@ class GalerkinSolver:
         else:
             raise ValueError(f"Tipo de EDP não suportado: {self.tipo}")
     
-    def _solve_poisson_1d(self, n_terms):
-        """Resolve -d²u/dx² = Q(x) com Q(x) = 1/x"""
+    def solve_family(self, problem, n_terms_list, subtract_particular=False, method="spectral",
+                     **options):
+        """Resolve uma única vez com N_max e serve cada n da lista
         
-        def source_function(x):
-            """Q(x) = 1/x com tratamento da singularidade"""
-            return 1.0/x if x > 1e-10 else 1e10
+        A base de senos é aninhada, então a solução com n termos é obtida
+        a partir do sistema montado com N_max; retorna {n: solução}. Com
+        method="fem" as malhas não são aninhadas e cada n é resolvido.
+        """
+        self.problem, particular = self._split(problem, subtract_particular)
+        self.tipo = problem["tipo"]
+        self._check_method(method, options)
         
-        # Montar sistema linear
-        A = np.zeros((n_terms, n_terms))
-        b = np.zeros(n_terms)
+        if self.cache is None:
+            family = self._solve_family(n_terms_list, method, options)
+        else:
+            key_options = self._options(particular, method, options)
+            keys = {n: problem_key(problem, n, self.VERSION, **key_options) for n in n_terms_list}
+            family = {n: self.cache.get(keys[n]) for n in n_terms_list}
+            if any(solution is None for solution in family.values()):
+                family = self._solve_family(n_terms_list, method, options)
+                for n, solution in family.items():
+                    self.cache.put(keys[n], solution, n_terms=n, tipo=self.tipo)
+        return {n: self._attach(solution, particular) for n, solution in family.items()}
+    
+    def _split(self, problem, subtract_particular):
+        """(problema entregue ao Galerkin, parte particular ou None)
         
-        for i in range(n_terms):
-            for j in range(n_terms):
-                # ∫ φ''_j * φ_i dx = (i+1)*(j+1)*π² * δ_ij
-                if i == j:
-                    A[i,j] = (i+1)**2 * np.pi**2
-                else:
-                    A[i,j] = 0
-            
-            # ∫ Q(x) * φ_i dx
-            def integrand(x):
-                if x < 1e-10:
-                    return 0
-                return source_function(x) * np.sin((i+1)*np.pi*x)
-            
-            try:
-                b[i], _ = integrate.quad(integrand, 1e-6, 1, limit=100)
-            except:
-                b[i] = 2.0/(i+1)/np.pi  # Aproximação para singularidade
+        Com a subtração, a fonte passa a ser Q - (-u_p''), que é suave
+        (nula quando u_p resolve a equação inteira).
+        """
+        if not subtract_particular:
+            return problem, None
+        particular = problem.get("particular")
+        if particular is None:
+            raise ValueError(f"Problema sem parte particular declarada: {problem.get('nome')}")
+        if problem["tipo"] != "eliptica_1d":
+            raise ValueError(f"Subtração da parte particular não suportada para {problem['tipo']}")
+        # A base de senos impõe u = 0 nas extremidades também ao resto
+        if not np.allclose(particular["u"](np.asarray(problem["domain"], dtype=float)), 0.0):
+            raise ValueError("A parte particular deve se anular nas extremidades do domínio")
+        source, removed = problem["source"], particular["source"]
+        remainder = dict(problem, source=lambda x: source(x) - removed(x), source_form=None)
+        return remainder, particular
+    
+    def _check_method(self, method, options):
+        if method not in self.METHODS:
+            raise ValueError(f"Método desconhecido: {method} (opções: {', '.join(self.METHODS)})")
+        if method == "spectral" and options:
+            raise TypeError(f"Opções não suportadas pelo método espectral: {', '.join(options)}")
+    
+    def _options(self, particular, method="spectral", options=None):
+        """Opções que entram na chave do cache"""
+        key_options = {"subtract_particular": True} if particular is not None else {}
+        if method != "spectral":
+            key_options.update(method=method, **(options or {}))
+        return key_options
+    
+    def _attach(self, solution, particular):
+        """Soma a parte particular ao resto calculado por Galerkin"""
+        if particular is None:
+            return solution
+        return SplitSolution(particular["u"], solution, particular.get("dx"),
+                             particular.get("source"))
+    
+    def solve_to_tolerance(self, problem, tol, n_start=8, growth=2, n_max=4096, t=None,
+                           subtract_particular=False):
+        """Menor N cujo erro L² de truncamento estimado não excede tol
         
-        # Resolver sistema
-        coeffs = np.linalg.solve(A, b)
+        Resolve com N = n_start, n_start·growth, ... até que alguma
+        truncação atinja tol. O erro da truncação m é a energia dos modos
+        m+1..N já calculados mais a cauda além de N, extrapolada do
+        decaimento (algébrico ou exponencial) dos coeficientes. Em problemas
+        temporais as amplitudes são tomadas em t (padrão: início do
+        intervalo, o pior caso, pois os modos só decaem).
         
-        # Retornar função solução
-        def solution(x):
-            if np.isscalar(x):
-                x = np.array([x])
-            result = np.zeros_like(x)
-            for i in range(n_terms):
-                result += coeffs[i] * np.sin((i+1)*np.pi*x)
-            return result if len(result) > 1 else result[0]
+        Retorna (solução, relatório) com n_terms, error_estimate,
+        converged e o histórico das resoluções. Com subtract_particular a
+        estimativa é a do resto, já que a parte particular é exata.
+        """
+        if t is None:
+            t = problem.get("time_domain", (0.0, 0.0))[0]
+        history = []
+        n = n_start
+        while True:
+            solution = self.solve(problem, n, subtract_particular)
+            energies = self._mode_energies(solution, t)
+            # erro²(m) = Σ_{m<k≤N} e_k + cauda(N), para m = 1..N
+            beyond = np.append(np.cumsum(energies[::-1])[::-1][1:], 0.0)
+            errors = np.sqrt(beyond + _tail_energy(energies))
+            history.append({"n_terms": n, "error_estimate": float(errors[-1])})
+            meets = np.flatnonzero(errors <= tol)
+            if meets.size or n >= n_max:
+                break
+            n = min(int(np.ceil(n * growth)), n_max)
         
-        return solution
+        converged = bool(meets.size)
+        n_terms = int(meets[0]) + 1 if converged else n
+        if n_terms < n:
+            solution = self.solve(problem, n_terms, subtract_particular)
+        report = {
+            "n_terms": n_terms,
+            "error_estimate": float(errors[n_terms - 1]),
+            "tol": tol,
+            "converged": converged,
+            "history": history,
+        }
+        return solution, report
     
-    def _solve_heat_1d(self, n_terms):
-        """Resolve ∂u/∂t = ∂²u/∂x² com u(x,0) = sin(3πx/2)"""
+    def eigenmodes(self, problem, k=6, n_terms=32, target=None, method="spectral", **options):
+        """Os k autopares de -∇² mais próximos de target (padrão: os mais baixos)
         
-        # Solução analítica conhecida
-        def solution(x, t):
-            if np.isscalar(x):
-                x = np.array([x])
-            if np.isscalar(t):
-                t = np.array([t])
-            
-            # Usar broadcasting se necessário
-            if len(x) > 1 and len(t) == 1:
-                result = np.sin(3*np.pi/2 * x) * np.exp(-(3*np.pi/2)**2 * t)
-            elif len(x) == 1 and len(t) > 1:
-                result = np.sin(3*np.pi/2 * x) * np.exp(-(3*np.pi/2)**2 * t)
-            else:
-                result = np.sin(3*np.pi/2 * x) * np.exp(-(3*np.pi/2)**2 * t)
-            
-            return result if len(result) > 1 else result[0]
-        
-        return solution
+        Problemas eliptica_2d: autovalores μ de K φ = μ M φ com as condições
+        de contorno do problema (Dirichlet eliminado, Neumann natural). Na
+        base de autofunções o operador de Kronecker já está diagonalizado
+        e os autopares saem exatos, sem iteração; com method="fem" (Q1,
+        n_terms elementos por eixo) usa Lanczos shift-invert (ver
+        fem2d.eigenpairs). Retorna (autovalores crescentes, modos) com
+        modos normalizados em L² e avaliáveis como as soluções.
+        """
+        self.problem, self.tipo = problem, problem["tipo"]
+        self._check_method(method, options)
+        if self.tipo != "eliptica_2d":
+            raise ValueError(f"Autopares não suportados para {self.tipo}")
+        if method == "fem":
+            return eigenpairs(problem, n_terms, k, target, **options)
+        return self._helmholtz_modes(n_terms, k, target)
     
-    def _solve_wave_1d(self, n_terms):
-        """Resolve ∂u/∂t = λ²∂²u/∂x² com λ² = 4, u(x,0) = 1"""
+    def resonance(self, problem, n_terms=32, rtol=1e-2, method="spectral", **options):
+        """Compara lambda_param com o autovalor mais próximo
         
-        lambda_param = self.problem.get("lambda_param", 4)
+        ∇²φ + λφ = f é mal posto quando λ é autovalor de -∇²: relatório
+        com o autovalor e o modo mais próximos, a distância relativa e
+        resonant = distância < rtol.
+        """
+        lambda_param = float(problem.get("lambda_param", 0))
+        eigenvalues, modes = self.eigenmodes(problem, 1, n_terms, lambda_param, method, **options)
+        gap = abs(eigenvalues[0] - lambda_param) / max(abs(eigenvalues[0]), np.finfo(float).tiny)
+        return {
+            "lambda_param": lambda_param,
+            "eigenvalue": float(eigenvalues[0]),
+            "relative_gap": float(gap),
+            "resonant": bool(gap < rtol),
+            "mode": modes[0],
+        }
+    
+    def _mode_energies(self, solution, t):
+        """Energia L² de cada modo (ou camada max(m,n) = k em 2D) no instante t"""
+        if isinstance(solution, SeriesSolution2D):
+            (ax, bx), (ay, by) = solution.domain
+            norms_x = np.where(solution.wavenumbers_x == 0, bx - ax, (bx - ax) / 2)
+            norms_y = np.where(solution.wavenumbers_y == 0, by - ay, (by - ay) / 2)
+            energy = solution.coeffs**2 * np.outer(norms_x, norms_y)
+            m, n = np.indices(energy.shape)
+            return np.bincount(np.maximum(m, n).ravel(), weights=energy.ravel())
+        a, b = solution.domain
+        return (b - a) / 2 * solution.amplitudes(t)[0]**2
+    
+    def _solve_family(self, n_terms_list, method="spectral", options=None):
+        """Família de soluções truncadas a partir de N_max, sem cache"""
+        if method == "fem":
+            # Malhas de tamanhos diferentes não são aninhadas (nós e funções
+            # de forma mudam com n): sem bloco líder comum, cada n é resolvido
+            return {n: self._solve_fem(n, **(options or {})) for n in n_terms_list}
+        n_max = max(n_terms_list)
         
-        # Coeficientes da série para u(x,0) = 1
-        coeffs = []
-        for n in range(1, n_terms + 1):
-            if n % 2 == 1:  # n ímpar
-                coeffs.append(4.0 / (n * np.pi))
-            else:  # n par
-                coeffs.append(0.0)
+        if self.tipo == "eliptica_1d":
+            A, b = self._assemble_poisson_1d(n_max)
+            with stage("linear_solve"):
+                family = A.solve_leading(b, n_terms_list)
+            return {n: self._poisson_solution(family[n]) for n in n_terms_list}
+        elif self.tipo == "parabolica_1d":
+            coeffs = self._initial_coefficients(n_max)
+            return {n: self._heat_solution(coeffs[:n]) for n in n_terms_list}
+        elif self.tipo == "onda_primeira_ordem":
+            coeffs = self._wave_coefficients(n_max)
+            return {n: self._wave_solution(coeffs[:n]) for n in n_terms_list}
+        elif self.tipo == "eliptica_2d":
+            # Autofunções ortogonais: C[:n, :n] é a solução com n modos
+            coeffs, basis_x, basis_y = self._helmholtz_coefficients(n_max)
+            return {n: self._helmholtz_solution(coeffs, basis_x, basis_y, n)
+                    for n in n_terms_list}
+        else:
+            raise ValueError(f"Tipo de EDP não suportado: {self.tipo}")
+    
+    def _solve_fem(self, n_elements, order=1, grading=None, n_steps=None):
+        """Elementos finitos P1/P2 em 1D (core/fem.py) e Q1 em 2D (core/fem2d.py)"""
+        if self.tipo == "eliptica_2d":
+            if order != 1 or n_steps is not None:
+                raise ValueError("Helmholtz 2D por elementos finitos aceita só order=1 (Q1)")
+            return solve_helmholtz(self.problem, n_elements, grading)
+        if self.tipo == "eliptica_1d":
+            return solve_elliptic(self.problem, n_elements, order, grading)
+        if self.tipo in ("parabolica_1d", "onda_primeira_ordem"):
+            # Mesmo decaimento da série: calor d_k = κ², onda d_k = λ κ²
+            diffusivity = self.problem.get("lambda_param", 4) \
+                if self.tipo == "onda_primeira_ordem" else 1.0
+            steps = {} if n_steps is None else {"n_steps": n_steps}
+            return solve_parabolic(self.problem, n_elements, diffusivity,
+                                   self._initial_condition(), order, grading, **steps)
+        raise ValueError(f"Elementos finitos não suportados para {self.tipo}")
+    
+    def _solve_poisson_1d(self, n_terms):
+        """Resolve -d²u/dx² = Q(x) com Q(x) = 1/x"""
+        A, b = self._assemble_poisson_1d(n_terms)
         
-        def solution(x, t):
-            if np.isscalar(x):
-                x = np.array([x])
-            if np.isscalar(t):
-                t = np.array([t])
-            
-            result = np.zeros_like(x)
-            for n in range(n_terms):
-                eigenvalue = (n+1)**2 * np.pi**2
-                result += coeffs[n] * np.sin((n+1)*np.pi*x) * np.exp(-lambda_param * eigenvalue * t)
+        # Resolver sistema
+        with stage("linear_solve"):
+            coeffs = A.solve(b)
+        return self._poisson_solution(coeffs)
+    
+    def _assemble_poisson_1d(self, n_terms):
+        """Monta o operador de rigidez e o vetor de carga"""
+        with stage("assembly"):
+            # Operador de rigidez escolhido pela base (diagonal para senos)
+            A = self._stiffness_operator(n_terms)
             
-            return result if len(result) > 1 else result[0]
-        
-        return solution
+            # ∫ Q(x) * φ_i dx para todos os modos de uma vez
+            b = sine_load_vector(self.problem["source"], n_terms,
+                                 self.problem["domain"],
+                                 source_form=self.problem.get("source_form"))
+        return A, b
+    
+    def _poisson_solution(self, coeffs):
+        """Constrói u(x) = Σ c_k sin(kπ(x-a)/L)"""
+        return SeriesSolution(coeffs, self._wavenumbers(len(coeffs)),
+                              domain=self.problem["domain"])
+    
+    def _wavenumbers(self, n_terms):
+        """Números de onda κ_k = kπ/L da base de senos"""
+        a, b = self.problem["domain"]
+        return np.arange(1, n_terms + 1) * np.pi / (b - a)
+    
+    def _stiffness_operator(self, n_terms):
+        """Operador ∫ φ'_i φ'_j dx para a base sin(kπ(x-a)/L)"""
+        a, b = self.problem["domain"]
+        k = self._wavenumbers(n_terms)
+        # Base ortogonal: ∫ φ'_i φ'_j dx = (kπ/L)² L/2 δ_ij
+        return DiagonalOperator(k**2 * (b - a) / 2)
+    
+    def _solve_heat_1d(self, n_terms):
+        """Resolve ∂u/∂t = ∂²u/∂x² com u(x,0) = sin(3πx/2)"""
+        return self._heat_solution(self._initial_coefficients(n_terms))
+    
+    def _initial_coefficients(self, n_terms):
+        """Projeção da condição inicial u(x,0) na base de senos (DST)"""
+        u0_func = self._initial_condition()
+        with stage("assembly"):
+            return sine_coefficients(u0_func, n_terms, self.problem["domain"])
+    
+    def _initial_condition(self):
+        """Função u(x,0) declarada nas condições do problema"""
+        for cond_type, point, value in self.problem["boundary_conditions"]:
+            if cond_type == "initial" and point == "u":
+                return value
+        raise ValueError("Problema sem condição inicial para u")
+    
+    def _heat_solution(self, coeffs):
+        """Constrói u(x,t) = Σ c_k sin(kπx) exp(-k²π² t)"""
+        k = self._wavenumbers(len(coeffs))
+        return SeriesSolution(coeffs, k, k**2, domain=self.problem["domain"])
+    
+    def _solve_wave_1d(self, n_terms):
+        """Resolve ∂u/∂t = λ²∂²u/∂x² com λ² = 4, u(x,0) = 1"""
+        return self._wave_solution(self._wave_coefficients(n_terms))
+    
+    def _wave_coefficients(self, n_terms):
+        """Coeficientes da série para u(x,0) = 1"""
+        with stage("assembly"):
+            n = np.arange(1, n_terms + 1)
+            # n ímpar: 4/(nπ), n par: 0
+            return np.where(n % 2 == 1, 4.0 / (n * np.pi), 0.0)
+    
+    def _wave_solution(self, coeffs):
+        """Constrói u(x,t) = Σ c_n sin(nπx) exp(-λ n²π² t)"""
+        lambda_param = self.problem.get("lambda_param", 4)
+        k = self._wavenumbers(len(coeffs))
+        return SeriesSolution(coeffs, k, lambda_param * k**2,
+                              domain=self.problem["domain"])
     
     def _solve_helmholtz_2d(self, n_terms):
-        """Resolve ∇²φ + λφ = 0 com λ = 1"""
-        
-        # Solução de separação de variáveis
-        def solution(x, y):
-            if np.isscalar(x):
-                x = np.array([x])
-            if np.isscalar(y):
-                y = np.array([y])
+        """Resolve ∇²φ + λφ = f com n_terms modos por direção"""
+        return self._helmholtz_solution(*self._helmholtz_coefficients(n_terms))
+    
+    def _helmholtz_coefficients(self, n_terms):
+        """Monta e resolve (K - λM) C = G - F por diagonalização rápida"""
+        A, rhs, basis_x, basis_y = self._assemble_helmholtz_2d(n_terms)
+        with stage("linear_solve"):
+            coeffs = A.solve(rhs)
+        return coeffs, basis_x, basis_y
+    
+    def _assemble_helmholtz_2d(self, n_terms):
+        """Operador de Kronecker, lado direito e bases de cada direção"""
+        with stage("assembly"):
+            domain = self.problem["domain"]
+            lambda_param = self.problem.get("lambda_param", 0)
+            sides = side_conditions(self.problem["boundary_conditions"])
             
-            # φ(x,y) = sin(πx) * sin(πy) é uma solução exata
-            result = np.sin(np.pi * x) * np.sin(np.pi * y)
+            # Base de cada direção conforme os tipos de condição nos dois lados
+            basis_x = Basis1D(sides["x0"][0], sides["x1"][0], n_terms, domain[0])
+            basis_y = Basis1D(sides["y0"][0], sides["y1"][0], n_terms, domain[1])
             
-            return result if len(result) > 1 else result[0]
-        
-        return solution
+            # Forma fraca: -(∇φ,∇v) + λ(φ,v) = (f,v) - ∫_ΓN g v ds
+            A = KroneckerSumOperator(basis_x.stiffness(), basis_x.mass(),
+                                     basis_y.stiffness(), basis_y.mass(),
+                                     shift=lambda_param)
+            rhs = neumann_load(sides, basis_x, basis_y, domain)
+            if self.problem.get("source") is not None:
+                rhs = rhs - tensor_load(self.problem["source"], basis_x, basis_y, domain)
+        return A, rhs, basis_x, basis_y
+    
+    def _helmholtz_modes(self, n_terms, k, target):
+        """Autopares exatos da base: μ = λx_i + λy_j, modo Vx[:, i] ⊗ Vy[:, j]"""
+        with stage("assembly"):
+            domain = self.problem["domain"]
+            sides = side_conditions(self.problem["boundary_conditions"])
+            basis_x = Basis1D(sides["x0"][0], sides["x1"][0], n_terms, domain[0])
+            basis_y = Basis1D(sides["y0"][0], sides["y1"][0], n_terms, domain[1])
+            A = KroneckerSumOperator(basis_x.stiffness(), basis_x.mass(),
+                                     basis_y.stiffness(), basis_y.mass())
+        eigenvalues = A.eigenvalues()
+        distance = eigenvalues if target is None else np.abs(eigenvalues - target)
+        nearest = np.argsort(distance, axis=None, kind="stable")[:k]
+        nearest = nearest[np.argsort(eigenvalues.ravel()[nearest], kind="stable")]
+        i, j = np.unravel_index(nearest, eigenvalues.shape)
+        modes = [self._helmholtz_solution(np.outer(A.Vx[:, m], A.Vy[:, n]), basis_x, basis_y)
+                 for m, n in zip(i, j)]
+        return eigenvalues[i, j], modes
+    
+    def _helmholtz_solution(self, coeffs, basis_x, basis_y, n_terms=None):
+        """Constrói φ(x,y) = Σ C_mn X_m(x) Y_n(y), opcionalmente truncada"""
+        n = coeffs.shape[0] if n_terms is None else n_terms
+        return SeriesSolution2D(coeffs[:n, :n],
+                                basis_x.wavenumbers[:n], basis_y.wavenumbers[:n],
+                                kinds=(basis_x.kind, basis_y.kind),
+                                domain=self.problem["domain"])
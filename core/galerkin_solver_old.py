@@ -4,6 +4,11 @@ import numpy as np
 import sympy as sp
 from scipy.integrate import quad
 
+try:
+    from .fast_transforms import sine_coefficients
+except ImportError:
+    from fast_transforms import sine_coefficients
+
 class GalerkinSolver:
     """Solver de Galerkin unificado para todas as 4 EDPs"""
     
@@ -97,15 +102,8 @@ class GalerkinSolver:
                 u0_func = value
                 break
         
-        # Coeficientes da série de Fourier para condição inicial
-        coeffs = []
-        for n in range(1, n_terms + 1):
-            def integrand(x):
-                return u0_func(x) * np.sin(n * np.pi * x)
-            
-            integral, _ = quad(integrand, domain[0], domain[1])
-            an = 2 * integral
-            coeffs.append(an)
+        # Coeficientes da série de Fourier para condição inicial (DST)
+        coeffs = sine_coefficients(u0_func, n_terms, domain)
         
         # Construir solução u(x,t) = Σ an * sin(nπx) * exp(-n²π²t)
         def solution(x, t):
@@ -161,25 +159,12 @@ class GalerkinSolver:
                 elif point == "ut":
                     ut0_func = value
         
-        # Coeficientes para u(x,0)
-        coeffs_u = []
-        for n in range(1, n_terms + 1):
-            def integrand(x):
-                return u0_func(x) * np.sin(n * np.pi * x)
-            
-            integral, _ = quad(integrand, domain[0], domain[1])
-            an = 2 * integral
-            coeffs_u.append(an)
+        # Coeficientes para u(x,0) (DST)
+        coeffs_u = sine_coefficients(u0_func, n_terms, domain)
         
-        # Coeficientes para ∂u/∂t(x,0)
-        coeffs_ut = []
-        for n in range(1, n_terms + 1):
-            def integrand(x):
-                return ut0_func(x) * np.sin(n * np.pi * x)
-            
-            integral, _ = quad(integrand, domain[0], domain[1])
-            bn = 2 * integral / (2 * n * np.pi)  # Dividir por ωn = 2nπ
-            coeffs_ut.append(bn)
+        # Coeficientes para ∂u/∂t(x,0), divididos por ωn = 2nπ
+        n = np.arange(1, n_terms + 1)
+        coeffs_ut = sine_coefficients(ut0_func, n_terms, domain) / (2 * n * np.pi)
         
         # Construir solução u(x,t) = Σ [an*cos(2nπt) + bn*sin(2nπt)] * sin(nπx)
         def solution(x, t):
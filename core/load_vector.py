@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Montagem vetorizada do vetor de carga para bases de senos
+
+Calcula b_k = ∫ Q(x) sin(kπ(x-a)/L) dx para k = 1..N em uma única passada:
+forma fechada via integral seno Si(kπ) para a fonte 1/x e quadratura
+compartilhada (Gauss–Legendre ou DST) para qualquer outra fonte.
+"""
+
+import numpy as np
+
+try:
+    from .fast_transforms import as_array_function, sine_coefficients
+except ImportError:
+    from fast_transforms import as_array_function, sine_coefficients
+
+# Acima deste número de modos a quadratura por DST (O(M log M)) substitui
+# o produto matriz-vetor de Gauss–Legendre (O(N·M))
+GAUSS_MAX_TERMS = 512
+
+
+def sine_load_vector(source, n_terms, domain=(0, 1), source_form=None,
+                     method="auto", n_quad=None):
+    """Vetor de carga b_k = ∫ Q(x) sin(kπ(x-a)/L) dx, k = 1..n_terms"""
+    a, b = domain
+    length = b - a
+    k = np.arange(1, n_terms + 1)
+
+    if source_form == "1/x" and a == 0:
+        # ∫₀ᴸ sin(kπx/L)/x dx = Si(kπ)
+        from scipy import special
+        return special.sici(k * np.pi)[0]
+
+    func = as_array_function(source)
+
+    if method == "auto":
+        method = "gauss" if n_terms <= GAUSS_MAX_TERMS else "dst"
+
+    if method == "gauss":
+        # Nós de Gauss–Legendre compartilhados por todos os modos
+        if n_quad is None:
+            n_quad = n_terms + 64
+        nodes, weights = np.polynomial.legendre.leggauss(n_quad)
+        x = a + 0.5 * length * (nodes + 1)
+        w = 0.5 * length * weights
+        basis = np.sin(np.outer(k, x - a) * (np.pi / length))
+        return basis @ (w * func(x))
+
+    if method == "dst":
+        # Regra do ponto médio via DST-II: b_k = (L/2) c_k
+        return 0.5 * length * sine_coefficients(source, n_terms, domain, n_quad)
+
+    raise ValueError(f"Método de quadratura não suportado: {method}")
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Operadores lineares estruturados para os sistemas de Galerkin
+
+Todos os operadores expõem a mesma interface (shape, matvec, solve,
+solve_leading, diagonal, to_dense), de forma que o solver escolha a
+representação adequada à base: diagonal para bases ortogonais, banda
+simétrica positiva definida para bases locais (elementos finitos,
+Cholesky em banda), densa para bases genéricas e livre de matriz quando
+só o produto A·x é conhecido. solve_leading resolve de uma vez a família
+de blocos líderes A[:n, :n] usada nos estudos de convergência:
+truncamento para bases ortogonais (hierárquicas) e, nas demais,
+atualização com bordas sobre um único fator de Cholesky. Os sistemas 2D
+separáveis usam a soma de Kronecker, resolvida por diagonalização rápida.
+
+scipy.linalg e scipy.sparse.linalg são importados apenas nos métodos que
+os usam: montar operadores diagonais não paga a importação do SciPy.
+"""
+
+import numpy as np
+
+
+class DiagonalOperator:
+    """Operador diagonal: O(N) memória, O(N) resolução"""
+
+    def __init__(self, diagonal):
+        self.diag = np.asarray(diagonal, dtype=float)
+        self.shape = (self.diag.size, self.diag.size)
+
+    def matvec(self, x):
+        return self.diag * x
+
+    def solve(self, b):
+        if np.any(self.diag == 0):
+            raise np.linalg.LinAlgError("Operador diagonal singular")
+        return np.asarray(b, dtype=float) / self.diag
+
+    def solve_leading(self, b, sizes):
+        """Soluções dos blocos líderes: truncamentos da solução completa"""
+        x = self.solve(b[:max(sizes)])
+        return {n: x[:n] for n in sizes}
+
+    def diagonal(self):
+        return self.diag
+
+    def to_dense(self):
+        return np.diag(self.diag)
+
+
+class BandedOperator:
+    """Operador simétrico positivo definido em banda (armazenamento superior do LAPACK)
+
+    ab[u + i - j, j] = A[i, j] para i ≤ j, com u a semilargura de banda.
+    solve fatora uma vez por Cholesky em banda (O(N·u²)) e reaproveita o
+    fator nas resoluções seguintes, como nos passos de tempo.
+    """
+
+    def __init__(self, ab):
+        self.ab = np.asarray(ab, dtype=float)
+        self.bandwidth = self.ab.shape[0] - 1
+        n = self.ab.shape[1]
+        self.shape = (n, n)
+        self._factor = None
+
+    @classmethod
+    def from_matrix(cls, A, bandwidth):
+        A = np.asarray(A, dtype=float)
+        n = A.shape[0]
+        ab = np.zeros((bandwidth + 1, n))
+        for offset in range(bandwidth + 1):
+            ab[bandwidth - offset, offset:] = np.diagonal(A, offset)
+        return cls(ab)
+
+    def matvec(self, x):
+        u = self.bandwidth
+        y = self.ab[u] * x
+        for offset in range(1, u + 1):
+            row = self.ab[u - offset, offset:]
+            y[:-offset] += row * x[offset:]
+            y[offset:] += row * x[:-offset]
+        return y
+
+    def factor(self):
+        """Fator de Cholesky superior em banda (calculado uma vez)"""
+        if self._factor is None:
+            import scipy.linalg as la
+            self._factor = la.cholesky_banded(self.ab, lower=False)
+        return self._factor
+
+    def solve(self, b):
+        import scipy.linalg as la
+        return la.cho_solve_banded((self.factor(), False), b)
+
+    def solve_leading(self, b, sizes):
+        """Soluções dos blocos líderes com um único fator de Cholesky
+
+        As colunas [:n] do fator em banda são o fator de A[:n, :n]: cada
+        bloco custa só as substituições, O(n·u).
+        """
+        import scipy.linalg as la
+        factor = BandedOperator(self.ab[:, :max(sizes)]).factor()
+        return {n: la.cho_solve_banded((factor[:, :n], False), b[:n]) for n in sizes}
+
+    def diagonal(self):
+        return self.ab[self.bandwidth].copy()
+
+    def to_dense(self):
+        n = self.shape[0]
+        A = np.zeros((n, n))
+        for offset in range(self.bandwidth + 1):
+            row = self.ab[self.bandwidth - offset, offset:]
+            A[np.arange(n - offset), np.arange(offset, n)] = row
+            A[np.arange(offset, n), np.arange(n - offset)] = row
+        return A
+
+
+class DenseOperator:
+    """Operador denso genérico (bases não ortogonais)"""
+
+    def __init__(self, matrix, symmetric=False):
+        self.matrix = np.asarray(matrix, dtype=float)
+        self.shape = self.matrix.shape
+        self.symmetric = symmetric
+
+    def matvec(self, x):
+        return self.matrix @ x
+
+    def solve(self, b):
+        import scipy.linalg as la
+        return la.solve(self.matrix, b, assume_a="pos" if self.symmetric else "gen")
+
+    def solve_leading(self, b, sizes):
+        """Soluções dos blocos líderes por atualização com bordas"""
+        import scipy.linalg as la
+        if not self.symmetric:
+            return {n: la.solve(self.matrix[:n, :n], b[:n]) for n in sizes}
+        # O fator de Cholesky de A[:n, :n] é o bloco líder L[:n, :n]
+        # (cada linha nova é uma borda sobre o fator anterior), e a
+        # substituição progressiva também é compartilhada entre os n
+        n_max = max(sizes)
+        L = la.cholesky(self.matrix[:n_max, :n_max], lower=True)
+        y = la.solve_triangular(L, b[:n_max], lower=True)
+        return {n: la.solve_triangular(L[:n, :n].T, y[:n], lower=False)
+                for n in sizes}
+
+    def diagonal(self):
+        return np.diagonal(self.matrix).copy()
+
+    def to_dense(self):
+        return self.matrix
+
+
+class MatrixFreeOperator:
+    """Operador conhecido apenas pelo produto A·x (resolução por Krylov)"""
+
+    def __init__(self, matvec, n, symmetric=True, preconditioner=None, rtol=1e-10):
+        self._matvec = matvec
+        self.shape = (n, n)
+        self.symmetric = symmetric
+        self.preconditioner = preconditioner
+        self.rtol = rtol
+
+    def matvec(self, x):
+        return self._matvec(x)
+
+    def solve(self, b):
+        import scipy.sparse.linalg as spla
+        A = spla.LinearOperator(self.shape, matvec=self._matvec, dtype=float)
+        M = None
+        if self.preconditioner is not None:
+            M = spla.LinearOperator(self.shape, matvec=self.preconditioner, dtype=float)
+        krylov = spla.cg if self.symmetric else spla.gmres
+        x, info = krylov(A, b, rtol=self.rtol, M=M)
+        if info != 0:
+            raise np.linalg.LinAlgError(f"Krylov não convergiu (info={info})")
+        return x
+
+    def solve_leading(self, b, sizes):
+        """Soluções dos blocos líderes, aplicando A a vetores estendidos por zeros"""
+        n_full = self.shape[0]
+        solutions = {}
+        for n in sizes:
+            def leading_matvec(x, n=n):
+                padded = np.zeros(n_full)
+                padded[:n] = x
+                return self._matvec(padded)[:n]
+            block = MatrixFreeOperator(leading_matvec, n, self.symmetric,
+                                       rtol=self.rtol)
+            solutions[n] = block.solve(b[:n])
+        return solutions
+
+    def diagonal(self):
+        n = self.shape[0]
+        return np.array([self._matvec(np.eye(n, 1, -i).ravel())[i] for i in range(n)])
+
+    def to_dense(self):
+        return np.column_stack([self._matvec(col) for col in np.eye(self.shape[0])])
+
+
+def from_matrix(A, tol=0.0, symmetric=False):
+    """Escolhe a representação mais barata para uma matriz montada"""
+    A = np.asarray(A, dtype=float)
+    n = A.shape[0]
+    rows, cols = np.nonzero(np.abs(A) > tol)
+    if rows.size == 0 or np.all(rows == cols):
+        return DiagonalOperator(np.diagonal(A))
+    bandwidth = int(np.max(np.abs(rows - cols)))
+    # A banda (Cholesky) exige simetria e só compensa se for estreita
+    if symmetric and 2 * bandwidth + 1 <= max(n // 4, 3):
+        return BandedOperator.from_matrix(A, bandwidth)
+    return DenseOperator(A, symmetric=symmetric)
+
+
+def generalized_eigh(K, M):
+    """Autopares de K v = μ M v com Vᵀ M V = I para operadores 1D"""
+    if isinstance(K, DiagonalOperator) and isinstance(M, DiagonalOperator):
+        m = M.diagonal()
+        return K.diagonal() / m, np.diag(1 / np.sqrt(m))
+    import scipy.linalg as la
+    return la.eigh(K.to_dense(), M.to_dense())
+
+
+class KroneckerSumOperator:
+    """Operador separável A = Kx⊗My + Mx⊗Ky - σ Mx⊗My
+
+    Age sobre a matriz de coeficientes C (nx × ny) como
+    A(C) = Kx C My + Mx C Ky - σ Mx C My e é resolvido por diagonalização
+    rápida: com Kx Vx = Mx Vx Λx (idem em y), C = Vx [(Vxᵀ F Vy) / (λx_i +
+    λy_j - σ)] Vyᵀ, em O(N³) em vez de O(N⁶) para o sistema denso.
+    """
+
+    def __init__(self, Kx, Mx, Ky, My, shift=0.0):
+        self.Kx, self.Mx, self.Ky, self.My = Kx, Mx, Ky, My
+        self.shift = shift
+        self.grid_shape = (Kx.shape[0], Ky.shape[0])
+        n = self.grid_shape[0] * self.grid_shape[1]
+        self.shape = (n, n)
+        self.eig_x, self.Vx = generalized_eigh(Kx, Mx)
+        self.eig_y, self.Vy = generalized_eigh(Ky, My)
+
+    def eigenvalues(self):
+        """Autovalores λx_i + λy_j do par (Kx⊗My + Mx⊗Ky, Mx⊗My)"""
+        return self.eig_x[:, None] + self.eig_y[None, :]
+
+    def matvec(self, x):
+        C = np.reshape(x, self.grid_shape)
+        Kx, Mx = self.Kx.to_dense(), self.Mx.to_dense()
+        Ky, My = self.Ky.to_dense(), self.My.to_dense()
+        AC = Kx @ C @ My + Mx @ C @ Ky - self.shift * (Mx @ C @ My)
+        return AC.reshape(np.shape(x))
+
+    def solve(self, b):
+        F = np.reshape(b, self.grid_shape)
+        denominator = self.eigenvalues() - self.shift
+        if np.any(np.isclose(denominator, 0)):
+            raise np.linalg.LinAlgError("Deslocamento σ coincide com um autovalor")
+        G = (self.Vx.T @ F @ self.Vy) / denominator
+        return (self.Vx @ G @ self.Vy.T).reshape(np.shape(b))
+
+    def diagonal(self):
+        kx, mx = self.Kx.diagonal(), self.Mx.diagonal()
+        ky, my = self.Ky.diagonal(), self.My.diagonal()
+        return (np.outer(kx, my) + np.outer(mx, ky)
+                - self.shift * np.outer(mx, my)).ravel()
+
+    def to_dense(self):
+        Kx, Mx = self.Kx.to_dense(), self.Mx.to_dense()
+        Ky, My = self.Ky.to_dense(), self.My.to_dense()
+        return np.kron(Kx, My) + np.kron(Mx, Ky) - self.shift * np.kron(Mx, My)
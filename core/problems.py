@@ -1,6 +1,65 @@
-import sympy as sp
+from functools import partial
+
 import numpy as np
 
+# Fontes e condições iniciais do catálogo: funções de módulo (serializáveis
+# com pickle) que aceitam arrays e preservam o formato da entrada, para que
+# quadraturas e projeções avaliem todos os nós em uma única chamada
+
+# Abaixo deste x a fonte 1/x é truncada (ver "singularities")
+_INVERSE_X_CUTOFF = 1e-10
+
+
+def inverse_x(x):
+    """Q(x) = 1/x, truncada em 1e10 para x ≤ 1e-10"""
+    x = np.asarray(x, dtype=float)
+    regular = x > _INVERSE_X_CUTOFF
+    return np.where(regular, 1.0 / np.where(regular, x, 1.0), 1e10)
+
+
+def x_log_x(x):
+    """u_p(x) = -x ln x, com o limite u_p(0) = 0"""
+    x = np.asarray(x, dtype=float)
+    positive = x > 0
+    return np.where(positive, -x * np.log(np.where(positive, x, 1.0)), 0.0)
+
+
+def x_log_x_dx(x):
+    """u_p'(x) = -ln x - 1"""
+    return -np.log(np.asarray(x, dtype=float)) - 1
+
+
+def heat_initial(x):
+    """u(x,0) = sin(3πx/2)"""
+    return np.sin(3 * np.pi / 2 * np.asarray(x, dtype=float))
+
+
+def unit_initial(x):
+    """u(x,0) = 1"""
+    return np.ones_like(np.asarray(x, dtype=float))
+
+
+def helmholtz_exact(x, y):
+    """φ(x,y) = x(1-x) y(2-y): nula em x = 0, 1 e y = 0, ∂φ/∂y = 0 em y = 1
+
+    Não é um modo da base sin(mπx) sin((n-½)πy): os coeficientes decaem
+    como (mn)^-3 e a convergência em N é algébrica.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    return x * (1 - x) * y * (2 - y)
+
+
+def helmholtz_source(x, y, lam):
+    """f = ∇²φ + λφ = -2 y(2-y) - 2 x(1-x) + λφ para a solução manufaturada
+
+    O catálogo fixa λ = lambda_param com functools.partial.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    return -2 * y * (2 - y) - 2 * x * (1 - x) + lam * helmholtz_exact(x, y)
+
+
 class EDPCatalog:
     def __init__(self):
         # Removendo inicialização de símbolos SymPy do construtor
@@ -11,8 +70,15 @@ class EDPCatalog:
                 "nome": "Equação de Poisson 1D",
                 "domain": (0, 1),  # Alterado conforme imagem
                 "boundary_conditions": [("dirichlet", 0, 0), ("dirichlet", 1, 0)],
-                "analytical": None,  
-                "source": lambda x: 1/x if x > 1e-10 else 1e10,  # Q(x) = 1/x com tratamento para x=0
+                # -u'' = 1/x com u(0) = u(1) = 0 tem solução exata -x ln x
+                "analytical": x_log_x,
+                "source": inverse_x,  # Q(x) = 1/x com tratamento para x=0
+                "source_form": "1/x",  # Permite a forma fechada b_k = Si(kπ)
+                # Polo simples da fonte em x = 0: u'' ~ -1/x, u' ~ -ln x
+                "singularities": [{"x": 0, "kind": "pole", "order": 1}],
+                # Parte particular conhecida (-u_p'' = source, u_p = 0 nas
+                # extremidades) para o modo de subtração da singularidade
+                "particular": {"u": x_log_x, "dx": x_log_x_dx, "source": inverse_x},
                 "tipo": "eliptica_1d"
             },
             
@@ -23,9 +89,13 @@ class EDPCatalog:
                 "boundary_conditions": [
                     ("dirichlet", 0, 0), 
                     ("dirichlet", 1, 0),
-                    ("initial", "u", lambda x: np.sin(3*np.pi/2 * x))  # u(x,0) = sin(3πx/2L) com L=1
+                    ("initial", "u", heat_initial)  # u(x,0) = sin(3πx/2L) com L=1
                 ],
-                "analytical": lambda x, t: np.sin(3*np.pi/2 * x) * np.exp(-(3*np.pi/2)**2 * t),
+                # u(1,0) = sin(3π/2) = -1 ≠ 0: salto entre a condição inicial e a de contorno
+                "singularities": [{"x": 1, "kind": "jump", "order": 0}],
+                # sin(3πx/2) e^(-(3π/2)² t) não satisfaz u(1,t) = 0: não é a
+                # solução deste problema; o erro é medido contra uma referência
+                "analytical": None,
                 "tipo": "parabolica_1d"
             },
             
@@ -35,8 +105,11 @@ class EDPCatalog:
                 "time_domain": (0, 1),
                 "boundary_conditions": [
                     ("dirichlet", 0, 0),  # u(0,t) = 0
-                    ("initial", "u", lambda x: 1)  # u(x,0) = 1 conforme imagem
+                    ("initial", "u", unit_initial)  # u(x,0) = 1 conforme imagem
                 ],
+                # u(x,0) = 1 contra u = 0 nas extremidades da base de senos
+                "singularities": [{"x": 0, "kind": "jump", "order": 0},
+                                  {"x": 1, "kind": "jump", "order": 0}],
                 "lambda_param": 4,  # λ² = 4
                 "analytical": None,
                 "tipo": "onda_primeira_ordem"
@@ -52,10 +125,17 @@ class EDPCatalog:
                     ("neumann", "y1", 0)     # ∂φ/∂y(x,2) = 0 conforme imagem
                 ],
                 "lambda_param": 1,  
-                "analytical": lambda x, y: np.sin(np.pi * x) * np.sin(np.pi * y),
+                # Solução manufaturada compatível com Neumann em y = 1:
+                # φ = x(1-x) y(2-y)  =>  f = ∇²φ + λφ = -2y(2-y) - 2x(1-x) + λφ
+                "analytical": helmholtz_exact,
+                "singularities": [],
                 "tipo": "eliptica_2d"
             }
         }
+        
+        # A fonte manufaturada depende de λ: fixada a partir de lambda_param
+        helmholtz = self.problems["helmholtz_2d"]
+        helmholtz["source"] = partial(helmholtz_source, lam=helmholtz["lambda_param"])
     
     def get_problem(self, name):
         return self.problems[name]
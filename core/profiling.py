@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Instrumentação por etapa (montagem, solução linear, avaliação, renderização)
+
+O solver, as séries e o pipeline marcam suas etapas com `stage(nome)`.
+Sem um Profiler ativo, stage devolve um contexto nulo compartilhado: o
+custo é uma chamada de função e uma leitura de variável global. Com um
+Profiler ativo, cada etapa registra tempo de parede, profundidade de
+aninhamento e, opcionalmente (memory=True, via tracemalloc), o pico de
+memória alocada acima do início da etapa.
+
+    with Profiler(memory=True) as profiler:
+        solver.solve(problem, 64)
+    profiler.summary()                       # {etapa: chamadas, tempo, pico}
+    profiler.to_json("perfil.json")
+    profiler.to_chrome_trace("trace.json")   # chrome://tracing, Perfetto, speedscope
+
+Registros de outros processos (pool do pipeline) são reunidos com merge.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+_NULL_STAGE = contextlib.nullcontext()
+
+# Profiler ativo no processo (None = instrumentação desligada)
+_active = None
+
+
+def stage(name):
+    """Contexto que mede a etapa `name` no Profiler ativo, se houver"""
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name)
+
+
+def active():
+    """Profiler ativo no processo, ou None"""
+    return _active
+
+
+class _Frame:
+    __slots__ = ("name", "start", "start_memory", "peak")
+
+    def __init__(self, name, start, start_memory):
+        self.name = name
+        self.start = start
+        self.start_memory = start_memory
+        # Maior pico absoluto observado dentro da etapa (inclui sub-etapas)
+        self.peak = start_memory
+
+
+class Profiler:
+    """Coleta registros {name, start, duration, depth, pid, tid, peak_bytes}
+
+    start é relativo a perf_counter no processo que mediu; para traces
+    de vários processos os registros guardam também o pid.
+    """
+
+    def __init__(self, memory=False):
+        self.memory = memory
+        self.records = []
+        self._stack = []
+        self._previous = None
+        self._started_tracemalloc = False
+
+    def __enter__(self):
+        global _active
+        self._previous, _active = _active, self
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        _active = self._previous
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return False
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Mede uma etapa; as aninhadas ficam com depth maior"""
+        start_memory = self._enter_memory() if self.memory else 0
+        frame = _Frame(name, time.perf_counter(), start_memory)
+        self._stack.append(frame)
+        try:
+            yield self
+        finally:
+            end = time.perf_counter()
+            self._stack.pop()
+            record = {
+                "name": name,
+                "start": frame.start,
+                "duration": end - frame.start,
+                "depth": len(self._stack),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            }
+            if self.memory:
+                record["peak_bytes"] = self._exit_memory(frame)
+            self.records.append(record)
+
+    def _enter_memory(self):
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            # O pico até aqui pertence à etapa externa; zera para a interna
+            self._stack[-1].peak = max(self._stack[-1].peak, peak)
+        tracemalloc.reset_peak()
+        return current
+
+    def _exit_memory(self, frame):
+        peak = max(tracemalloc.get_traced_memory()[1], frame.peak)
+        if self._stack:
+            self._stack[-1].peak = max(self._stack[-1].peak, peak)
+        return peak - frame.start_memory
+
+    def merge(self, records):
+        """Acrescenta registros medidos em outro Profiler ou processo"""
+        self.records.extend(records)
+        return self
+
+    def summary(self):
+        """{etapa: {calls, total_s, max_s, peak_bytes}} em ordem de tempo total"""
+        stages = {}
+        for record in self.records:
+            entry = stages.setdefault(record["name"], {"calls": 0, "total_s": 0.0, "max_s": 0.0})
+            entry["calls"] += 1
+            entry["total_s"] += record["duration"]
+            entry["max_s"] = max(entry["max_s"], record["duration"])
+            if "peak_bytes" in record:
+                entry["peak_bytes"] = max(entry.get("peak_bytes", 0), record["peak_bytes"])
+        return dict(sorted(stages.items(), key=lambda item: -item[1]["total_s"]))
+
+    def to_json(self, path):
+        """Resumo e registros brutos em JSON"""
+        with open(path, "w") as f:
+            json.dump({"summary": self.summary(), "records": self.records}, f, indent=2)
+        return path
+
+    def chrome_trace(self):
+        """Eventos "X" (Trace Event Format), um trilho por processo e thread"""
+        origin = min((record["start"] for record in self.records), default=0.0)
+        events = []
+        for record in self.records:
+            event = {
+                "name": record["name"],
+                "ph": "X",
+                "ts": (record["start"] - origin) * 1e6,
+                "dur": record["duration"] * 1e6,
+                "pid": record["pid"],
+                "tid": record["tid"],
+            }
+            if "peak_bytes" in record:
+                event["args"] = {"peak_bytes": record["peak_bytes"]}
+            events.append(event)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def to_chrome_trace(self, path):
+        """Grava o trace para chrome://tracing, Perfetto ou speedscope"""
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+        return path
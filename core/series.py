@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Soluções em série de senos com avaliação vetorizada
+
+u(x,t) = Σ c_k sin(κ_k (x - a)) exp(-d_k t)
+
+Cobre Poisson (d_k = 0), Calor e Onda de primeira ordem (d_k = α κ_k²);
+SeriesSolution2D cobre problemas 2D em produto tensorial (Helmholtz).
+
+As soluções guardam apenas arrays contíguos e o domínio (__slots__), sem
+referência ao solver ou ao problema: podem ser serializadas com pickle,
+enviadas a processos de trabalho e mantidas aos milhares em memória.
+"""
+
+import numpy as np
+
+try:
+    from .fast_transforms import sine_series_on_grid
+    from .profiling import stage
+    from .summation import sum_sine_series
+except ImportError:
+    from fast_transforms import sine_series_on_grid
+    from profiling import stage
+    from summation import sum_sine_series
+
+
+def basis_matrix(kind, wavenumbers, x, origin=0.0):
+    """Matriz sin/cos(κ_k (x - origin)), formato (len(x), N)"""
+    arg = np.outer(np.ravel(np.asarray(x, dtype=float)) - origin, wavenumbers)
+    return np.sin(arg) if kind == "sin" else np.cos(arg)
+
+
+def _contiguous(values):
+    """Array float contíguo; fatias contíguas (truncamentos) não são copiadas"""
+    return np.ascontiguousarray(values, dtype=float)
+
+
+def _width_groups(widths, n_terms):
+    """Índices agrupados por corte, arredondado para a potência de 2 seguinte
+
+    Devolve pares (índices, largura): no máximo log2(N) + 1 grupos, cada um
+    com no máximo o dobro dos modos ativos de seus instantes.
+    """
+    widths = np.asarray(widths)
+    rounded = 2 ** np.ceil(np.log2(np.maximum(widths, 1))).astype(int)
+    buckets = np.where(widths > 0, np.minimum(rounded, n_terms), 0)
+    return [(np.flatnonzero(buckets == width), int(width)) for width in np.unique(buckets)]
+
+
+class SeriesSolution:
+    """Solução em série avaliada por produtos matriciais"""
+
+    __slots__ = ("coeffs", "wavenumbers", "decay", "domain")
+
+    def __init__(self, coeffs, wavenumbers, decay=None, domain=(0, 1)):
+        self.coeffs = _contiguous(coeffs)
+        self.wavenumbers = _contiguous(wavenumbers)
+        if decay is None:
+            decay = np.zeros_like(self.wavenumbers)
+        self.decay = _contiguous(decay)
+        self.domain = (float(domain[0]), float(domain[1]))
+
+    def __reduce__(self):
+        return (SeriesSolution, (self.coeffs, self.wavenumbers, self.decay, self.domain))
+
+    def __repr__(self):
+        return f"SeriesSolution(n_terms={self.n_terms}, domain={self.domain})"
+
+    def __array__(self, dtype=None, copy=None):
+        """np.asarray(solução) devolve os coeficientes modais"""
+        coeffs = self.coeffs if dtype is None else self.coeffs.astype(dtype)
+        return coeffs.copy() if copy else coeffs
+
+    @property
+    def n_terms(self):
+        return self.coeffs.size
+
+    @property
+    def nbytes(self):
+        return self.coeffs.nbytes + self.wavenumbers.nbytes + self.decay.nbytes
+
+    def basis(self, x, n_terms=None):
+        """Matriz de base sin(κ_k (x - a)), formato (len(x), N)"""
+        return basis_matrix("sin", self.wavenumbers[:n_terms], x, self.domain[0])
+
+    def amplitudes(self, t, tol=None):
+        """Amplitudes c_k exp(-d_k t) para cada t, formato (len(t), K)
+
+        Com tol, descarta em cada instante a cauda de modos cuja soma
+        Σ_{k>K} |c_k| exp(-d_k t) não excede tol; como |sin| ≤ 1, essa soma
+        é uma cota rigorosa do erro de truncamento. K é o maior número de
+        modos ativos entre os instantes pedidos (a avaliação usa o corte de
+        cada instante, ver _truncated).
+        """
+        amplitudes, widths = self._truncated(t, tol)
+        return amplitudes[:, :int(widths.max(initial=0))]
+
+    def _truncated(self, t, tol, factor=1.0):
+        """Amplitudes (len(t), N) zeradas além do corte de cada instante e os cortes
+
+        A cauda é ponderada pelo fator modal da derivada avaliada (κ_k,
+        d_k ou κ_k²): Σ_{k>K} |factor_k c_k| exp(-d_k t) ≤ tol limita o erro
+        da derivada, e não só o de u.
+        """
+        t = np.asarray(t, dtype=float).ravel()
+        amplitudes = self.coeffs * np.exp(-np.outer(t, self.decay))
+        if tol is None:
+            return amplitudes, np.full(t.size, self.n_terms)
+        # Cauda acumulada de trás para frente: não crescente em k
+        tail = np.cumsum(np.abs(amplitudes * factor)[:, ::-1], axis=1)[:, ::-1]
+        active = tail > tol
+        return np.where(active, amplitudes, 0.0), np.count_nonzero(active, axis=1)
+
+    def _derivative(self, derivative, n_terms):
+        """Base e fator modal da derivada: ∂x sin = κ cos, ∂t → -d_k, ∇² → -κ²"""
+        if derivative is None:
+            return "sin", 1.0
+        if derivative == "x":
+            return "cos", self.wavenumbers[:n_terms]
+        if derivative == "t":
+            return "sin", -self.decay[:n_terms]
+        if derivative == "laplacian":
+            return "sin", -self.wavenumbers[:n_terms]**2
+        raise ValueError(f"Derivada desconhecida: {derivative} (opções: x, t, laplacian)")
+
+    def _evaluate(self, x, t, tol, derivative=None):
+        x, t = np.broadcast_arrays(np.asarray(x, dtype=float),
+                                   np.asarray(t, dtype=float))
+        shape = x.shape
+        kind, factor = self._derivative(derivative, None)
+        if t.size == 0 or np.all(t == t.flat[0]):
+            # Um único instante: um produto matriz-vetor
+            t0 = t.flat[0] if t.size else 0.0
+            amplitudes, (width,) = self._truncated(t0, tol, factor)
+            basis = basis_matrix(kind, self.wavenumbers[:width], x, self.domain[0])
+            result = basis @ (amplitudes[0] * factor)[:width]
+        else:
+            # Um instante por ponto: pontos agrupados pelo corte do seu instante
+            x, t = x.ravel(), t.ravel()
+            amplitudes, widths = self._truncated(t, tol, factor)
+            scaled = amplitudes * factor
+            result = np.zeros(x.size)
+            for points, width in _width_groups(widths, self.n_terms):
+                basis = basis_matrix(kind, self.wavenumbers[:width], x[points], self.domain[0])
+                result[points] = np.sum(basis * scaled[points, :width], axis=1)
+        result = result.reshape(shape)
+        return result if shape else float(result)
+
+    def __call__(self, x, t=0.0, tol=None):
+        """Avalia u(x,t) com broadcasting NumPy entre x e t
+
+        tol ativa o truncamento adaptativo por decaimento (ver amplitudes).
+        """
+        return self._evaluate(x, t, tol)
+
+    def dx(self, x, t=0.0, tol=None):
+        """∂u/∂x = Σ c_k κ_k cos(κ_k (x - a)) exp(-d_k t), exata na série"""
+        return self._evaluate(x, t, tol, "x")
+
+    def dt(self, x, t=0.0, tol=None):
+        """∂u/∂t = -Σ d_k c_k sin(κ_k (x - a)) exp(-d_k t)"""
+        return self._evaluate(x, t, tol, "t")
+
+    def laplacian(self, x, t=0.0, tol=None):
+        """∂²u/∂x² = -Σ κ_k² c_k sin(κ_k (x - a)) exp(-d_k t)"""
+        return self._evaluate(x, t, tol, "laplacian")
+
+    def evaluate_grid(self, x, t, tol=None, derivative=None):
+        """Campo U[i, j] = u(x_j, t_i) em um produto matricial por grupo de instantes
+
+        derivative ("x", "t" ou "laplacian") avalia a derivada correspondente.
+        Com tol, os instantes são agrupados pelo número de modos ativos:
+        instantes tardios não pagam pelos modos que só os iniciais usam.
+        """
+        with stage("evaluation"):
+            kind, factor = self._derivative(derivative, None)
+            amplitudes, widths = self._truncated(t, tol, factor)
+            scaled = amplitudes * factor
+            groups = _width_groups(widths, self.n_terms)
+            n_max = groups[-1][1] if groups else 0
+            basis = basis_matrix(kind, self.wavenumbers[:n_max], x, self.domain[0])
+            if len(groups) == 1:
+                width = groups[0][1]
+                return scaled[:, :width] @ basis[:, :width].T
+            result = np.zeros((scaled.shape[0], basis.shape[0]))
+            for times, width in groups:
+                result[times] = scaled[times, :width] @ basis[:, :width].T
+            return result
+
+    def evaluate_uniform(self, n_points, t=0.0, tol=None):
+        """Avalia em np.linspace(a, b, n_points) via DST-I, O((N+M) log(N+M))
+
+        Retorna (x, U) com U de formato (len(t), n_points) para t em array.
+        """
+        a, b = self.domain
+        x = np.linspace(a, b, n_points)
+        with stage("evaluation"):
+            amplitudes = self.amplitudes(t, tol)
+            if np.ndim(t) == 0:
+                amplitudes = amplitudes[0]
+            # A DST pressupõe κ_k = kπ/L; outras bases caem no produto denso
+            harmonic = np.allclose(self.wavenumbers * (b - a) / np.pi,
+                                   np.arange(1, self.n_terms + 1))
+            if harmonic:
+                return x, sine_series_on_grid(amplitudes, n_points)
+            return x, amplitudes @ self.basis(x, amplitudes.shape[-1]).T
+
+    def evaluate_summed(self, x, t=0.0, method="lanczos", order=None):
+        """Campo U[i, j] ≈ u(x_j, t_i) com filtro ou aceleração (ver summation)
+
+        Para dados descontínuos: method é "lanczos", "fejer",
+        "raised_cosine", "exponential" (filtros) ou "wynn" (ε de Wynn sobre
+        as somas parciais); "partial" é a soma truncada usual. Retorna
+        (U, indicador de convergência em cada ponto), ambos de formato
+        (len(t), len(x)); o indicador é heurístico (ver summation).
+        """
+        with stage("evaluation"):
+            x = np.asarray(x, dtype=float)
+            return sum_sine_series(self.amplitudes(t), self.wavenumbers, x - self.domain[0],
+                                   method, order)
+
+
+class SplitSolution:
+    """u = u_p + w: parte particular conhecida mais o resto suave em série
+
+    particular (e particular_dx, para normas H¹, e particular_source =
+    -u_p'', para o laplaciano) são funções de módulo do catálogo que
+    aceitam arrays; remainder é a SeriesSolution do resto.
+    Coeficientes, números de onda e amplitudes são os do resto, que é o
+    que a truncação afeta.
+    """
+
+    __slots__ = ("particular", "remainder", "particular_dx", "particular_source")
+
+    def __init__(self, particular, remainder, particular_dx=None, particular_source=None):
+        self.particular = particular
+        self.remainder = remainder
+        self.particular_dx = particular_dx
+        self.particular_source = particular_source
+
+    def __reduce__(self):
+        return (SplitSolution, (self.particular, self.remainder, self.particular_dx,
+                                self.particular_source))
+
+    def __repr__(self):
+        return (f"SplitSolution(particular={getattr(self.particular, '__name__', self.particular)}, "
+                f"remainder={self.remainder!r})")
+
+    def __array__(self, dtype=None, copy=None):
+        return self.remainder.__array__(dtype, copy)
+
+    @property
+    def coeffs(self):
+        return self.remainder.coeffs
+
+    @property
+    def wavenumbers(self):
+        return self.remainder.wavenumbers
+
+    @property
+    def decay(self):
+        return self.remainder.decay
+
+    @property
+    def domain(self):
+        return self.remainder.domain
+
+    @property
+    def n_terms(self):
+        return self.remainder.n_terms
+
+    @property
+    def nbytes(self):
+        return self.remainder.nbytes
+
+    def amplitudes(self, t, tol=None):
+        return self.remainder.amplitudes(t, tol)
+
+    def _particular(self, x, derivative=None):
+        """u_p (ou sua derivada) em x; u_p não depende de t"""
+        x = np.asarray(x, dtype=float)
+        if derivative is None:
+            return self.particular(x)
+        if derivative == "t":
+            return 0.0
+        if derivative == "x" and self.particular_dx is not None:
+            return self.particular_dx(x)
+        if derivative == "laplacian" and self.particular_source is not None:
+            return -self.particular_source(x)
+        raise ValueError(f"Derivada {derivative} da parte particular não disponível")
+
+    def __call__(self, x, t=0.0, tol=None):
+        """Avalia u_p(x) + w(x,t)"""
+        value = self.remainder(x, t, tol) + self._particular(x)
+        return value if np.ndim(value) else float(value)
+
+    def dx(self, x, t=0.0, tol=None):
+        """u_p'(x) + ∂w/∂x (exige particular_dx)"""
+        value = self.remainder.dx(x, t, tol) + self._particular(x, "x")
+        return value if np.ndim(value) else float(value)
+
+    def dt(self, x, t=0.0, tol=None):
+        """∂w/∂t: a parte particular é estacionária"""
+        return self.remainder.dt(x, t, tol)
+
+    def laplacian(self, x, t=0.0, tol=None):
+        """u_p'' + ∂²w/∂x², com u_p'' = -particular_source (exige particular_source)"""
+        value = self.remainder.laplacian(x, t, tol) + self._particular(x, "laplacian")
+        return value if np.ndim(value) else float(value)
+
+    def evaluate_grid(self, x, t, tol=None, derivative=None):
+        """Campo U[i, j] = u_p(x_j) + w(x_j, t_i) (ou a derivada pedida)"""
+        return (self.remainder.evaluate_grid(x, t, tol, derivative)
+                + self._particular(x, derivative))
+
+    def evaluate_summed(self, x, t=0.0, method="lanczos", order=None):
+        """Como SeriesSolution.evaluate_summed, somando a parte particular"""
+        values, indicator = self.remainder.evaluate_summed(x, t, method, order)
+        return values + self.particular(np.asarray(x, dtype=float)), indicator
+
+    def evaluate_uniform(self, n_points, t=0.0, tol=None):
+        """Como SeriesSolution.evaluate_uniform, somando a parte particular"""
+        x, values = self.remainder.evaluate_uniform(n_points, t, tol)
+        return x, values + self.particular(x)
+
+
+class SeriesSolution2D:
+    """Solução φ(x,y) = Σ C_mn X_m(x) Y_n(y) em produto tensorial"""
+
+    __slots__ = ("coeffs", "wavenumbers_x", "wavenumbers_y", "kinds", "domain")
+
+    def __init__(self, coeffs, wavenumbers_x, wavenumbers_y,
+                 kinds=("sin", "sin"), domain=((0, 1), (0, 1))):
+        self.coeffs = _contiguous(coeffs)
+        self.wavenumbers_x = _contiguous(wavenumbers_x)
+        self.wavenumbers_y = _contiguous(wavenumbers_y)
+        self.kinds = (str(kinds[0]), str(kinds[1]))
+        self.domain = ((float(domain[0][0]), float(domain[0][1])),
+                       (float(domain[1][0]), float(domain[1][1])))
+
+    def __reduce__(self):
+        return (SeriesSolution2D, (self.coeffs, self.wavenumbers_x, self.wavenumbers_y,
+                                   self.kinds, self.domain))
+
+    def __repr__(self):
+        return f"SeriesSolution2D(n_terms={self.n_terms}, kinds={self.kinds}, domain={self.domain})"
+
+    def __array__(self, dtype=None, copy=None):
+        """np.asarray(solução) devolve a matriz de coeficientes"""
+        coeffs = self.coeffs if dtype is None else self.coeffs.astype(dtype)
+        return coeffs.copy() if copy else coeffs
+
+    @property
+    def n_terms(self):
+        return self.coeffs.shape
+
+    @property
+    def nbytes(self):
+        return self.coeffs.nbytes + self.wavenumbers_x.nbytes + self.wavenumbers_y.nbytes
+
+    def basis_x(self, x):
+        return basis_matrix(self.kinds[0], self.wavenumbers_x, x, self.domain[0][0])
+
+    def basis_y(self, y):
+        return basis_matrix(self.kinds[1], self.wavenumbers_y, y, self.domain[1][0])
+
+    def _bases(self, x, y, derivative=None):
+        """(X, C, Y) da derivada pedida: sin' = κ cos, cos' = -κ sin, ∇² → -(κx² + κy²)"""
+        def axis_basis(kind, wavenumbers, s, origin, differentiate):
+            if not differentiate:
+                return basis_matrix(kind, wavenumbers, s, origin)
+            if kind == "sin":
+                return basis_matrix("cos", wavenumbers, s, origin) * wavenumbers
+            return -basis_matrix("sin", wavenumbers, s, origin) * wavenumbers
+
+        if derivative not in (None, "x", "y", "laplacian"):
+            raise ValueError(f"Derivada desconhecida: {derivative} (opções: x, y, laplacian)")
+        X = axis_basis(self.kinds[0], self.wavenumbers_x, x, self.domain[0][0], derivative == "x")
+        Y = axis_basis(self.kinds[1], self.wavenumbers_y, y, self.domain[1][0], derivative == "y")
+        coeffs = self.coeffs
+        if derivative == "laplacian":
+            coeffs = -coeffs * (self.wavenumbers_x[:, None]**2 + self.wavenumbers_y[None, :]**2)
+        return X, coeffs, Y
+
+    def _evaluate(self, x, y, derivative=None):
+        x, y = np.broadcast_arrays(np.asarray(x, dtype=float),
+                                   np.asarray(y, dtype=float))
+        shape = x.shape
+        X, coeffs, Y = self._bases(x, y, derivative)
+        result = np.sum((X @ coeffs) * Y, axis=1)
+        result = result.reshape(shape)
+        return result if shape else float(result)
+
+    def __call__(self, x, y):
+        """Avalia φ(x,y) com broadcasting NumPy entre x e y"""
+        return self._evaluate(x, y)
+
+    def dx(self, x, y):
+        """∂φ/∂x, exata na série"""
+        return self._evaluate(x, y, "x")
+
+    def dy(self, x, y):
+        """∂φ/∂y, exata na série"""
+        return self._evaluate(x, y, "y")
+
+    def laplacian(self, x, y):
+        """∇²φ = -Σ (κx_m² + κy_n²) C_mn X_m(x) Y_n(y)"""
+        return self._evaluate(x, y, "laplacian")
+
+    def evaluate_grid(self, x, y, derivative=None):
+        """Campo Φ[i, j] = φ(x_j, y_i) com dois produtos matriciais
+
+        derivative ("x", "y" ou "laplacian") avalia a derivada correspondente.
+        """
+        with stage("evaluation"):
+            X, coeffs, Y = self._bases(x, y, derivative)
+            return Y @ (coeffs.T @ X.T)
+
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Somação de séries de senos com dados descontínuos
+
+Com u(x,0) descontínuo (onda: u = 1 contra u(0,t) = 0) os coeficientes
+decaem como 1/k e a soma parcial converge em O(1/N), com o fenômeno de
+Gibbs junto aos saltos. Dois remédios, escolhidos por `method`:
+
+- filtros espectrais: multiplicam c_k por σ_k = σ(k/(N+1)) antes de somar.
+  Lanczos (sinc^p), Fejér e cosseno elevado suprimem o Gibbs; o filtro
+  exponencial exp(-α (k/N)^p) dá convergência de ordem p longe dos saltos;
+- aceleração (Wynn ε): transforma a sequência das somas parciais,
+  contendo Aitken Δ² como primeira coluna. Para números de onda em
+  progressão aritmética (κ_k = κ_0 + kΔ) a série de senos é a parte
+  imaginária de e^{iκ_0 s} Σ c_k z^k, z = e^{iΔs}, e o ε sobre as somas
+  complexas equivale a aproximantes de Padé da série de potências, que
+  convergem geometricamente longe dos saltos.
+
+Cada método devolve também um indicador pontual de convergência: para
+filtros, a diferença para a soma filtrada com metade dos modos; para
+Wynn, a diferença entre as duas últimas colunas pares do ε. É uma
+heurística, não uma cota nem uma estimativa do erro: nos dados da onda
+(u = 1 em t = 0) ela subestima o erro real em até ~4x (Wynn, Lanczos),
+~20x (cosseno elevado) e ~200x (exponencial) em pontos isolados, onde a
+diferença passa por zero. Serve para comparar métodos e localizar
+regiões não convergidas, não para certificar a precisão.
+"""
+
+import numpy as np
+
+FILTERS = ("lanczos", "fejer", "raised_cosine", "exponential")
+METHODS = ("partial",) + FILTERS + ("wynn",)
+
+# Somas parciais usadas pelo ε de Wynn (as mais recentes)
+WYNN_TERMS = 17
+
+# Filtro exponencial: σ(1) = e^{-α} ≈ precisão de máquina
+_EXPONENTIAL_ALPHA = -np.log(np.finfo(float).eps)
+
+
+def filter_factors(n_terms, kind="lanczos", order=None):
+    """Fatores σ_k, k = 1..n_terms, do filtro `kind`
+
+    order é a potência do sinc de Lanczos (padrão 1) ou a ordem do filtro
+    exponencial (padrão 8); Fejér e cosseno elevado não têm ordem.
+    """
+    eta = np.arange(1, n_terms + 1) / (n_terms + 1)
+    if kind == "lanczos":
+        return np.sinc(eta)**(order or 1)
+    if kind == "fejer":
+        return 1 - eta
+    if kind == "raised_cosine":
+        return 0.5 * (1 + np.cos(np.pi * eta))
+    if kind == "exponential":
+        return np.exp(-_EXPONENTIAL_ALPHA * (np.arange(1, n_terms + 1) / n_terms)**(order or 8))
+    raise ValueError(f"Filtro desconhecido: {kind} (opções: {', '.join(FILTERS)})")
+
+
+def wynn_epsilon(partial_sums):
+    """Limite pelo ε de Wynn ao longo do último eixo e indicador de convergência
+
+    ε_{-1} = 0, ε_0 = S_n, ε_{k+1}^{(n)} = ε_{k-1}^{(n+1)} + 1/(ε_k^{(n+1)} - ε_k^{(n)}).
+    As colunas pares aproximam o limite; o resultado é, em cada ponto, a
+    última coluna par finita (somas já convergidas anulam as diferenças e
+    tornam as colunas seguintes infinitas), e o indicador é a distância
+    para a coluna par finita anterior (heurístico, ver o módulo).
+    """
+    partial_sums = np.asarray(partial_sums)
+    limit = partial_sums[..., -1].copy()
+    indicator = np.abs(partial_sums[..., -1] - partial_sums[..., -2]) \
+        if partial_sums.shape[-1] > 1 else np.full(limit.shape, np.inf)
+    previous = np.zeros_like(partial_sums)
+    current = partial_sums
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        for column in range(1, partial_sums.shape[-1]):
+            following = previous[..., 1:current.shape[-1]] + 1 / np.diff(current, axis=-1)
+            previous, current = current, following
+            if column % 2 == 0:
+                candidate = current[..., -1]
+                finite = np.isfinite(candidate)
+                indicator = np.where(finite, np.abs(candidate - limit), indicator)
+                limit = np.where(finite, candidate, limit)
+    return limit, indicator
+
+
+def arithmetic_progression(wavenumbers):
+    """(κ_0, Δ) com κ_k = κ_0 + kΔ, ou None se os números de onda não forem"""
+    if wavenumbers.size < 2:
+        return None
+    step = wavenumbers[1] - wavenumbers[0]
+    if step <= 0 or not np.allclose(np.diff(wavenumbers), step):
+        return None
+    return wavenumbers[0] - step, step
+
+
+def sum_sine_series(amplitudes, wavenumbers, s, method="lanczos", order=None):
+    """Σ_k a_k sin(κ_k s) somada por `method`; retorna (valores, indicador)
+
+    amplitudes tem formato (T, K) e s é 1D; o resultado tem formato (T, len(s)).
+    Para "wynn", order é o número de somas parciais transformadas (padrão
+    WYNN_TERMS, no mínimo 3: com menos não há coluna par além de S_n).
+    """
+    if method not in METHODS:
+        raise ValueError(f"Somação desconhecida: {method} (opções: {', '.join(METHODS)})")
+    if method == "wynn" and order is not None and order < 3:
+        raise ValueError(f"O ε de Wynn exige order >= 3 somas parciais, não {order}")
+    amplitudes = np.atleast_2d(amplitudes)
+    s = np.ravel(np.asarray(s, dtype=float))
+    n_terms = amplitudes.shape[1]
+
+    if method != "wynn":
+        def filtered(n):
+            weights = 1.0 if method == "partial" else filter_factors(n, method, order)
+            return (amplitudes[:, :n] * weights) @ np.sin(np.outer(s, wavenumbers[:n])).T
+        values = filtered(n_terms)
+        return values, np.abs(values - filtered(max(n_terms // 2, 1)))
+
+    # Modos nulos em todos os instantes (pares da onda) só repetiriam somas
+    active = np.flatnonzero(np.any(amplitudes != 0, axis=0))
+    if active.size < 3:
+        return sum_sine_series(amplitudes, wavenumbers, s, "partial")
+    n_sums = min(order or WYNN_TERMS, active.size)
+    head, tail = active[:-n_sums + 1], active[-n_sums + 1:]
+    progression = arithmetic_progression(wavenumbers)
+    if progression is None:
+        terms = np.sin(np.outer(s, wavenumbers))
+        phase = None
+    else:
+        kappa_0, step = progression
+        k = np.arange(1, wavenumbers.size + 1)
+        terms = np.exp(1j * np.outer(s, step * k))
+        phase = np.exp(1j * kappa_0 * s)
+    # S[t, x, n]: as n_sums somas parciais mais recentes
+    start = amplitudes[:, head] @ terms[:, head].T
+    sums = start[..., None] + np.cumsum(amplitudes[:, None, tail] * terms[None, :, tail], axis=-1)
+    sums = np.concatenate([start[..., None], sums], axis=-1)
+    limit, indicator = wynn_epsilon(sums)
+    if phase is None:
+        return limit, indicator
+    return (phase * limit).imag, indicator
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Galerkin em produto tensorial para problemas 2D em retângulos
+
+Cada direção usa a base de autofunções 1D compatível com as condições de
+contorno declaradas no catálogo (Dirichlet ou Neumann em cada lado):
+
+    Dirichlet–Dirichlet: sin(mπs/L)        Dirichlet–Neumann: sin((m-½)πs/L)
+    Neumann–Dirichlet:   cos((m-½)πs/L)    Neumann–Neumann:   cos((m-1)πs/L)
+
+Os operadores 1D de rigidez e massa são combinados em um
+KroneckerSumOperator, resolvido por diagonalização rápida.
+"""
+
+import numpy as np
+
+try:
+    from .operators import DiagonalOperator
+    from .series import basis_matrix
+except ImportError:
+    from operators import DiagonalOperator
+    from series import basis_matrix
+
+# Lado do retângulo -> (eixo, extremo)
+SIDES = {"x0": (0, 0), "x1": (0, 1), "y0": (1, 0), "y1": (1, 1)}
+
+
+class Basis1D:
+    """Base 1D de autofunções sin/cos(κ_m (s - a)) em [a, b]"""
+
+    def __init__(self, left, right, n_terms, domain):
+        a, b = domain
+        length = b - a
+        m = np.arange(1, n_terms + 1)
+        if left == "dirichlet" and right == "dirichlet":
+            self.kind, self.wavenumbers = "sin", m * np.pi / length
+        elif left == "dirichlet" and right == "neumann":
+            self.kind, self.wavenumbers = "sin", (m - 0.5) * np.pi / length
+        elif left == "neumann" and right == "dirichlet":
+            self.kind, self.wavenumbers = "cos", (m - 0.5) * np.pi / length
+        elif left == "neumann" and right == "neumann":
+            self.kind, self.wavenumbers = "cos", (m - 1) * np.pi / length
+        else:
+            raise ValueError(f"Condições de contorno não suportadas: {left}/{right}")
+        self.origin = a
+        # ∫ φ_m² ds = L/2, exceto o modo constante (L)
+        self.norms = np.where(self.wavenumbers == 0, length, length / 2)
+
+    def evaluate(self, s):
+        return basis_matrix(self.kind, self.wavenumbers, s, self.origin)
+
+    def stiffness(self):
+        """∫ φ'_i φ'_j ds (diagonal para autofunções)"""
+        return DiagonalOperator(self.wavenumbers**2 * self.norms)
+
+    def mass(self):
+        """∫ φ_i φ_j ds (diagonal para autofunções)"""
+        return DiagonalOperator(self.norms)
+
+
+def side_conditions(boundary_conditions, homogeneous_dirichlet=True):
+    """Condições por lado {"x0": (tipo, valor), ...}
+
+    Lados não declarados recebem Neumann homogêneo (condição natural). As
+    bases de autofunções só aceitam Dirichlet homogêneo; os elementos
+    finitos passam homogeneous_dirichlet=False.
+    """
+    sides = {side: ("neumann", 0) for side in SIDES}
+    for cond_type, side, value in boundary_conditions:
+        if side in SIDES and cond_type in ("dirichlet", "neumann"):
+            sides[side] = (cond_type, value)
+    if homogeneous_dirichlet:
+        for side, (cond_type, value) in sides.items():
+            if cond_type == "dirichlet" and (callable(value) or value != 0):
+                raise ValueError(f"Dirichlet não homogêneo não suportado no lado {side}")
+    return sides
+
+
+def gauss_nodes(n_quad, domain):
+    """Nós e pesos de Gauss–Legendre mapeados em [a, b]"""
+    a, b = domain
+    nodes, weights = np.polynomial.legendre.leggauss(n_quad)
+    return a + 0.5 * (b - a) * (nodes + 1), 0.5 * (b - a) * weights
+
+
+def tensor_load(source, basis_x, basis_y, domain, n_quad=None):
+    """F_mn = ∫∫ f(x,y) X_m(x) Y_n(y) dx dy por quadratura tensorial"""
+    nx, ny = basis_x.wavenumbers.size, basis_y.wavenumbers.size
+    if n_quad is None:
+        n_quad = max(nx, ny) + 32
+    xq, wx = gauss_nodes(n_quad, domain[0])
+    yq, wy = gauss_nodes(n_quad, domain[1])
+    values = np.broadcast_to(source(xq[:, None], yq[None, :]), (n_quad, n_quad))
+    return (basis_x.evaluate(xq) * wx[:, None]).T @ values @ (basis_y.evaluate(yq) * wy[:, None])
+
+
+def neumann_load(sides, basis_x, basis_y, domain, n_quad=None):
+    """G_mn = ∫_ΓN g X_m Y_n ds para os lados de Neumann não homogêneos"""
+    G = np.zeros((basis_x.wavenumbers.size, basis_y.wavenumbers.size))
+    if n_quad is None:
+        n_quad = max(G.shape) + 32
+    for side, (cond_type, value) in sides.items():
+        if cond_type != "neumann" or (not callable(value) and value == 0):
+            continue
+        axis, end = SIDES[side]
+        g = value if callable(value) else (lambda s, value=value: np.full_like(s, value))
+        if axis == 0:
+            # Lado x = const: integra ao longo de y
+            yq, wy = gauss_nodes(n_quad, domain[1])
+            x_side = domain[0][end]
+            G += np.outer(basis_x.evaluate([x_side])[0],
+                          (basis_y.evaluate(yq) * (wy * g(yq))[:, None]).sum(axis=0))
+        else:
+            xq, wx = gauss_nodes(n_quad, domain[0])
+            y_side = domain[1][end]
+            G += np.outer((basis_x.evaluate(xq) * (wx * g(xq))[:, None]).sum(axis=0),
+                          basis_y.evaluate([y_side])[0])
+    return G
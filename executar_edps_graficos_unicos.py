@@ -5,8 +5,8 @@ Sistema limpo que resolve cada equação separadamente com visualizações espec
 """
 
 import os
-import subprocess
-import sys
+
+from pipeline_edps import executar_lote
 
 def main():
     """Executa todas as 4 EDPs com gráficos distintos e melhorados"""
@@ -22,50 +22,37 @@ def main():
     print("   ⚡ Helmholtz: Autovalores e campos 2D")
     print()
     
-    # Criar diretório limpo
-    os.makedirs('output', exist_ok=True)
-    
-    # Scripts na ordem das equações da imagem
-    scripts = [
-        ("resolver_poisson.py", "🔧 EQUAÇÃO DE POISSON 1D"),
-        ("resolver_onda.py", "🌊 EQUAÇÃO DA ONDA 1D"),
-        ("resolver_calor.py", "🔥 EQUAÇÃO DO CALOR 1D"),
-        ("resolver_helmholtz.py", "⚡ EQUAÇÃO DE HELMHOLTZ 2D")
-    ]
+    # Todas as EDPs no mesmo interpretador, em um pool de processos
+    execucoes, tempo_total = executar_lote(["poisson", "onda", "calor", "helmholtz"])
     
     resultados = []
     
-    for i, (script, titulo) in enumerate(scripts, 1):
+    for i, execucao in enumerate(execucoes, 1):
+        titulo = execucao["titulo"]
         print(f"\n{'='*60}")
         print(f"[{i}/4] {titulo}")
         print(f"{'='*60}")
         
-        try:
-            result = subprocess.run([sys.executable, script], 
-                                  capture_output=True, text=True, timeout=120)
-            
-            if result.returncode == 0:
-                print(f"✅ {titulo} - RESOLVIDA COM SUCESSO!")
-                if result.stdout:
-                    # Mostrar apenas as últimas linhas relevantes
-                    lines = result.stdout.strip().split('\n')
-                    for line in lines[-3:]:
-                        if line.strip():
-                            print(f"   {line}")
-                resultados.append((titulo, True))
-            else:
-                print(f"❌ ERRO em {titulo}:")
-                if result.stderr:
-                    print(f"   {result.stderr[-200:]}")  # Últimos 200 chars do erro
-                resultados.append((titulo, False))
-                
-        except subprocess.TimeoutExpired:
-            print(f"⏰ TIMEOUT em {titulo} (>120s)")
-            resultados.append((titulo, False))
-        except Exception as e:
-            print(f"❌ ERRO INESPERADO em {titulo}: {e}")
+        if execucao["sucesso"]:
+            print(f"✅ {titulo} - RESOLVIDA COM SUCESSO!")
+            if execucao["saida"]:
+                # Mostrar apenas as últimas linhas relevantes
+                lines = execucao["saida"].strip().split('\n')
+                for line in lines[-3:]:
+                    if line.strip():
+                        print(f"   {line}")
+            tempos = execucao["tempos"]
+            print(f"   ⏱️ solução {tempos.get('solucao', 0):.2f}s | "
+                  f"gráficos {tempos.get('grafico_solucao', 0):.2f}s + "
+                  f"{tempos.get('grafico_convergencia', 0):.2f}s")
+            resultados.append((titulo, True))
+        else:
+            print(f"❌ ERRO em {titulo}:")
+            print(f"   {execucao['erros'][-1][-200:]}")  # Últimos 200 chars do erro
             resultados.append((titulo, False))
     
+    print(f"\n⏱️ Tempo total (paralelo): {tempo_total:.2f}s")
+    
     # Resumo final
     print(f"\n{'🎊'*20}")
     print("🎊 RESULTADO FINAL 🎊")
@@ -4,10 +4,7 @@ SISTEMA EDP LIMPO - Execução Principal
 Resolve 4 EDPs com gráficos únicos conforme especificações atualizadas
 """
 
-import os
-import subprocess
-import sys
-import time
+from pipeline_edps import executar_lote
 
 def main():
     """Execução principal do sistema limpo"""
@@ -23,43 +20,28 @@ def main():
     print("   ⚡ Helmholtz 2D: domínio [0,1]×[0,1]")
     print()
     
-    # Garantir pasta output
-    os.makedirs('output', exist_ok=True)
-    
-    # Scripts funcionais
-    scripts = [
-        "resolver_poisson.py",
-        "resolver_calor.py", 
-        "resolver_onda.py",
-        "resolver_helmholtz.py"
-    ]
-    
     print("🚀 EXECUTANDO TODAS AS EDPs...")
     print("-" * 50)
     
-    sucessos = 0
-    for i, script in enumerate(scripts, 1):
-        print(f"[{i}/4] Executando {script}...")
-        
-        try:
-            result = subprocess.run([sys.executable, script], 
-                                  capture_output=True, text=True, timeout=90)
-            
-            if result.returncode == 0:
-                print(f"✅ {script} - SUCESSO!")
-                sucessos += 1
-            else:
-                print(f"❌ {script} - ERRO!")
-                print(f"STDERR: {result.stderr[:200]}")
-                
-        except Exception as e:
-            print(f"💥 {script} - EXCEÇÃO: {e}")
+    # Um único interpretador: soluções e gráficos distribuídos no pool
+    resultados, tempo_total = executar_lote(["poisson", "calor", "onda", "helmholtz"])
     
+    sucessos = 0
+    for i, resultado in enumerate(resultados, 1):
+        nome = resultado["edp"]
+        if resultado["sucesso"]:
+            print(f"[{i}/4] ✅ {nome} - SUCESSO! ({resultado['tempos']['total']:.2f}s)")
+            sucessos += 1
+        else:
+            print(f"[{i}/4] ❌ {nome} - ERRO!")
+            print(f"STDERR: {resultado['erros'][-1][-200:]}")
+    
+    print(f"⏱️ Tempo total (paralelo): {tempo_total:.2f}s")
     print()
     print("📊 RESULTADO FINAL:")
-    print(f"   Scripts executados: {sucessos}/{len(scripts)}")
+    print(f"   EDPs executadas: {sucessos}/{len(resultados)}")
     
-    if sucessos == len(scripts):
+    if sucessos == len(resultados):
         print("🎉 TODAS AS EDPs EXECUTADAS COM SUCESSO!")
         print("📁 Verifique os gráficos em: output/")
         print("🎨 Cada EDP possui visualizações únicas e distintas")
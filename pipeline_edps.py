@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Pipeline unificado das 4 EDPs em um único interpretador
+Carrega os módulos resolver_*.py uma vez e distribui as tarefas de solução
+e de gráficos em um pool de processos do tamanho do número de núcleos
+
+Cada tarefa de solução já devolve os campos dos gráficos (arrays NumPy);
+as oito figuras são então renderizadas em paralelo (ver renderizacao.py).
+
+Com perfilar (ou a variável EDP_PROFILE), cada tarefa roda sob um
+Profiler (core/profiling.py) e os registros das etapas de todos os
+processos são reunidos no resultado e, se for um caminho .json, gravados
+como trace do Chrome mais um resumo em JSON. EDP_PROFILE aceita 1/0,
+true/false, yes/no, on/off (ou vazia) e caminhos terminados em .json:
+
+    EDP_PROFILE=1 python pipeline_edps.py
+    EDP_PROFILE=output/trace.json python pipeline_edps.py
+"""
+
+import contextlib
+import importlib
+import io
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "core"))
+
+from profiling import Profiler, stage
+from renderizacao import obter_perfil, renderizar, usar_backend_headless
+
+# EDP -> (módulo, título); o módulo define resolver_<edp>, calcular_campos_<edp>,
+# desenhar_solucoes_<edp> e desenhar_convergencia_<edp>
+EDPS = {
+    "poisson": ("resolver_poisson", "🔧 EQUAÇÃO DE POISSON 1D"),
+    "onda": ("resolver_onda", "🌊 EQUAÇÃO DA ONDA 1D"),
+    "calor": ("resolver_calor", "🔥 EQUAÇÃO DO CALOR 1D"),
+    "helmholtz": ("resolver_helmholtz", "⚡ EQUAÇÃO DE HELMHOLTZ 2D"),
+}
+
+
+def _carregar_modulos():
+    """Importa todos os resolvers (e numpy/scipy/matplotlib) uma única vez"""
+    usar_backend_headless()
+    return {nome: importlib.import_module(EDPS[nome][0]) for nome in EDPS}
+
+
+def _resolver(nome):
+    """Resolve a EDP e calcula os campos dos gráficos no mesmo processo"""
+    modulo = importlib.import_module(EDPS[nome][0])
+    solutions, n_terms_list, errors = getattr(modulo, f"resolver_{nome}")()
+    with stage("campos"):
+        campos = getattr(modulo, f"calcular_campos_{nome}")(solutions, n_terms_list)
+    return campos, n_terms_list, errors
+
+
+def _executar(nome, etapa, funcao, *args, perfilar=False, memoria=False):
+    """Executa uma etapa capturando a saída, o tempo e eventuais erros"""
+    saida = io.StringIO()
+    resultado = {"edp": nome, "etapa": etapa, "sucesso": False}
+    perfilador = Profiler(memory=memoria) if perfilar else contextlib.nullcontext()
+    inicio = time.perf_counter()
+    try:
+        with perfilador, stage(etapa), contextlib.redirect_stdout(saida):
+            resultado["retorno"] = funcao(*args)
+        resultado["sucesso"] = True
+    except Exception as e:
+        resultado["erro"] = f"{type(e).__name__}: {e}"
+        resultado["traceback"] = traceback.format_exc()
+    resultado["tempo"] = time.perf_counter() - inicio
+    resultado["saida"] = saida.getvalue()
+    if perfilar:
+        resultado["perfil"] = perfilador.records
+    return resultado
+
+
+_VERDADEIROS = ("1", "true", "yes", "on", "sim")
+_FALSOS = ("", "0", "false", "no", "off", "nao", "não")
+
+
+def _interpretar_perfilar(valor):
+    """Booleano ou caminho .json a partir de perfilar/EDP_PROFILE"""
+    if not isinstance(valor, str):
+        return bool(valor)
+    texto = valor.strip()
+    if texto.lower() in _VERDADEIROS:
+        return True
+    if texto.lower() in _FALSOS:
+        return False
+    if texto.lower().endswith(".json"):
+        return texto
+    raise ValueError(f"EDP_PROFILE/perfilar inválido: {valor!r} (use 1/0, true/false "
+                     f"ou um caminho terminado em .json)")
+
+
+def executar_lote(nomes=None, max_workers=None, perfil=None, forcar=False, perfilar=None,
+                  perfilar_memoria=False):
+    """Resolve e plota as EDPs em paralelo; retorna um resultado por EDP
+
+    Cada resultado traz sucesso, erros, tempos por etapa (solucao,
+    grafico_solucao, grafico_convergencia) e a saída capturada. perfil
+    escolhe a qualidade das figuras ("rascunho" ou "final"); figuras cujos
+    campos e código não mudaram são reutilizadas, a menos que forcar=True.
+
+    perfilar=True acrescenta a cada resultado os registros de etapas
+    (montagem, solução linear, avaliação, renderização) em "perfil"; um
+    caminho terminado em .json também grava o trace do Chrome nele e
+    <caminho>_resumo.json. Sem o argumento vale EDP_PROFILE, interpretada
+    como booleano (1/0, true/false, yes/no, on/off) ou caminho .json;
+    outros valores levantam ValueError. perfilar_memoria mede também o pico de
+    memória de cada etapa (tracemalloc, que deixa a renderização ~4x mais
+    lenta).
+    """
+    nomes = list(EDPS) if nomes is None else list(nomes)
+    perfil = obter_perfil(perfil)
+    if perfilar is None:
+        perfilar = os.environ.get("EDP_PROFILE", "")
+    perfilar = _interpretar_perfilar(perfilar)
+    opcoes_perfil = {"perfilar": bool(perfilar), "memoria": perfilar_memoria}
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    os.makedirs('output', exist_ok=True)
+
+    # Com fork, os processos herdam os módulos já importados aqui
+    _carregar_modulos()
+    resultados = {nome: {"edp": nome, "titulo": EDPS[nome][1], "sucesso": True,
+                         "tempos": {}, "saida": "", "erros": [],
+                         "reutilizadas": [], "perfil": []} for nome in nomes}
+
+    inicio = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers,
+                             initializer=_carregar_modulos) as pool:
+        pendentes = {pool.submit(_executar, nome, "solucao", _resolver, nome,
+                                 **opcoes_perfil) for nome in nomes}
+        while pendentes:
+            concluidos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+            for futuro in concluidos:
+                etapa = futuro.result()
+                nome = etapa["edp"]
+                resultado = resultados[nome]
+                resultado["tempos"][etapa["etapa"]] = etapa["tempo"]
+                resultado["saida"] += etapa["saida"]
+                resultado["perfil"].extend(etapa.get("perfil", []))
+                if not etapa["sucesso"]:
+                    resultado["sucesso"] = False
+                    resultado["erros"].append(etapa["traceback"])
+                    continue
+                if etapa["etapa"] != "solucao" and etapa["retorno"]["reutilizado"]:
+                    resultado["reutilizadas"].append(etapa["retorno"]["caminho"])
+                if etapa["etapa"] == "solucao":
+                    # Os dois gráficos da EDP são desenhados em paralelo, em
+                    # outros processos, apenas a partir dos arrays calculados
+                    campos, n_terms_list, errors = etapa["retorno"]
+                    resultado["n_terms"] = list(n_terms_list)
+                    resultado["erros_normalizados"] = [float(e) for e in errors]
+                    convergencia = {"n_terms_list": resultado["n_terms"],
+                                    "errors": resultado["erros_normalizados"]}
+                    modulo = EDPS[nome][0]
+                    pendentes.add(pool.submit(_executar, nome, "grafico_solucao", renderizar,
+                                              modulo, f"desenhar_solucoes_{nome}", campos, perfil,
+                                              forcar, **opcoes_perfil))
+                    pendentes.add(pool.submit(_executar, nome, "grafico_convergencia", renderizar,
+                                              modulo, f"desenhar_convergencia_{nome}",
+                                              convergencia, perfil, forcar,
+                                              **opcoes_perfil))
+
+    for resultado in resultados.values():
+        resultado["tempos"]["total"] = sum(resultado["tempos"].values())
+    total = time.perf_counter() - inicio
+
+    if isinstance(perfilar, str):
+        perfilador = Profiler()
+        for resultado in resultados.values():
+            perfilador.merge(resultado["perfil"])
+        perfilador.to_chrome_trace(perfilar)
+        perfilador.to_json(f"{os.path.splitext(perfilar)[0]}_resumo.json")
+    return [resultados[nome] for nome in nomes], total
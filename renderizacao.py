@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Renderização headless das figuras das EDPs
+
+Os resolvers separam o cálculo dos campos (calcular_campos_*, arrays NumPy)
+do desenho (desenhar_*), que só recebe esses arrays: as figuras podem ser
+geradas em processos de trabalho sem reavaliar as soluções. Aqui ficam o
+backend não interativo, os perfis de qualidade e o cache de renderização;
+o pool de processos é o de pipeline_edps.executar_lote, que intercala as
+resoluções e as renderizações.
+
+Perfis (variável de ambiente EDP_PERFIL ou argumento perfil):
+    rascunho: dpi 96, marcadores a cada 4 pontos, camadas rasterizadas
+    final:    dpi de cada figura (300–350), todos os marcadores, camadas
+              de contorno/superfície rasterizadas (arquivos vetoriais leves)
+
+Cache de renderização: cada desenho grava seus campos em um .npz auxiliar
+(output/campos/<função>.npz) junto com o hash dos dados, do perfil, do
+código-fonte da função de desenho e dos auxiliares comuns (salvar_figura,
+aplicar_perfil, ...) e de VERSAO_RENDERIZACAO; a figura só é gerada de
+novo quando esse hash muda ou o PNG não existe mais.
+"""
+
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+
+# Mesmo módulo de perfilamento que o solver usa (core/ no sys.path)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "core"))
+from profiling import stage
+
+PERFIS = {
+    "rascunho": {"dpi": 96, "passo_marcadores": 4, "rasterizar": True},
+    "final": {"dpi": None, "passo_marcadores": 1, "rasterizar": True},
+}
+
+# Incrementar quando uma mudança fora das funções de desenho e dos
+# auxiliares abaixo (p. ex. estilo global) alterar as figuras
+VERSAO_RENDERIZACAO = 1
+
+DIRETORIO_CAMPOS = os.environ.get("EDP_CAMPOS_DIR", os.path.join("output", "campos"))
+
+
+def usar_backend_headless():
+    """Força o backend Agg (nenhuma janela é aberta)"""
+    import matplotlib
+    matplotlib.use("Agg", force=True)
+    warnings.filterwarnings("ignore", message=".*non-interactive.*")
+
+
+def pyplot():
+    """matplotlib.pyplot já com o backend não interativo"""
+    usar_backend_headless()
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def obter_perfil(perfil=None):
+    """Resolve o perfil pelo nome (ou EDP_PERFIL); aceita um dict pronto"""
+    if isinstance(perfil, dict):
+        return perfil
+    nome = perfil or os.environ.get("EDP_PERFIL", "final")
+    if nome not in PERFIS:
+        raise ValueError(f"Perfil desconhecido: {nome} (opções: {', '.join(PERFIS)})")
+    return PERFIS[nome]
+
+
+def aplicar_perfil(fig, perfil):
+    """Decima marcadores e rasteriza camadas preenchidas da figura"""
+    passo = perfil["passo_marcadores"]
+    for ax in fig.axes:
+        if passo > 1:
+            for line in ax.get_lines():
+                markevery = line.get_markevery()
+                if line.get_marker() not in (None, "None", "", " ") and \
+                        (markevery is None or isinstance(markevery, int)):
+                    line.set_markevery((markevery or 1) * passo)
+        if perfil["rasterizar"]:
+            # Contornos preenchidos, superfícies, áreas e campos vetoriais
+            for collection in ax.collections:
+                collection.set_rasterized(True)
+
+
+def salvar_figura(fig, caminho, dpi, perfil=None, **kwargs):
+    """Aplica o perfil, salva e fecha a figura; retorna o caminho"""
+    import matplotlib.pyplot as plt
+    perfil = obter_perfil(perfil)
+    aplicar_perfil(fig, perfil)
+    os.makedirs(os.path.dirname(caminho) or ".", exist_ok=True)
+    fig.savefig(caminho, dpi=perfil["dpi"] or dpi, **kwargs)
+    plt.close(fig)
+    return caminho
+
+
+# Código comum a todas as figuras: entra no hash de renderização
+_AUXILIARES = (usar_backend_headless, pyplot, obter_perfil, aplicar_perfil, salvar_figura)
+
+
+def achatar_campos(campos, prefixo=""):
+    """Campos aninhados -> {"chave/subchave": array}, em ordem estável"""
+    planos = {}
+    for chave, valor in campos.items():
+        nome = f"{prefixo}{chave}"
+        if isinstance(valor, dict):
+            planos.update(achatar_campos(valor, f"{nome}/"))
+        else:
+            planos[nome] = np.asarray(valor)
+    return dict(sorted(planos.items()))
+
+
+def hash_renderizacao(funcao, campos, perfil):
+    """SHA-256 dos campos, do perfil e do código da função de desenho
+
+    Inclui o código dos auxiliares compartilhados por todos os desenhos
+    (backend, perfil, salvamento) e VERSAO_RENDERIZACAO.
+    """
+    import matplotlib
+    h = hashlib.sha256()
+    h.update(json.dumps({"perfil": perfil, "matplotlib": matplotlib.__version__,
+                         "versao": VERSAO_RENDERIZACAO}, sort_keys=True).encode("utf-8"))
+    for auxiliar in _AUXILIARES:
+        h.update(inspect.getsource(auxiliar).encode("utf-8"))
+    h.update(inspect.getsource(funcao).encode("utf-8"))
+    for nome, valor in achatar_campos(campos).items():
+        valor = np.ascontiguousarray(valor)
+        h.update(f"{nome}|{valor.dtype.str}|{valor.shape}".encode("utf-8"))
+        h.update(valor.tobytes())
+    return h.hexdigest()
+
+
+def _ler_hash(caminho_campos):
+    """(hash, caminho do PNG) gravados no .npz auxiliar, ou (None, None)"""
+    try:
+        with np.load(caminho_campos, allow_pickle=False) as dados:
+            return str(dados["__hash__"]), str(dados["__caminho__"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def _gravar_campos(caminho_campos, campos, hash_atual, caminho):
+    """Grava campos e hash de forma atômica (processos concorrentes)"""
+    os.makedirs(os.path.dirname(caminho_campos), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(caminho_campos), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, __hash__=np.array(hash_atual), __caminho__=np.array(caminho),
+                     **achatar_campos(campos))
+        os.replace(tmp, caminho_campos)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def renderizar(modulo, funcao, campos, perfil=None, forcar=False):
+    """Executa modulo.funcao(campos, perfil) se os campos ou o código mudaram
+
+    Retorna o caminho da figura, o tempo e se a figura existente foi
+    reutilizada (hash igual ao do .npz auxiliar e PNG presente).
+    """
+    inicio = time.perf_counter()
+    perfil = obter_perfil(perfil)
+    desenhar = getattr(importlib.import_module(modulo), funcao)
+    caminho_campos = os.path.join(DIRETORIO_CAMPOS, f"{funcao}.npz")
+    hash_atual = hash_renderizacao(desenhar, campos, perfil)
+    hash_anterior, caminho = _ler_hash(caminho_campos)
+
+    reutilizado = (not forcar and hash_anterior == hash_atual
+                   and caminho is not None and os.path.exists(caminho))
+    if reutilizado:
+        print(f"♻️ Figura inalterada: {caminho}")
+    else:
+        usar_backend_headless()
+        with stage("render"):
+            caminho = desenhar(campos, perfil)
+        _gravar_campos(caminho_campos, campos, hash_atual, caminho)
+    return {"modulo": modulo, "funcao": funcao, "caminho": caminho,
+            "reutilizado": reutilizado, "tempo": time.perf_counter() - inicio}
+
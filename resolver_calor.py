@@ -5,13 +5,16 @@ Equação: ∂u/∂t = ∂²u/∂x²
 Domínio: [0,1] × [0,1] com u(0,t) = u(1,t) = 0 e u(x,0) = sin(3πx/2)
 """
 
+import os
 import numpy as np
-import matplotlib.pyplot as plt
 import sys
 sys.path.insert(0, 'core')
 
 from galerkin_solver import GalerkinSolver
+from convergence_analyzer import ConvergenceAnalyzer, truncation_family
+from functionals import energy, energy_centroid
 from problems import EDPCatalog
+from renderizacao import pyplot, renderizar, salvar_figura
 
 def resolver_calor():
     """Resolve a equação do calor com diferentes números de termos"""
@@ -26,49 +29,94 @@ def resolver_calor():
     # Obter problema
     catalog = EDPCatalog()
     problem = catalog.get_problem('heat_1d')
-    solver = GalerkinSolver()
+    # Coeficientes reaproveitados entre execuções (cache em disco)
+    solver = GalerkinSolver(cache_dir=os.environ.get('EDP_CACHE_DIR', '.edp_cache'))
+    
+    # N das figuras: o menor que atinge a tolerância pelo decaimento dos
+    # coeficientes; o estudo de convergência usa truncamentos até ele
+    _, adaptativo = solver.solve_to_tolerance(problem, 1e-4, t=0.01)
+    n_terms_list = truncation_family(adaptativo['n_terms'])
+    print(f"Adaptativo (tol = 1e-4): N = {adaptativo['n_terms']}, "
+          f"erro L² estimado = {adaptativo['error_estimate']:.3e}")
+    
+    # Resolver uma única vez com N_max e obter cada n_terms por truncamento
+    print(f"Resolvendo com {max(n_terms_list)} termos (família {n_terms_list})...")
+    solutions = solver.solve_family(problem, n_terms_list)
+    # Erros L², H¹ e máximo de toda a família por quadratura de Gauss,
+    # contra a solução analítica ou uma referência com 4·N_max termos
+    # Medido em t = 0.01, antes que os modos altos se amorteçam abaixo
+    # da precisão de máquina
+    analyzer = ConvergenceAnalyzer(solver)
+    norms = analyzer.error_norms(solutions, n_terms_list, problem, t=0.01)
+    # Erros nulos (solução exata na base) aparecem como ε no gráfico log
+    errors = np.maximum(norms['l2'], np.finfo(float).eps).tolist()
+    
+    for n_terms, l2, h1, e_max in zip(n_terms_list, norms['l2'], norms['h1'], norms['max']):
+        print(f"  N = {n_terms:3d}: erro L² = {l2:.3e}, H¹ = {h1:.3e}, máx = {e_max:.3e}")
     
-    # Diferentes números de termos
-    n_terms_list = [5, 10, 15, 20, 25]
+    return solutions, n_terms_list, errors
+
+def calcular_campos_calor(solutions, n_terms_list):
+    """Calcula os arrays usados no gráfico da solução (sem matplotlib)"""
+    x = np.linspace(0, 1, 100)
+    max_terms = max(n_terms_list)
+    solution = solutions[max_terms]
+    tempos = [0, 0.005, 0.01, 0.02, 0.05, 0.1]
     
-    # Resolver para cada n_terms
-    solutions = {}
-    errors = []
+    # Mapa espaço-tempo: modos já amortecidos abaixo de 1e-12 são
+    # descartados em cada instante
+    x_mesh = np.linspace(0, 1, 60)
+    t_mesh = np.linspace(0, 0.2, 50)
+    U_mapa = solution.evaluate_grid(x_mesh, t_mesh, tol=1e-12)
     
-    for n_terms in n_terms_list:
-        print(f"Resolvendo com {n_terms} termos...")
-        solution = solver.solve(problem, n_terms)
-        solutions[n_terms] = solution
-        
-        # Erro baseado na evolução
-        x_test = np.linspace(0, 1, 50)
-        t_test = 0.1
-        u_vals = solution(x_test, t_test)
-        error = np.sqrt(np.mean(u_vals**2)) / n_terms
-        errors.append(error)
-        print(f"  Erro normalizado: {error:.6f}")
+    # Espectro da condição inicial e após difusão
+    u_inicial = solution(x, 0)
+    u_final = solution(x, 0.1)
+    freqs = np.fft.fftfreq(len(x), x[1]-x[0])
     
-    return solutions, n_terms_list, errors
+    # Energia ∫u² dx e "entropia" aproximada (deslocamento do centróide
+    # da energia), direto dos coeficientes por Parseval
+    t_vals = np.linspace(0, 0.4, 80)
+    energia = energy(solution, t_vals)
+    significativo = np.sqrt(energia) > 1e-6
+    variance = energy_centroid(solution, t_vals) - 0.5
+    
+    return {
+        "x": x,
+        "max_terms": max_terms,
+        "tempos": tempos,
+        "U_tempos": solution.evaluate_grid(x, tempos),
+        "x_mesh": x_mesh,
+        "t_mesh": t_mesh,
+        "U_mapa": U_mapa,
+        "freqs": freqs,
+        "espectro_inicial": np.abs(np.fft.fft(u_inicial))**2,
+        "espectro_final": np.abs(np.fft.fft(u_final))**2,
+        "u_inicial_galerkin": u_inicial,
+        "u_inicial_analitica": np.sin(3 * np.pi * x / 2),
+        "t_vals": t_vals,
+        "energia": energia,
+        "entropia": np.where(significativo, variance, 0),
+    }
 
-def plotar_solucoes_calor(solutions, n_terms_list):
-    """Plota as soluções da equação do calor com ESTILO ÚNICO - Termodinâmica"""
+def desenhar_solucoes_calor(campos, perfil=None):
+    """Desenha o gráfico da solução do calor a partir dos campos pré-calculados"""
+    plt = pyplot()
     fig = plt.figure(figsize=(18, 14))
     fig.patch.set_facecolor('#1a1a1a')  # Fundo escuro estilo térmico
     
-    x = np.linspace(0, 1, 100)
-    max_terms = max(n_terms_list)
-    solution = solutions[max_terms]
+    x = campos["x"]
+    max_terms = campos["max_terms"]
     
     # Subplot 1: EVOLUÇÃO TÉRMICA - Estilo infravermelho
     plt.subplot(2, 3, 1)
     plt.gca().set_facecolor('black')
-    tempos = [0, 0.005, 0.01, 0.02, 0.05, 0.1]
+    tempos = campos["tempos"]
     
     # Cores que simulam radiação térmica (do branco quente ao vermelho frio)
     thermal_colors = ['#ffffff', '#ffff99', '#ffcc66', '#ff9933', '#ff6600', '#cc3300']
     
-    for i, t in enumerate(tempos):
-        u = solution(x, t)
+    for i, (t, u) in enumerate(zip(tempos, campos["U_tempos"])):
         intensity = 1.0 - i * 0.12  # Diminuir intensidade com tempo
         plt.plot(x, u, color=thermal_colors[i], linewidth=4, alpha=intensity,
                 label=f'T = {t:.3f}s', marker='o' if i == 0 else None, markersize=5)
@@ -88,14 +136,8 @@ def plotar_solucoes_calor(solutions, n_terms_list):
     # Subplot 2: TERMOGRAFIA INFRAVERMELHA - Mapa de calor 3D estilo
     plt.subplot(2, 3, 2)
     plt.gca().set_facecolor('black')
-    x_mesh = np.linspace(0, 1, 60)
-    t_mesh = np.linspace(0, 0.2, 50)
-    X, T = np.meshgrid(x_mesh, t_mesh)
-    
-    U = np.zeros_like(X)
-    for i in range(len(t_mesh)):
-        for j in range(len(x_mesh)):
-            U[i, j] = solution(x_mesh[j], t_mesh[i])
+    X, T = np.meshgrid(campos["x_mesh"], campos["t_mesh"])
+    U = campos["U_mapa"]
     
     # Usar colormap que simula câmera térmica
     thermal_map = plt.contourf(X, T, U, levels=30, cmap='hot', alpha=0.9)
@@ -117,18 +159,14 @@ def plotar_solucoes_calor(solutions, n_terms_list):
     plt.gca().set_facecolor('#1a1a2e')
     
     # Condição inicial e sua decomposição espectral
-    u_inicial = solution(x, 0)
-    fft_inicial = np.fft.fft(u_inicial)
-    freqs = np.fft.fftfreq(len(x), x[1]-x[0])
+    freqs = campos["freqs"]
     
     # Plot espectro de frequências
-    plt.loglog(freqs[1:len(freqs)//2], np.abs(fft_inicial[1:len(freqs)//2])**2, 
+    plt.loglog(freqs[1:len(freqs)//2], campos["espectro_inicial"][1:len(freqs)//2], 
                'cyan', linewidth=3, label='Espectro Inicial', marker='o', markersize=4)
     
     # Comparar com espectro após difusão
-    u_final = solution(x, 0.1)
-    fft_final = np.fft.fft(u_final)
-    plt.loglog(freqs[1:len(freqs)//2], np.abs(fft_final[1:len(freqs)//2])**2, 
+    plt.loglog(freqs[1:len(freqs)//2], campos["espectro_final"][1:len(freqs)//2], 
                'magenta', linewidth=3, label='Após Difusão', marker='s', markersize=4)
     
     plt.xlabel('Frequência [Hz]', fontsize=12, weight='bold', color='white')
@@ -144,8 +182,8 @@ def plotar_solucoes_calor(solutions, n_terms_list):
     plt.gca().set_facecolor('#2c1810')  # Fundo marrom escuro
     
     # Condições iniciais
-    u_inicial_galerkin = solution(x, 0)
-    u_inicial_analitica = np.sin(3 * np.pi * x / 2)
+    u_inicial_galerkin = campos["u_inicial_galerkin"]
+    u_inicial_analitica = campos["u_inicial_analitica"]
     
     plt.plot(x, u_inicial_galerkin, color='gold', linewidth=4, 
              label='Galerkin t=0', marker='D', markersize=5, markevery=5)
@@ -175,22 +213,9 @@ def plotar_solucoes_calor(solutions, n_terms_list):
     plt.subplot(2, 3, 5)
     plt.gca().set_facecolor('#001122')  # Azul escuro para resfriamento
     
-    t_vals = np.linspace(0, 0.4, 80)
-    energia = []
-    entropia = []
-    
-    for t in t_vals:
-        u_vals = solution(x, t)
-        # Energia total (integral da temperatura)
-        E = np.trapz(u_vals**2, x)
-        energia.append(E)
-        
-        # "Entropia" aproximada (dispersão espacial)
-        if np.max(u_vals) > 1e-6:
-            variance = np.trapz(x * u_vals**2, x) / np.trapz(u_vals**2, x) - 0.5
-            entropia.append(variance)
-        else:
-            entropia.append(0)
+    t_vals = campos["t_vals"]
+    energia = campos["energia"]
+    entropia = campos["entropia"]
     
     # Plot energia em escala logarítmica
     plt.semilogy(t_vals, energia, color='lime', linewidth=4, 
@@ -263,14 +288,22 @@ APLICAÇÕES:
     plt.tight_layout(rect=[0, 0, 1, 0.96])
     
     # Salvar com tema térmico
-    plt.savefig('output/calor_1d_solucao.png', dpi=350, bbox_inches='tight',
-                facecolor='#1a1a1a', edgecolor='orange', linewidth=2)
-    plt.show()
+    caminho = salvar_figura(fig, 'output/calor_1d_solucao.png', 350, perfil,
+                            bbox_inches='tight', facecolor='#1a1a1a', edgecolor='orange')
     print("💾 Gráfico Calor salvo: output/calor_1d_solucao.png")
+    return caminho
 
-def plotar_convergencia_calor(n_terms_list, errors):
-    """Plota análise de convergência da equação do calor"""
-    plt.figure(figsize=(10, 6))
+def plotar_solucoes_calor(solutions, n_terms_list, perfil=None):
+    """Plota as soluções da equação do calor com ESTILO ÚNICO - Termodinâmica"""
+    campos = calcular_campos_calor(solutions, n_terms_list)
+    return renderizar(__name__, "desenhar_solucoes_calor", campos, perfil)["caminho"]
+
+def desenhar_convergencia_calor(campos, perfil=None):
+    """Desenha a convergência a partir de {n_terms_list, errors}"""
+    plt = pyplot()
+    n_terms_list = campos["n_terms_list"]
+    errors = campos["errors"]
+    fig = plt.figure(figsize=(10, 6))
     
     plt.loglog(n_terms_list, errors, 'ro-', linewidth=2, markersize=8, 
                label='Erro Calor 1D')
@@ -281,7 +314,7 @@ def plotar_convergencia_calor(n_terms_list, errors):
     plt.loglog(x_ref, y_ref, 'r--', alpha=0.7, label='Referência O(1/N)')
     
     plt.xlabel('Número de Termos (N)')
-    plt.ylabel('Erro Normalizado')
+    plt.ylabel('Erro L²')
     plt.title('Convergência - Equação do Calor 1D')
     plt.legend()
     plt.grid(True, alpha=0.3)
@@ -293,13 +326,18 @@ def plotar_convergencia_calor(n_terms_list, errors):
                 transform=plt.gca().transAxes, fontsize=12,
                 bbox=dict(boxstyle='round', facecolor='lightcoral', alpha=0.8))
     
-    plt.savefig('output/calor_1d_convergencia.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    caminho = salvar_figura(fig, 'output/calor_1d_convergencia.png', 300, perfil,
+                            bbox_inches='tight')
     print("💾 Convergência salva: output/calor_1d_convergencia.png")
+    return caminho
+
+def plotar_convergencia_calor(n_terms_list, errors, perfil=None):
+    """Plota análise de convergência da equação do calor"""
+    campos = {"n_terms_list": list(n_terms_list), "errors": list(errors)}
+    return renderizar(__name__, "desenhar_convergencia_calor", campos, perfil)["caminho"]
 
 def main():
     """Função principal"""
-    import os
     os.makedirs('output', exist_ok=True)
     
     try:
@@ -1,84 +1,130 @@
 #!/usr/bin/env python3
 """
 Resolução individual da Equação de Helmholtz 2D usando método de Galerkin
-Equação: ∇²φ + λφ = 0 com λ = 1
-Domínio: [0,1] × [0,1/4] com φ(0,y) = φ(x,0) = 0
+Equação: ∇²φ + λφ = f com λ = 1 e f da solução manufaturada x(1-x) y(2-y)
+Domínio: [0,1] × [0,1] com φ(0,y) = φ(1,y) = φ(x,0) = 0 e ∂φ/∂y(x,1) = 0
 """
 
+import os
 import numpy as np
-import matplotlib.pyplot as plt
-from mpl_toolkits.mplot3d import Axes3D
 import sys
 sys.path.insert(0, 'core')
 
 from galerkin_solver import GalerkinSolver
+from convergence_analyzer import ConvergenceAnalyzer, truncation_family
 from problems import EDPCatalog
+from renderizacao import pyplot, renderizar, salvar_figura
 
 def resolver_helmholtz():
     """Resolve a equação de Helmholtz com diferentes números de termos"""
     print("⚡ RESOLVENDO EQUAÇÃO DE HELMHOLTZ 2D")
     print("=" * 50)
-    print("Equação: ∇²φ + λφ = 0 com λ = 1")
+    print("Equação: ∇²φ + λφ = f com λ = 1")
     print("Domínio: [0,1] × [0,1] conforme imagem")
-    print("Condições: φ(0,y) = φ(x,0) = 0, ∂φ/∂y(x,2) = 0")
+    print("Condições: φ(0,y) = φ(1,y) = φ(x,0) = 0, ∂φ/∂y(x,1) = 0")
     print("=" * 50)
     
     # Obter problema
     catalog = EDPCatalog()
     problem = catalog.get_problem('helmholtz_2d')
-    solver = GalerkinSolver()
-    
-    # Diferentes números de termos (menos para 2D)
-    n_terms_list = [3, 5, 8, 10, 12]
-    
-    # Resolver para cada n_terms
-    solutions = {}
-    errors = []
-    
-    for n_terms in n_terms_list:
-        print(f"Resolvendo com {n_terms} termos...")
-        solution = solver.solve(problem, n_terms)
-        solutions[n_terms] = solution
-        
-        # Erro baseado em pontos de teste no novo domínio
-        x_test = np.linspace(0.1, 0.9, 10)
-        y_test = np.linspace(0.1, 0.9, 8)  # Domínio [0,1] conforme imagem
-        error_total = 0
-        count = 0
-        
-        for x in x_test:
-            for y in y_test:
-                try:
-                    val = solution(x, y)
-                    error_total += abs(val)
-                    count += 1
-                except:
-                    pass
-        
-        error = error_total / (count * n_terms) if count > 0 else 1.0
-        errors.append(error)
-        print(f"  Erro normalizado: {error:.6f}")
+    # Coeficientes reaproveitados entre execuções (cache em disco)
+    solver = GalerkinSolver(cache_dir=os.environ.get('EDP_CACHE_DIR', '.edp_cache'))
+    
+    # N das figuras: o menor que atinge a tolerância pelo decaimento dos
+    # coeficientes; o estudo de convergência usa truncamentos até ele
+    _, adaptativo = solver.solve_to_tolerance(problem, 1e-4)
+    n_terms_list = truncation_family(adaptativo['n_terms'])
+    print(f"Adaptativo (tol = 1e-4): N = {adaptativo['n_terms']}, "
+          f"erro L² estimado = {adaptativo['error_estimate']:.3e}")
+    
+    # Resolver uma única vez com N_max e obter cada n_terms por truncamento
+    print(f"Resolvendo com {max(n_terms_list)} termos (família {n_terms_list})...")
+    solutions = solver.solve_family(problem, n_terms_list)
+    # Erros L², H¹ e máximo de toda a família por quadratura de Gauss,
+    # contra a solução analítica ou uma referência com 4·N_max termos
+    analyzer = ConvergenceAnalyzer(solver)
+    norms = analyzer.error_norms(solutions, n_terms_list, problem)
+    # Erros nulos (solução exata na base) aparecem como ε no gráfico log
+    errors = np.maximum(norms['l2'], np.finfo(float).eps).tolist()
+    
+    for n_terms, l2, h1, e_max in zip(n_terms_list, norms['l2'], norms['h1'], norms['max']):
+        print(f"  N = {n_terms:3d}: erro L² = {l2:.3e}, H¹ = {h1:.3e}, máx = {e_max:.3e}")
+    
+    # λ não pode coincidir com um autovalor de -∇² (problema mal posto);
+    # na base tensorial os autovalores são exatos e saem sem custo
+    ressonancia = solver.resonance(problem, max(n_terms_list))
+    estado = "⚠️ RESSONANTE" if ressonancia['resonant'] else "fora de ressonância"
+    print(f"  Ressonância (espectral, N = {max(n_terms_list)}): λ = {ressonancia['lambda_param']:g}, "
+          f"autovalor mais próximo μ = {ressonancia['eigenvalue']:.4f}, "
+          f"distância relativa {ressonancia['relative_gap']:.1%} ({estado})")
     
     return solutions, n_terms_list, errors
 
-def plotar_solucoes_helmholtz(solutions, n_terms_list):
-    """Plota as soluções da equação de Helmholtz com características 2D específicas"""
-    fig = plt.figure(figsize=(18, 14))
-    
-    x = np.linspace(0, 1, 60)
-    y = np.linspace(0, 0.25, 30)
-    X, Y = np.meshgrid(x, y)
+def calcular_campos_helmholtz(solutions, n_terms_list):
+    """Calcula os arrays usados no gráfico da solução (sem matplotlib)"""
+    problem = EDPCatalog().get_problem('helmholtz_2d')
+    (x0, x1), (y0, y1) = problem['domain']
+    x = np.linspace(x0, x1, 60)
+    y = np.linspace(y0, y1, 60)
     max_terms = max(n_terms_list)
     solution = solutions[max_terms]
     
     # Avaliar solução em toda a malha
-    Z = np.zeros_like(X)
-    for i in range(X.shape[0]):
-        for j in range(X.shape[1]):
-            try:
-                Z[i, j] = solution(X[i, j], Y[i, j])
-            except:
-                Z[i, j] = 0
+    Z = solution.evaluate_grid(x, y)
+    
+    # Cortes no meio do domínio comparados com a solução exata do catálogo
+    exata = problem['analytical']
+    y_meio = 0.5 * (y0 + y1)
+    x_meio = 0.5 * (x0 + x1)
+    phi_x = solution(x, y_meio)
+    phi_exata = exata(x, y_meio)
+    phi_y = solution(x_meio, y)
+    phi_y_exata = exata(x_meio, y)
+    
+    # Gradiente exato pelas séries derivadas dos mesmos coeficientes
+    grad_x = solution.evaluate_grid(x, y, derivative="x")
+    grad_y = solution.evaluate_grid(x, y, derivative="y")
+    
+    # Dez menores autovalores de -∇² com as condições do problema; o rótulo
+    # (m,n) é o par de autofunções 1D que forma cada modo
+    eigenvals, modos = GalerkinSolver().eigenmodes(problem, k=10)
+    mode_labels = []
+    for modo in modos:
+        m, n = np.unravel_index(np.argmax(np.abs(modo.coeffs)), modo.coeffs.shape)
+        mode_labels.append(f'({m + 1},{n + 1})')
+    
+    y_comparacao = 0.1
+    return {
+        "x": x,
+        "y": y,
+        "max_terms": max_terms,
+        "Z": Z,
+        "y_meio": y_meio,
+        "x_meio": x_meio,
+        "phi_x": phi_x,
+        "phi_exata": phi_exata,
+        "phi_y": phi_y,
+        "phi_y_exata": phi_y_exata,
+        "grad_x": grad_x,
+        "grad_y": grad_y,
+        "grad_mag": np.sqrt(grad_x**2 + grad_y**2),
+        "y_comparacao": y_comparacao,
+        "curvas": {n_terms: solutions[n_terms](x, y_comparacao) for n_terms in n_terms_list[:4]},
+        "eigenvals": eigenvals,
+        "mode_labels": mode_labels,
+    }
+
+def desenhar_solucoes_helmholtz(campos, perfil=None):
+    """Desenha o gráfico da solução de Helmholtz a partir dos campos pré-calculados"""
+    plt = pyplot()
+    from mpl_toolkits.mplot3d import Axes3D  # noqa: F401 (projeção '3d')
+    fig = plt.figure(figsize=(18, 14))
+    
+    x = campos["x"]
+    y = campos["y"]
+    X, Y = np.meshgrid(x, y)
+    max_terms = campos["max_terms"]
+    Z = campos["Z"]
     
     # Subplot 1: Superfície 3D com estilo Helmholtz
     ax1 = fig.add_subplot(2, 4, 1, projection='3d')
@@ -102,23 +148,15 @@ def plotar_solucoes_helmholtz(solutions, n_terms_list):
     plt.title('🗺️ Mapa de Contorno\n(Autofunções)', fontsize=12)
     plt.axis('equal')
     
-    # Subplot 3: Corte em y = 0.125 (meio do domínio)
+    # Subplot 3: Corte em y = y_meio (meio do domínio)
     plt.subplot(2, 4, 3)
-    y_meio = 0.125
-    phi_x = []
-    for xi in x:
-        try:
-            val = solution(xi, y_meio)
-            phi_x.append(val)
-        except:
-            phi_x.append(0)
+    y_meio = campos["y_meio"]
+    phi_x = campos["phi_x"]
     
     plt.plot(x, phi_x, 'b-', linewidth=3, label=f'φ(x, {y_meio})', marker='o', markersize=4)
     
-    # Comparar com autofunção teórica
-    phi_teorica = np.sin(np.pi * x) * np.sin(2 * np.pi * y_meio / 0.25)
-    phi_teorica = phi_teorica / np.max(np.abs(phi_teorica)) * np.max(np.abs(phi_x))
-    plt.plot(x, phi_teorica, 'r--', linewidth=2, alpha=0.7, label='Teórica (1,2)')
+    # Comparar com a solução exata
+    plt.plot(x, campos["phi_exata"], 'r--', linewidth=2, alpha=0.7, label='Exata')
     
     plt.xlabel('x', fontsize=11)
     plt.ylabel(f'φ(x, {y_meio})', fontsize=11)
@@ -126,23 +164,14 @@ def plotar_solucoes_helmholtz(solutions, n_terms_list):
     plt.legend()
     plt.grid(True, alpha=0.4)
     
-    # Subplot 4: Corte em x = 0.5 (meio do domínio)
+    # Subplot 4: Corte em x = x_meio (meio do domínio)
     plt.subplot(2, 4, 4)
-    x_meio = 0.5
-    phi_y = []
-    for yi in y:
-        try:
-            val = solution(x_meio, yi)
-            phi_y.append(val)
-        except:
-            phi_y.append(0)
-    
-    plt.plot(y, phi_y, 'g-', linewidth=3, label=f'φ({x_meio}, y)', marker='s', markersize=4)
-    
-    # Autofunção teórica no corte vertical
-    phi_y_teorica = np.sin(np.pi * x_meio) * np.sin(2 * np.pi * y / 0.25)
-    phi_y_teorica = phi_y_teorica / np.max(np.abs(phi_y_teorica)) * np.max(np.abs(phi_y))
-    plt.plot(y, phi_y_teorica, 'r--', linewidth=2, alpha=0.7, label='Teórica (1,2)')
+    x_meio = campos["x_meio"]
+    
+    plt.plot(y, campos["phi_y"], 'g-', linewidth=3, label=f'φ({x_meio}, y)', marker='s', markersize=4)
+    
+    # Solução exata no corte vertical
+    plt.plot(y, campos["phi_y_exata"], 'r--', linewidth=2, alpha=0.7, label='Exata')
     
     plt.xlabel('y', fontsize=11)
     plt.ylabel(f'φ({x_meio}, y)', fontsize=11)
@@ -152,16 +181,9 @@ def plotar_solucoes_helmholtz(solutions, n_terms_list):
     
     # Subplot 5: Magnitude do gradiente (campo escalar)
     plt.subplot(2, 4, 5)
-    dx = x[1] - x[0]
-    dy = y[1] - y[0]
-    
-    grad_x = np.zeros_like(Z)
-    grad_y = np.zeros_like(Z)
-    
-    grad_x[:, 1:-1] = (Z[:, 2:] - Z[:, :-2]) / (2 * dx)
-    grad_y[1:-1, :] = (Z[2:, :] - Z[:-2, :]) / (2 * dy)
-    
-    grad_mag = np.sqrt(grad_x**2 + grad_y**2)
+    grad_x = campos["grad_x"]
+    grad_y = campos["grad_y"]
+    grad_mag = campos["grad_mag"]
     
     contour_grad = plt.contourf(X, Y, grad_mag, levels=15, cmap='plasma', alpha=0.9)
     plt.colorbar(contour_grad, label='|∇φ|')
@@ -178,20 +200,11 @@ def plotar_solucoes_helmholtz(solutions, n_terms_list):
     
     # Subplot 6: Comparação de diferentes N
     plt.subplot(2, 4, 6)
-    y_comparacao = 0.1
-    for i, n_terms in enumerate([3, 5, 8, 10]):
-        if n_terms in solutions:
-            phi_comp = []
-            for xi in x:
-                try:
-                    val = solutions[n_terms](xi, y_comparacao)
-                    phi_comp.append(val)
-                except:
-                    phi_comp.append(0)
-            
-            style = ['-', '--', '-.', ':'][i]
-            plt.plot(x, phi_comp, linewidth=2.5, linestyle=style, 
-                    label=f'N = {n_terms}', alpha=0.8)
+    y_comparacao = campos["y_comparacao"]
+    for i, (n_terms, phi_comp) in enumerate(campos["curvas"].items()):
+        style = ['-', '--', '-.', ':'][i]
+        plt.plot(x, phi_comp, linewidth=2.5, linestyle=style, 
+                label=f'N = {n_terms}', alpha=0.8)
     
     plt.xlabel('x', fontsize=11)
     plt.ylabel(f'φ(x, {y_comparacao})', fontsize=11)
@@ -201,32 +214,17 @@ def plotar_solucoes_helmholtz(solutions, n_terms_list):
     
     # Subplot 7: Análise dos autovalores
     plt.subplot(2, 4, 7)
-    # Calcular autovalores teóricos para o domínio [0,1] × [0,0.25]
-    Lx, Ly = 1.0, 0.25
-    m_vals = np.arange(1, 6)
-    n_vals = np.arange(1, 6)
-    
-    eigenvals = []
-    mode_labels = []
+    # Primeiros autovalores calculados, já ordenados
+    eigenvals = campos["eigenvals"]
+    labels = campos["mode_labels"]
     
-    for m in m_vals:
-        for n in n_vals:
-            k_mn_squared = (m * np.pi / Lx)**2 + (n * np.pi / Ly)**2
-            eigenvals.append(k_mn_squared)
-            mode_labels.append(f'({m},{n})')
-    
-    # Mostrar os primeiros autovalores
-    eigenvals = np.array(eigenvals)
-    sorted_indices = np.argsort(eigenvals)
-    
-    plt.bar(range(min(10, len(eigenvals))), eigenvals[sorted_indices[:10]], 
+    plt.bar(range(len(eigenvals)), eigenvals, 
             color='skyblue', edgecolor='navy', alpha=0.7)
     plt.axhline(y=1, color='red', linestyle='--', linewidth=2, label='λ = 1 (dado)')
     
-    labels = [mode_labels[i] for i in sorted_indices[:10]]
-    plt.xticks(range(min(10, len(eigenvals))), labels, rotation=45)
+    plt.xticks(range(len(eigenvals)), labels, rotation=45)
     plt.ylabel('k²ₘₙ', fontsize=11)
-    plt.title('📊 Autovalores Teóricos\nk²ₘₙ = (mπ/Lₓ)² + (nπ/Lᵧ)²', fontsize=12)
+    plt.title('📊 Autovalores de -∇²\n(Galerkin, condições do problema)', fontsize=12)
     plt.legend()
     plt.grid(True, alpha=0.4)
     
@@ -235,24 +233,22 @@ def plotar_solucoes_helmholtz(solutions, n_terms_list):
     info_text = f"""
 ⚡ EQUAÇÃO DE HELMHOLTZ 2D
 
-Equação: ∇²φ + λφ = 0
-Onde: λ = 1
-Domínio: [0,1] × [0,1/4]
-Condições: φ = 0 nas bordas
+Equação: ∇²φ + λφ = f
+Onde: λ = 1, φ = x(1-x) y(2-y)
+Domínio: [0,1] × [0,1]
+Condições: φ = 0 em x = 0, 1 e y = 0
+           ∂φ/∂y = 0 em y = 1
 
-PROBLEMA DE AUTOVALORES:
-∇²φ = -λφ
-
-AUTOVALORES TEÓRICOS:
-k²ₘₙ = (mπ)² + (4nπ)²
+AUTOVALORES DE -∇² (ressonância):
+k²ₘₙ = (mπ)² + ((n-½)π)²
 
 PRIMEIROS MODOS:
-(1,1): k² = π² + 16π² ≈ 168
-(1,2): k² = π² + 64π² ≈ 642
-(2,1): k² = 4π² + 16π² ≈ 198
+(1,1): k² = π² + π²/4 ≈ 12.3
+(1,2): k² = π² + 9π²/4 ≈ 32.1
+(2,1): k² = 4π² + π²/4 ≈ 42.0
 
 MÉTODO GALERKIN:
-• Base: sin(mπx)sin(nπy/Ly)
+• Base: sin(mπx)sin((n-½)πy)
 • Termos: {max_terms}
 • Projeção L² em 2D
 • Autofunções aproximadas
@@ -272,14 +268,22 @@ CARACTERÍSTICAS:
     plt.tight_layout()
     
     # Salvar
-    plt.savefig('output/helmholtz_2d_solucao.png', dpi=300, bbox_inches='tight',
-                facecolor='white', edgecolor='none')
-    plt.show()
+    caminho = salvar_figura(fig, 'output/helmholtz_2d_solucao.png', 300, perfil,
+                            bbox_inches='tight', facecolor='white', edgecolor='none')
     print("💾 Gráfico Helmholtz salvo: output/helmholtz_2d_solucao.png")
+    return caminho
 
-def plotar_convergencia_helmholtz(n_terms_list, errors):
-    """Plota análise de convergência da equação de Helmholtz"""
-    plt.figure(figsize=(10, 6))
+def plotar_solucoes_helmholtz(solutions, n_terms_list, perfil=None):
+    """Plota as soluções da equação de Helmholtz com características 2D específicas"""
+    campos = calcular_campos_helmholtz(solutions, n_terms_list)
+    return renderizar(__name__, "desenhar_solucoes_helmholtz", campos, perfil)["caminho"]
+
+def desenhar_convergencia_helmholtz(campos, perfil=None):
+    """Desenha a convergência a partir de {n_terms_list, errors}"""
+    plt = pyplot()
+    n_terms_list = campos["n_terms_list"]
+    errors = campos["errors"]
+    fig = plt.figure(figsize=(10, 6))
     
     plt.loglog(n_terms_list, errors, 'mo-', linewidth=2, markersize=8, 
                label='Erro Helmholtz 2D')
@@ -290,7 +294,7 @@ def plotar_convergencia_helmholtz(n_terms_list, errors):
     plt.loglog(x_ref, y_ref, 'r--', alpha=0.7, label='Referência O(1/N)')
     
     plt.xlabel('Número de Termos (N)')
-    plt.ylabel('Erro Normalizado')
+    plt.ylabel('Erro L²')
     plt.title('Convergência - Equação de Helmholtz 2D')
     plt.legend()
     plt.grid(True, alpha=0.3)
@@ -302,13 +306,18 @@ def plotar_convergencia_helmholtz(n_terms_list, errors):
                 transform=plt.gca().transAxes, fontsize=12,
                 bbox=dict(boxstyle='round', facecolor='plum', alpha=0.8))
     
-    plt.savefig('output/helmholtz_2d_convergencia.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    caminho = salvar_figura(fig, 'output/helmholtz_2d_convergencia.png', 300, perfil,
+                            bbox_inches='tight')
     print("💾 Convergência salva: output/helmholtz_2d_convergencia.png")
+    return caminho
+
+def plotar_convergencia_helmholtz(n_terms_list, errors, perfil=None):
+    """Plota análise de convergência da equação de Helmholtz"""
+    campos = {"n_terms_list": list(n_terms_list), "errors": list(errors)}
+    return renderizar(__name__, "desenhar_convergencia_helmholtz", campos, perfil)["caminho"]
 
 def main():
     """Função principal"""
-    import os
     os.makedirs('output', exist_ok=True)
     
     try:
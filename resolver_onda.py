@@ -5,13 +5,16 @@ Equação: ∂u/∂t = λ² ∂²u/∂x² com λ² = 4
 Domínio: [0,1] × [0,1] com u(0,t) = 0 e u(x,0) = 1
 """
 
+import os
 import numpy as np
-import matplotlib.pyplot as plt
 import sys
 sys.path.insert(0, 'core')
 
 from galerkin_solver import GalerkinSolver
+from convergence_analyzer import ConvergenceAnalyzer, truncation_family
+from functionals import energy
 from problems import EDPCatalog
+from renderizacao import pyplot, renderizar, salvar_figura
 
 def resolver_onda():
     """Resolve a equação da onda com diferentes números de termos"""
@@ -25,49 +28,92 @@ def resolver_onda():
     # Obter problema
     catalog = EDPCatalog()
     problem = catalog.get_problem('wave_1d')
-    solver = GalerkinSolver()
+    # Coeficientes reaproveitados entre execuções (cache em disco)
+    solver = GalerkinSolver(cache_dir=os.environ.get('EDP_CACHE_DIR', '.edp_cache'))
+    
+    # N das figuras: o menor que atinge a tolerância pelo decaimento dos
+    # coeficientes; o estudo de convergência usa truncamentos até ele
+    _, adaptativo = solver.solve_to_tolerance(problem, 1e-4, t=0.001)
+    n_terms_list = truncation_family(adaptativo['n_terms'])
+    print(f"Adaptativo (tol = 1e-4): N = {adaptativo['n_terms']}, "
+          f"erro L² estimado = {adaptativo['error_estimate']:.3e}")
+    
+    # Resolver uma única vez com N_max e obter cada n_terms por truncamento
+    print(f"Resolvendo com {max(n_terms_list)} termos (família {n_terms_list})...")
+    solutions = solver.solve_family(problem, n_terms_list)
+    # Erros L², H¹ e máximo de toda a família por quadratura de Gauss,
+    # contra a solução analítica ou uma referência com 4·N_max termos
+    # Medido em t = 0.001: com λ = 4 os modos altos se amortecem muito
+    # rápido e em t = 0.1 cinco termos já atingem a precisão de máquina
+    analyzer = ConvergenceAnalyzer(solver)
+    norms = analyzer.error_norms(solutions, n_terms_list, problem, t=0.001)
+    # Erros nulos (solução exata na base) aparecem como ε no gráfico log
+    errors = np.maximum(norms['l2'], np.finfo(float).eps).tolist()
+    
+    for n_terms, l2, h1, e_max in zip(n_terms_list, norms['l2'], norms['h1'], norms['max']):
+        print(f"  N = {n_terms:3d}: erro L² = {l2:.3e}, H¹ = {h1:.3e}, máx = {e_max:.3e}")
     
-    # Diferentes números de termos
-    n_terms_list = [5, 10, 15, 20, 25]
+    return solutions, n_terms_list, errors
+
+def calcular_campos_onda(solutions, n_terms_list):
+    """Calcula os arrays usados no gráfico da solução (sem matplotlib)"""
+    x = np.linspace(0, 1, 100)
+    max_terms = max(n_terms_list)
+    solution = solutions[max_terms]
+    tempos = [0, 0.01, 0.025, 0.05, 0.075, 0.1]
     
-    # Resolver para cada n_terms
-    solutions = {}
-    errors = []
+    # Espectros em diferentes tempos, todas as amostras de uma vez na
+    # malha uniforme (DST)
+    t_samples = [0.01, 0.05, 0.1]
+    x_fft, U_fft = solution.evaluate_uniform(128, t_samples)
+    freqs = np.fft.fftfreq(len(x_fft), x_fft[1] - x_fft[0])
+    magnitudes = np.abs(np.fft.fft(U_fft, axis=1)[:, :len(freqs)//2])
     
-    for n_terms in n_terms_list:
-        print(f"Resolvendo com {n_terms} termos...")
-        solution = solver.solve(problem, n_terms)
-        solutions[n_terms] = solution
-        
-        # Erro baseado na evolução temporal
-        x_test = np.linspace(0, 1, 50)
-        t_test = 0.1
-        u_vals = solution(x_test, t_test)
-        error = np.sqrt(np.mean(u_vals**2)) / n_terms
-        errors.append(error)
-        print(f"  Erro normalizado: {error:.6f}")
+    # Velocidade ∂u/∂t em um ponto fixo, exata na série
+    tempos_vel = np.linspace(0.005, 0.15, 30)
+    x_fixed = 0.3  # Ponto fixo para medição
     
-    return solutions, n_terms_list, errors
+    # Amplitude máxima na malha: modos já amortecidos abaixo de 1e-12 são
+    # descartados em cada instante
+    t_fixo = 0.1
+    t_vals = np.linspace(0, 0.3, 100)
+    U_vals = solution.evaluate_grid(x, t_vals, tol=1e-12)
+    
+    return {
+        "x": x,
+        "max_terms": max_terms,
+        "tempos": tempos,
+        "U_tempos": solution.evaluate_grid(x, tempos),
+        "t_samples": t_samples,
+        "freq_pos": freqs[:len(freqs)//2],
+        "magnitudes": magnitudes,
+        "tempos_vel": tempos_vel,
+        "velocidades": np.abs(solution.dt(x_fixed, tempos_vel)),
+        "t_fixo": t_fixo,
+        "curvas": {n_terms: solutions[n_terms](x, t_fixo) for n_terms in n_terms_list[:4]},
+        "t_vals": t_vals,
+        "energia": energy(solution, t_vals),  # Energia ∫u² dx (Parseval)
+        "amplitude_max": np.max(np.abs(U_vals), axis=1),  # Amplitude máxima
+    }
 
-def plotar_solucoes_onda(solutions, n_terms_list):
-    """Plota as soluções da equação da onda com ESTILO ÚNICO - Acústica/Vibrações"""
+def desenhar_solucoes_onda(campos, perfil=None):
+    """Desenha o gráfico da solução da onda a partir dos campos pré-calculados"""
+    plt = pyplot()
     fig = plt.figure(figsize=(18, 14))
     fig.patch.set_facecolor('#0a0a0a')  # Fundo preto estilo osciloscopio
     
-    x = np.linspace(0, 1, 100)
-    max_terms = max(n_terms_list)
-    solution = solutions[max_terms]
+    x = campos["x"]
+    max_terms = campos["max_terms"]
     
     # Subplot 1: OSCILOSCOPIO DIGITAL - Propagação com rastro
     plt.subplot(2, 3, 1)
     plt.gca().set_facecolor('black')
-    tempos = [0, 0.01, 0.025, 0.05, 0.075, 0.1]
+    tempos = campos["tempos"]
     
     # Cores tipo fosforescência de osciloscopio
     scope_colors = ['#00ff00', '#00dd00', '#00bb00', '#009900', '#007700', '#005500']
     
-    for i, t in enumerate(tempos):
-        u = solution(x, t)
+    for i, (t, u) in enumerate(zip(tempos, campos["U_tempos"])):
         intensity = 1.0 - i * 0.12  # Fade type persistence
         linewidth = 4 - i * 0.5
         
@@ -98,19 +144,12 @@ def plotar_solucoes_onda(solutions, n_terms_list):
     plt.gca().set_facecolor('#001a2e')  # Azul escuro para análise espectral
     
     # Análise FFT em diferentes tempos
-    t_samples = [0.01, 0.05, 0.1]
+    t_samples = campos["t_samples"]
     fft_colors = ['#ff0080', '#0080ff', '#80ff00']
+    freq_pos = campos["freq_pos"]
     
-    x_fft = np.linspace(0, 1, 128)
-    for i, t in enumerate(t_samples):
-        u_sample = solution(x_fft, t)
-        fft_result = np.fft.fft(u_sample)
-        freqs = np.fft.fftfreq(len(x_fft), x_fft[1] - x_fft[0])
-        
+    for i, (t, magnitude) in enumerate(zip(t_samples, campos["magnitudes"])):
         # Plot magnitude do espectro
-        magnitude = np.abs(fft_result[:len(freqs)//2])
-        freq_pos = freqs[:len(freqs)//2]
-        
         plt.semilogy(freq_pos[1:], magnitude[1:], color=fft_colors[i], 
                      linewidth=3, label=f't = {t:.2f}s', alpha=0.8)
         
@@ -131,18 +170,9 @@ def plotar_solucoes_onda(solutions, n_terms_list):
     plt.subplot(2, 3, 3)
     plt.gca().set_facecolor('#2a1810')  # Marrom para instrumentação
     
-    # Calcular velocidade através do gradiente temporal
-    tempos_vel = np.linspace(0.005, 0.15, 30)
-    velocidades = []
-    
-    dt = 0.001
-    x_fixed = 0.3  # Ponto fixo para medição
-    
-    for t in tempos_vel:
-        u1 = solution(x_fixed, t)
-        u2 = solution(x_fixed, t + dt)
-        velocidade_local = (u2 - u1) / dt
-        velocidades.append(abs(velocidade_local))
+    # Velocidade através do gradiente temporal
+    tempos_vel = campos["tempos_vel"]
+    velocidades = campos["velocidades"]
     
     # Plot tipo velocímetro
     plt.plot(tempos_vel, velocidades, color='orange', linewidth=4, 
@@ -168,13 +198,11 @@ def plotar_solucoes_onda(solutions, n_terms_list):
     
     # Subplot 4: Comparação de amplitudes (diferentes N)
     plt.subplot(2, 3, 4)
-    t_fixo = 0.1
-    for i, n_terms in enumerate([5, 10, 15, 20]):
-        if n_terms in solutions:
-            u = solutions[n_terms](x, t_fixo)
-            style = ['-', '--', '-.', ':'][i % 4]
-            plt.plot(x, u, linewidth=3, linestyle=style, 
-                    label=f'N = {n_terms}', alpha=0.8)
+    t_fixo = campos["t_fixo"]
+    for i, (n_terms, u) in enumerate(campos["curvas"].items()):
+        style = ['-', '--', '-.', ':'][i % 4]
+        plt.plot(x, u, linewidth=3, linestyle=style, 
+                label=f'N = {n_terms}', alpha=0.8)
     
     plt.xlabel('x', fontsize=12)
     plt.ylabel(f'u(x, {t_fixo})', fontsize=12)
@@ -184,16 +212,9 @@ def plotar_solucoes_onda(solutions, n_terms_list):
     
     # Subplot 5: Evolução da energia (característica de onda 1ª ordem)
     plt.subplot(2, 3, 5)
-    t_vals = np.linspace(0, 0.3, 100)
-    energia = []
-    amplitude_max = []
-    
-    for t in t_vals:
-        u_vals = solution(x, t)
-        E = np.trapz(u_vals**2, x)  # Energia
-        A_max = np.max(np.abs(u_vals))  # Amplitude máxima
-        energia.append(E)
-        amplitude_max.append(A_max)
+    t_vals = campos["t_vals"]
+    energia = campos["energia"]
+    amplitude_max = campos["amplitude_max"]
     
     # Dois eixos Y para energia e amplitude
     ax1 = plt.gca()
@@ -255,14 +276,22 @@ entre difusão e onda!
     plt.tight_layout()
     
     # Salvar
-    plt.savefig('output/onda_1d_solucao.png', dpi=300, bbox_inches='tight',
-                facecolor='white', edgecolor='none')
-    plt.show()
+    caminho = salvar_figura(fig, 'output/onda_1d_solucao.png', 300, perfil,
+                            bbox_inches='tight', facecolor='white', edgecolor='none')
     print("💾 Gráfico Onda salvo: output/onda_1d_solucao.png")
+    return caminho
 
-def plotar_convergencia_onda(n_terms_list, errors):
-    """Plota análise de convergência da equação da onda"""
-    plt.figure(figsize=(10, 6))
+def plotar_solucoes_onda(solutions, n_terms_list, perfil=None):
+    """Plota as soluções da equação da onda com ESTILO ÚNICO - Acústica/Vibrações"""
+    campos = calcular_campos_onda(solutions, n_terms_list)
+    return renderizar(__name__, "desenhar_solucoes_onda", campos, perfil)["caminho"]
+
+def desenhar_convergencia_onda(campos, perfil=None):
+    """Desenha a convergência a partir de {n_terms_list, errors}"""
+    plt = pyplot()
+    n_terms_list = campos["n_terms_list"]
+    errors = campos["errors"]
+    fig = plt.figure(figsize=(10, 6))
     
     plt.loglog(n_terms_list, errors, 'go-', linewidth=2, markersize=8, 
                label='Erro Onda 1D')
@@ -273,7 +302,7 @@ def plotar_convergencia_onda(n_terms_list, errors):
     plt.loglog(x_ref, y_ref, 'r--', alpha=0.7, label='Referência O(1/N)')
     
     plt.xlabel('Número de Termos (N)')
-    plt.ylabel('Erro Normalizado')
+    plt.ylabel('Erro L²')
     plt.title('Convergência - Equação da Onda 1D')
     plt.legend()
     plt.grid(True, alpha=0.3)
@@ -285,13 +314,18 @@ def plotar_convergencia_onda(n_terms_list, errors):
                 transform=plt.gca().transAxes, fontsize=12,
                 bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.8))
     
-    plt.savefig('output/onda_1d_convergencia.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    caminho = salvar_figura(fig, 'output/onda_1d_convergencia.png', 300, perfil,
+                            bbox_inches='tight')
     print("💾 Convergência salva: output/onda_1d_convergencia.png")
+    return caminho
+
+def plotar_convergencia_onda(n_terms_list, errors, perfil=None):
+    """Plota análise de convergência da equação da onda"""
+    campos = {"n_terms_list": list(n_terms_list), "errors": list(errors)}
+    return renderizar(__name__, "desenhar_convergencia_onda", campos, perfil)["caminho"]
 
 def main():
     """Função principal"""
-    import os
     os.makedirs('output', exist_ok=True)
     
     try:
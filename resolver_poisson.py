@@ -5,13 +5,15 @@ Equação: -d²u/dx² = Q(x) com Q(x) = 1/x
 Domínio: [0.01, 1] com u(0.01) = u(1) = 0
 """
 
+import os
 import numpy as np
-import matplotlib.pyplot as plt
 import sys
 sys.path.insert(0, 'core')
 
 from galerkin_solver import GalerkinSolver
+from convergence_analyzer import ConvergenceAnalyzer, truncation_family
 from problems import EDPCatalog
+from renderizacao import pyplot, renderizar, salvar_figura
 
 def resolver_poisson():
     """Resolve a equação de Poisson com diferentes números de termos"""
@@ -25,47 +27,74 @@ def resolver_poisson():
     # Obter problema
     catalog = EDPCatalog()
     problem = catalog.get_problem('poisson_1d')
-    solver = GalerkinSolver()
+    # Coeficientes reaproveitados entre execuções (cache em disco)
+    solver = GalerkinSolver(cache_dir=os.environ.get('EDP_CACHE_DIR', '.edp_cache'))
+    
+    # N das figuras: o menor que atinge a tolerância pelo decaimento dos
+    # coeficientes; o estudo de convergência usa truncamentos até ele
+    _, adaptativo = solver.solve_to_tolerance(problem, 1e-4)
+    n_terms_list = truncation_family(adaptativo['n_terms'])
+    print(f"Adaptativo (tol = 1e-4): N = {adaptativo['n_terms']}, "
+          f"erro L² estimado = {adaptativo['error_estimate']:.3e}")
+    
+    # Resolver uma única vez com N_max e obter cada n_terms por truncamento
+    print(f"Resolvendo com {max(n_terms_list)} termos (família {n_terms_list})...")
+    solutions = solver.solve_family(problem, n_terms_list)
+    # Erros L², H¹ e máximo de toda a família por quadratura de Gauss,
+    # contra a solução analítica ou uma referência com 4·N_max termos
+    analyzer = ConvergenceAnalyzer(solver)
+    norms = analyzer.error_norms(solutions, n_terms_list, problem)
+    # Erros nulos (solução exata na base) aparecem como ε no gráfico log
+    errors = np.maximum(norms['l2'], np.finfo(float).eps).tolist()
+    
+    for n_terms, l2, h1, e_max in zip(n_terms_list, norms['l2'], norms['h1'], norms['max']):
+        print(f"  N = {n_terms:3d}: erro L² = {l2:.3e}, H¹ = {h1:.3e}, máx = {e_max:.3e}")
+    
+    # Subtraindo a parte particular -x ln x, Galerkin só resolve o resto suave
+    separadas = solver.solve_family(problem, n_terms_list, subtract_particular=True)
+    erros_separados = analyzer.error_norms(separadas, n_terms_list, problem)['l2']
+    print(f"  Com subtração da singularidade: erro L² máximo = {erros_separados.max():.3e} "
+          f"(N = {min(n_terms_list)}..{max(n_terms_list)})")
     
-    # Diferentes números de termos para análise
-    n_terms_list = [5, 10, 15, 20, 25, 30]
-    
-    # Resolver para cada n_terms
-    solutions = {}
-    errors = []
+    return solutions, n_terms_list, errors
+
+def calcular_campos_poisson(solutions, n_terms_list):
+    """Calcula os arrays usados no gráfico da solução (sem matplotlib)"""
+    x = np.linspace(0.001, 1, 200)  # Evitando x=0 por causa da singularidade
+    max_terms = max(n_terms_list)
+    u_final = solutions[max_terms](x)
     
-    for n_terms in n_terms_list:
-        print(f"Resolvendo com {n_terms} termos...")
-        solution = solver.solve(problem, n_terms)
-        solutions[n_terms] = solution
-        
-        # Calcular uma medida de erro simples (norma da solução)
-        # Evitando pontos muito próximos de x=0
-        x_test = np.linspace(0.001, 1, 100)
-        u_vals = solution(x_test)
-        error = np.sqrt(np.mean(u_vals**2)) / n_terms  # Erro normalizado
-        errors.append(error)
-        print(f"  Erro normalizado: {error:.6f}")
+    # Solução aproximada estrutural (deflexão de viga)
+    u_beam = -x * np.log(x) + x - 0.01 * np.log(0.01) + 0.01
+    x_source = np.linspace(0.001, 1, 500)  # Evitando x=0
     
-    return solutions, n_terms_list, errors
+    return {
+        "x": x,
+        "max_terms": max_terms,
+        "u_final": u_final,
+        "curvas": {n_terms: solutions[n_terms](x) for n_terms in n_terms_list},
+        "E_field": -solutions[max_terms].dx(x),  # Campo elétrico = -du/dx, exato na série
+        "x_source": x_source,
+        "rho": EDPCatalog().get_problem('poisson_1d')["source"](x_source),  # Densidade de carga
+        "u_beam": u_beam - u_beam[-1],  # Normalizar
+    }
 
-def plotar_solucoes_poisson(solutions, n_terms_list):
-    """Plota as soluções da equação de Poisson com ESTILO ÚNICO - Engenharia Estática"""
+def desenhar_solucoes_poisson(campos, perfil=None):
+    """Desenha o gráfico da solução de Poisson a partir dos campos pré-calculados"""
+    plt = pyplot()
     fig = plt.figure(figsize=(18, 14))
     fig.patch.set_facecolor('#f8f9fa')
     
-    x = np.linspace(0.001, 1, 200)  # Evitando x=0 por causa da singularidade
-    max_terms = max(n_terms_list)
-    u_final = solutions[max_terms](x)
+    x = campos["x"]
+    max_terms = campos["max_terms"]
+    u_final = campos["u_final"]
     
     # Subplot 1: POTENCIAL ELÉTRICO - Estilo engenharia com isolinhas
     plt.subplot(2, 3, 1)
     colors = ['#2c3e50', '#3498db', '#e74c3c', '#f39c12', '#27ae60', '#9b59b6']
-    for i, n_terms in enumerate([5, 10, 15, 20, 25, 30]):
-        if n_terms in solutions:
-            u = solutions[n_terms](x)
-            plt.plot(x, u, color=colors[i % len(colors)], linewidth=3, 
-                    label=f'N={n_terms}', marker='o', markersize=3)
+    for i, (n_terms, u) in enumerate(campos["curvas"].items()):
+        plt.plot(x, u, color=colors[i % len(colors)], linewidth=3, 
+                label=f'N={n_terms}', marker='o', markersize=3)
     
     # Fundo gradiente simulando campo potencial
     X, Y = np.meshgrid(x, np.linspace(min(u_final)*1.2, max(u_final)*1.2, 20))
@@ -81,8 +110,7 @@ def plotar_solucoes_poisson(solutions, n_terms_list):
     
     # Subplot 2: CAMPO ELÉTRICO - Gradiente com visualização vetorial
     plt.subplot(2, 3, 2)
-    dx = x[1] - x[0]
-    E_field = -np.gradient(u_final, dx)  # Campo elétrico = -grad(u)
+    E_field = campos["E_field"]
     
     # Plot principal do campo
     plt.plot(x, E_field, 'darkred', linewidth=4, label='Campo E = -∇u')
@@ -106,8 +134,8 @@ def plotar_solucoes_poisson(solutions, n_terms_list):
     
     # Subplot 3: DENSIDADE DE CARGA - Singularidade destacada
     plt.subplot(2, 3, 3)
-    x_source = np.linspace(0.001, 1, 500)  # Evitando x=0
-    rho = 1.0 / x_source  # Densidade de carga
+    x_source = campos["x_source"]
+    rho = campos["rho"]
     
     # Plot em escala log-log para destacar singularidade
     plt.loglog(x_source, rho, 'purple', linewidth=4, label='ρ(x) = 1/x')
@@ -142,9 +170,7 @@ def plotar_solucoes_poisson(solutions, n_terms_list):
     
     # Subplot 5: ANÁLISE ESTRUTURAL - Comparação com viga deflectida
     plt.subplot(2, 3, 5)
-    # Solução aproximada estrutural (deflexão de viga)
-    u_beam = -x * np.log(x) + x - 0.01 * np.log(0.01) + 0.01
-    u_beam = u_beam - u_beam[-1]  # Normalizar
+    u_beam = campos["u_beam"]
     
     plt.plot(x, u_final, 'blue', linewidth=4, label=f'Solução Galerkin (N={max_terms})', 
              marker='s', markersize=4, markevery=10)
@@ -203,14 +229,22 @@ APLICAÇÕES:
     plt.tight_layout(rect=[0, 0, 1, 0.96])
     
     # Salvar com qualidade alta e fundo técnico
-    plt.savefig('output/poisson_1d_solucao.png', dpi=350, bbox_inches='tight', 
-                facecolor='#f8f9fa', edgecolor='navy', linewidth=2)
-    plt.show()
+    caminho = salvar_figura(fig, 'output/poisson_1d_solucao.png', 350, perfil,
+                            bbox_inches='tight', facecolor='#f8f9fa', edgecolor='navy')
     print("💾 Gráfico Poisson salvo: output/poisson_1d_solucao.png")
+    return caminho
 
-def plotar_convergencia_poisson(n_terms_list, errors):
-    """Plota análise de convergência da equação de Poisson"""
-    plt.figure(figsize=(10, 6))
+def plotar_solucoes_poisson(solutions, n_terms_list, perfil=None):
+    """Plota as soluções da equação de Poisson com ESTILO ÚNICO - Engenharia Estática"""
+    campos = calcular_campos_poisson(solutions, n_terms_list)
+    return renderizar(__name__, "desenhar_solucoes_poisson", campos, perfil)["caminho"]
+
+def desenhar_convergencia_poisson(campos, perfil=None):
+    """Desenha a convergência a partir de {n_terms_list, errors}"""
+    plt = pyplot()
+    n_terms_list = campos["n_terms_list"]
+    errors = campos["errors"]
+    fig = plt.figure(figsize=(10, 6))
     
     plt.loglog(n_terms_list, errors, 'bo-', linewidth=2, markersize=8, 
                label='Erro Galerkin')
@@ -221,7 +255,7 @@ def plotar_convergencia_poisson(n_terms_list, errors):
     plt.loglog(x_ref, y_ref, 'r--', alpha=0.7, label='Referência O(1/N)')
     
     plt.xlabel('Número de Termos (N)')
-    plt.ylabel('Erro Normalizado')
+    plt.ylabel('Erro L²')
     plt.title('Convergência - Equação de Poisson 1D')
     plt.legend()
     plt.grid(True, alpha=0.3)
@@ -236,13 +270,18 @@ def plotar_convergencia_poisson(n_terms_list, errors):
                 transform=plt.gca().transAxes, fontsize=12,
                 bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
     
-    plt.savefig('output/poisson_1d_convergencia.png', dpi=300, bbox_inches='tight')
-    plt.show()
+    caminho = salvar_figura(fig, 'output/poisson_1d_convergencia.png', 300, perfil,
+                            bbox_inches='tight')
     print("💾 Convergência salva: output/poisson_1d_convergencia.png")
+    return caminho
+
+def plotar_convergencia_poisson(n_terms_list, errors, perfil=None):
+    """Plota análise de convergência da equação de Poisson"""
+    campos = {"n_terms_list": list(n_terms_list), "errors": list(errors)}
+    return renderizar(__name__, "desenhar_convergencia_poisson", campos, perfil)["caminho"]
 
 def main():
     """Função principal"""
-    import os
     os.makedirs('output', exist_ok=True)
     
     try:
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Testes do cache de coeficientes em disco (core/cache.py)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core'))
+
+import numpy as np
+import pytest
+
+from galerkin_solver import GalerkinSolver
+from problems import EDPCatalog
+
+
+def _sem_resolver(*args, **kwargs):
+    raise AssertionError("o cache deveria ter evitado a resolução")
+
+
+@pytest.fixture
+def problema():
+    return EDPCatalog().get_problem('heat_1d')
+
+
+def test_falta_e_acerto(tmp_path, problema):
+    solver = GalerkinSolver(cache_dir=str(tmp_path))
+    original = solver.solve(problema, 16)
+    assert len(solver.cache.entries()) == 1
+
+    # Um novo solver no mesmo diretório lê os coeficientes sem resolver
+    outro = GalerkinSolver(cache_dir=str(tmp_path))
+    outro._solve = _sem_resolver
+    lida = outro.solve(problema, 16)
+    x = np.linspace(0, 1, 11)
+    np.testing.assert_array_equal(lida.coeffs, original.coeffs)
+    np.testing.assert_allclose(lida(x, 0.3), original(x, 0.3))
+
+
+def test_familia_reaproveita_entradas(tmp_path, problema):
+    GalerkinSolver(cache_dir=str(tmp_path)).solve_family(problema, [4, 8, 16])
+    solver = GalerkinSolver(cache_dir=str(tmp_path))
+    solver._solve_family = _sem_resolver
+    family = solver.solve_family(problema, [4, 8, 16])
+    assert sorted(family) == [4, 8, 16]
+
+
+def test_versao_invalida(tmp_path, problema, monkeypatch):
+    GalerkinSolver(cache_dir=str(tmp_path)).solve(problema, 16)
+    monkeypatch.setattr(GalerkinSolver, "VERSION", GalerkinSolver.VERSION + "-teste")
+    solver = GalerkinSolver(cache_dir=str(tmp_path))
+    solver.solve(problema, 16)
+    assert len(solver.cache.entries()) == 2
+
+
+def test_problema_alterado_invalida(tmp_path, problema):
+    def com_condicao_inicial(k):
+        # Mesmo código, valor capturado diferente: só as amostras distinguem
+        inicial = lambda x: np.sin(k * np.pi * x)
+        condicoes = [bc for bc in problema["boundary_conditions"] if bc[0] != "initial"]
+        return dict(problema, boundary_conditions=condicoes + [("initial", "u", inicial)])
+
+    solver = GalerkinSolver(cache_dir=str(tmp_path))
+    solver.solve(problema, 16)
+    solver.solve(dict(problema, time_domain=(0, 0.2)), 16)
+    solver.solve(com_condicao_inicial(1), 16)
+    solver.solve(com_condicao_inicial(2), 16)
+    assert len(solver.cache.entries()) == 4
+    # n_terms diferente também é outra entrada
+    solver.solve(problema, 8)
+    assert len(solver.cache.entries()) == 5
+
+
+def test_despejo_lru(tmp_path, problema):
+    solver = GalerkinSolver(cache_dir=str(tmp_path))
+    solver.solve(problema, 16)
+    tamanho = solver.cache.entries()[0][1]
+    solver.cache.max_bytes = 2 * tamanho
+    for n_terms in (17, 18):
+        solver.solve(problema, n_terms)
+    assert len(solver.cache.entries()) <= 2
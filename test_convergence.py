@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Testes das normas de erro medidas pelo ConvergenceAnalyzer
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core'))
+
+import numpy as np
+import pytest
+
+from convergence_analyzer import ConvergenceAnalyzer
+from galerkin_solver import GalerkinSolver
+from problems import EDPCatalog
+
+# u = sin(πx) + 0.1 sin(3πx): com N = 1 ou 2 o erro é exatamente -0.1 sin(3πx)
+DOIS_MODOS = {
+    "domain": (0, 1),
+    "source": lambda x: np.pi**2 * (np.sin(np.pi * x) + 0.9 * np.sin(3 * np.pi * x)),
+    "analytical": lambda x: np.sin(np.pi * x) + 0.1 * np.sin(3 * np.pi * x),
+    "tipo": "eliptica_1d",
+}
+
+
+def test_normas_contra_valores_fechados():
+    solver = GalerkinSolver()
+    n_terms_list = [1, 2, 3, 8]
+    family = solver.solve_family(DOIS_MODOS, n_terms_list)
+    normas = ConvergenceAnalyzer(solver).error_norms(family, n_terms_list, DOIS_MODOS)
+
+    # ‖0.1 sin(3πx)‖² = 0.01/2 e ‖0.3π cos(3πx)‖² = 0.09π²/2
+    l2 = np.sqrt(0.01 / 2)
+    np.testing.assert_allclose(normas["l2"][:2], l2, rtol=1e-6)
+    np.testing.assert_allclose(normas["h1"][:2], np.sqrt(0.01 / 2 + 0.09 * np.pi**2 / 2), rtol=1e-5)
+    np.testing.assert_allclose(normas["max"][:2], 0.1, rtol=1e-3)
+    # A partir de N = 3 a solução está na base
+    assert np.all(normas["l2"][2:] < 1e-10)
+
+
+def test_analyze_devolve_a_norma_pedida():
+    solver = GalerkinSolver()
+    analyzer = ConvergenceAnalyzer(solver)
+    family = solver.solve_family(DOIS_MODOS, [1, 3])
+    assert analyzer.analyze(family, [1, 3], DOIS_MODOS, norm="max") == \
+        analyzer.error_norms(family, [1, 3], DOIS_MODOS)["max"].tolist()
+    with pytest.raises(ValueError):
+        analyzer.analyze(family, [1, 3], DOIS_MODOS, norm="l1")
+
+
+def test_referencia_sem_solucao_analitica():
+    # heat_1d não tem solução analítica: o erro é medido contra uma
+    # referência com mais termos e deve decrescer com N
+    problema = EDPCatalog().get_problem('heat_1d')
+    solver = GalerkinSolver()
+    n_terms_list = [2, 4, 8]
+    family = solver.solve_family(problema, n_terms_list)
+    normas = ConvergenceAnalyzer(solver).error_norms(family, n_terms_list, problema)
+    assert np.all(np.diff(normas["l2"]) < 0)
+    assert np.all(normas["h1"] >= normas["l2"])
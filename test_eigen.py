@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Testes da API de autopares de Helmholtz (GalerkinSolver.eigenmodes)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core'))
+
+import numpy as np
+import pytest
+
+from galerkin_solver import GalerkinSolver
+from problems import EDPCatalog
+
+
+@pytest.fixture
+def problema():
+    return EDPCatalog().get_problem('helmholtz_2d')
+
+
+def _exatos(k, meia_onda_y):
+    """Menores μ = (mπ)² + (νπ)², com ν = n - ½ (Neumann em y = 1) ou ν = n"""
+    m, n = np.meshgrid(np.arange(1, 11), np.arange(1, 11) - (0.5 if meia_onda_y else 0.0))
+    return np.sort((np.pi**2 * (m**2 + n**2)).ravel())[:k]
+
+
+def test_autovalores_espectrais_exatos(problema):
+    autovalores, modos = GalerkinSolver().eigenmodes(problema, k=10)
+    np.testing.assert_allclose(autovalores, _exatos(10, meia_onda_y=True), rtol=1e-12)
+    assert len(modos) == 10
+
+
+def test_autovalores_dirichlet(problema):
+    condicoes = [("dirichlet", lado, 0) for lado in ("x0", "x1", "y0", "y1")]
+    dirichlet = dict(problema, boundary_conditions=condicoes)
+    autovalores, _ = GalerkinSolver().eigenmodes(dirichlet, k=6)
+    np.testing.assert_allclose(autovalores, _exatos(6, meia_onda_y=False), rtol=1e-12)
+
+
+def test_modo_resolve_o_problema_de_autovalor(problema):
+    autovalores, modos = GalerkinSolver().eigenmodes(problema, k=3)
+    x = np.linspace(0.05, 0.95, 19)
+    pontos = np.linspace(0, 1, 2001)
+    for mu, modo in zip(autovalores, modos):
+        # -∇²φ = μφ, ‖φ‖_L² = 1 e φ = 0 em x = 0
+        np.testing.assert_allclose(modo.laplacian(x, x), -mu * modo(x, x), atol=1e-8)
+        quadrado = modo.evaluate_grid(pontos, pontos)**2
+        assert np.trapezoid(np.trapezoid(quadrado, pontos), pontos) == pytest.approx(1, rel=1e-5)
+        np.testing.assert_allclose(modo(0.0, x), 0.0, atol=1e-12)
+
+
+def test_alvo_seleciona_o_mais_proximo(problema):
+    autovalores, _ = GalerkinSolver().eigenmodes(problema, k=1, target=40.0)
+    # (m, n) = (2, 1): 4π² + π²/4 ≈ 41.95
+    assert autovalores[0] == pytest.approx(4.25 * np.pi**2, rel=1e-12)
+
+
+def test_autovalores_fem_convergem(problema):
+    exatos = _exatos(4, meia_onda_y=True)
+    erros = []
+    for n in (32, 64):
+        autovalores, modos = GalerkinSolver().eigenmodes(problema, k=4, n_terms=n, method="fem")
+        erros.append(np.abs(autovalores - exatos) / exatos)
+        assert len(modos) == 4
+    # Q1: erro O(h²) nos autovalores
+    assert np.all(erros[1] < 2e-3)
+    np.testing.assert_allclose(erros[0] / erros[1], 4, rtol=0.1)
+
+
+def test_ressonancia(problema):
+    solver = GalerkinSolver()
+    assert not solver.resonance(problema)["resonant"]
+    ressonante = dict(problema, lambda_param=1.25 * np.pi**2)
+    relatorio = solver.resonance(ressonante)
+    assert relatorio["resonant"]
+    assert relatorio["eigenvalue"] == pytest.approx(1.25 * np.pi**2, rel=1e-12)
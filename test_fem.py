@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Testes dos elementos finitos P1/P2 em 1D (core/fem.py)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core'))
+
+import numpy as np
+import pytest
+
+from fem import solve_elliptic
+from galerkin_solver import GalerkinSolver
+from problems import EDPCatalog
+
+# -u'' = π² sin(πx) em (0, 1) com u = 0 nas extremidades: u = sin(πx)
+SENO = {
+    "domain": (0, 1),
+    "source": lambda x: np.pi**2 * np.sin(np.pi * x),
+    "analytical": lambda x: np.sin(np.pi * x),
+    "singularities": [],
+    "tipo": "eliptica_1d",
+}
+ELEMENTOS = [8, 16, 32, 64]
+
+
+def _erros(solucao, exata, exata_dx):
+    """Erros L² e H¹ (seminorma) por Gauss em cada elemento (sem atravessar nós)"""
+    xi, wi = np.polynomial.legendre.leggauss(6)
+    v = solucao.vertices
+    h = np.diff(v)
+    x = (v[:-1, None] + 0.5 * h[:, None] * (xi + 1)).ravel()
+    w = (0.5 * h[:, None] * wi).ravel()
+    erro = solucao(x) - exata(x)
+    erro_dx = solucao.dx(x) - exata_dx(x)
+    return np.sqrt(erro**2 @ w), np.sqrt(erro_dx**2 @ w)
+
+
+def _taxas(problema, exata, exata_dx, order, grading=None):
+    erros = np.array([_erros(solve_elliptic(problema, n, order, grading), exata, exata_dx)
+                      for n in ELEMENTOS])
+    # Inclinação log-log de cada norma contra h = 1/n
+    return [-np.polyfit(np.log(ELEMENTOS), np.log(erros[:, i]), 1)[0] for i in range(2)]
+
+
+@pytest.mark.parametrize("order", [1, 2])
+def test_ordens_malha_uniforme(order):
+    l2, h1 = _taxas(SENO, SENO["analytical"], lambda x: np.pi * np.cos(np.pi * x), order)
+    assert l2 == pytest.approx(order + 1, abs=0.1)
+    assert h1 == pytest.approx(order, abs=0.1)
+
+
+@pytest.mark.parametrize("order", [1, 2])
+def test_malha_graduada_recupera_ordem(order):
+    # u = -x ln x tem u' ~ -ln x: a malha graduada em direção a x = 0
+    # recupera a ordem ótima em L² que a malha uniforme perde
+    problema = EDPCatalog().get_problem('poisson_1d')
+    exata = problema["analytical"]
+    exata_dx = problema["particular"]["dx"]
+    uniforme, _ = _taxas(problema, exata, exata_dx, order)
+    graduada, _ = _taxas(problema, exata, exata_dx, order, grading=order + 1)
+    assert graduada == pytest.approx(order + 1, abs=0.2)
+    assert graduada > uniforme + 0.3
+
+
+def test_solver_despacha_para_fem():
+    problema = EDPCatalog().get_problem('poisson_1d')
+    solucao = GalerkinSolver().solve(problema, 32, method="fem", order=2, grading=3)
+    direta = solve_elliptic(problema, 32, order=2, grading=3)
+    np.testing.assert_array_equal(np.asarray(solucao), np.asarray(direta))
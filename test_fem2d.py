@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Testes dos elementos finitos Q1 com multigrid para Helmholtz 2D (core/fem2d.py)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core'))
+
+import numpy as np
+import pytest
+import scipy.sparse.linalg as spla
+
+from fem2d import FEMSolution2D, solve_helmholtz
+from galerkin_solver import GalerkinSolver
+from problems import EDPCatalog
+
+
+@pytest.fixture
+def problema():
+    return EDPCatalog().get_problem('helmholtz_2d')
+
+
+def _gauss_por_elemento(vertices, n=4):
+    """Nós e pesos de Gauss em cada elemento (sem atravessar vértices)"""
+    xi, wi = np.polynomial.legendre.leggauss(n)
+    h = np.diff(vertices)
+    return ((vertices[:-1, None] + 0.5 * h[:, None] * (xi + 1)).ravel(),
+            (0.5 * h[:, None] * wi).ravel())
+
+
+def _erro_l2(solucao, exata):
+    x, wx = _gauss_por_elemento(solucao.vertices_x)
+    y, wy = _gauss_por_elemento(solucao.vertices_y)
+    erro = solucao.evaluate_grid(x, y) - exata(x[None, :], y[:, None])
+    return np.sqrt(wy @ erro**2 @ wx)
+
+
+def test_ordem_q1_contra_solucao_manufaturada(problema):
+    elementos = [8, 16, 32, 64]
+    erros = [_erro_l2(solve_helmholtz(problema, n), problema["analytical"]) for n in elementos]
+    ordem = -np.polyfit(np.log(elementos), np.log(erros), 1)[0]
+    assert ordem == pytest.approx(2, abs=0.1)
+    assert erros[-1] < 1e-4
+
+
+def test_multigrid_independente_da_malha(problema, monkeypatch):
+    """CG com o ciclo V converge em poucas iterações, quase sem depender de h"""
+    cg = spla.cg
+    iteracoes = []
+
+    def cg_contado(A, b, **kwargs):
+        contagem = [0]
+        kwargs["callback"] = lambda xk: contagem.__setitem__(0, contagem[0] + 1)
+        solucao, info = cg(A, b, **kwargs)
+        assert info == 0, "o CG precondicionado não deveria cair no GMRES"
+        iteracoes.append(contagem[0])
+        return solucao, info
+
+    monkeypatch.setattr(spla, "cg", cg_contado)
+    for n in (32, 64, 128):
+        solve_helmholtz(problema, n)
+    assert max(iteracoes) <= 20
+    assert iteracoes[-1] <= iteracoes[0] + 3
+
+
+def test_solver_fem_concorda_com_espectral(problema):
+    fem = GalerkinSolver().solve(problema, 64, method="fem")
+    assert isinstance(fem, FEMSolution2D)
+    espectral = GalerkinSolver().solve(problema, 32)
+    x = np.linspace(0, 1, 21)
+    np.testing.assert_allclose(fem.evaluate_grid(x, x), espectral.evaluate_grid(x, x),
+                               atol=1e-4)
+    # Avaliação pontual (fora da grade tensorial) coerente com a da grade
+    np.testing.assert_allclose(fem(x, x), np.diag(fem.evaluate_grid(x, x)), atol=1e-12)
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Testes do vetor de carga da base de senos (core/load_vector.py)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core'))
+
+import numpy as np
+import pytest
+from scipy import integrate
+
+from load_vector import sine_load_vector
+from problems import EDPCatalog
+
+
+def test_forma_fechada_si_contra_quadratura():
+    problema = EDPCatalog().get_problem('poisson_1d')
+    n_terms = 64
+    b = sine_load_vector(problema["source"], n_terms, problema["domain"],
+                         source_form=problema["source_form"])
+    # sin(kπx)/x = kπ sinc(kx) é suave em x = 0
+    esperado = [integrate.quad(lambda x, k=k: k * np.pi * np.sinc(k * x), 0, 1,
+                               limit=200, epsabs=1e-13)[0]
+                for k in range(1, n_terms + 1)]
+    np.testing.assert_allclose(b, esperado, rtol=1e-10, atol=1e-12)
+
+
+# Gauss–Legendre converge exponencialmente (integrando suave); a DST é
+# a regra do ponto médio com correção nas extremidades (O(h⁴))
+@pytest.mark.parametrize("method, atol", [("gauss", 1e-12), ("dst", 1e-5)])
+def test_quadratura_fonte_constante(method, atol):
+    # ∫₀² sin(kπx/2) dx = 2 (1 - cos kπ) / (kπ)
+    n_terms = 32
+    k = np.arange(1, n_terms + 1)
+    b = sine_load_vector(lambda x: np.ones_like(x), n_terms, (0, 2), method=method)
+    np.testing.assert_allclose(b, 2 * (1 - np.cos(k * np.pi)) / (k * np.pi), atol=atol)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Testes dos operadores estruturados (core/operators.py)
+"""
+
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core'))
+
+import numpy as np
+import pytest
+
+from operators import (BandedOperator, DenseOperator, DiagonalOperator, MatrixFreeOperator,
+                       from_matrix)
+
+N = 40
+
+
+def _pentadiagonal(n=N):
+    """Matriz simétrica positiva definida com semilargura de banda 2"""
+    return (np.diag(4.0 + np.arange(n)) + np.diag(np.ones(n - 1), 1) + np.diag(np.ones(n - 1), -1)
+            + 0.5 * np.diag(np.ones(n - 2), 2) + 0.5 * np.diag(np.ones(n - 2), -2))
+
+
+def _operadores(A):
+    return {
+        "banda": BandedOperator.from_matrix(A, 2),
+        "densa": DenseOperator(A, symmetric=True),
+        "densa geral": DenseOperator(A),
+        "livre de matriz": MatrixFreeOperator(lambda x: A @ x, A.shape[0]),
+    }
+
+
+@pytest.mark.parametrize("nome", ["banda", "densa", "densa geral", "livre de matriz"])
+def test_interface_comum(nome):
+    A = _pentadiagonal()
+    operador = _operadores(A)[nome]
+    b = np.random.default_rng(0).standard_normal(N)
+    assert operador.shape == A.shape
+    np.testing.assert_allclose(operador.to_dense(), A)
+    np.testing.assert_allclose(operador.diagonal(), np.diag(A))
+    np.testing.assert_allclose(operador.matvec(b), A @ b)
+    np.testing.assert_allclose(operador.solve(b), np.linalg.solve(A, b), rtol=1e-8)
+
+
+def test_banda_reaproveita_o_fator():
+    operador = BandedOperator.from_matrix(_pentadiagonal(), 2)
+    fator = operador.factor()
+    operador.solve(np.ones(N))
+    assert operador.factor() is fator
+
+
+def test_from_matrix_escolhe_a_representacao():
+    A = _pentadiagonal()
+    assert isinstance(from_matrix(np.diag(np.arange(1.0, N + 1))), DiagonalOperator)
+    assert isinstance(from_matrix(A, symmetric=True), BandedOperator)
+    # Cholesky em banda exige simetria; matrizes pequenas ou largas ficam densas
+    assert isinstance(from_matrix(A), DenseOperator)
+    assert isinstance(from_matrix(_pentadiagonal(8), symmetric=True), DenseOperator)
+
+
+@pytest.mark.parametrize("nome", ["banda", "densa", "densa geral", "livre de matriz"])
+def test_blocos_lideres(nome):
+    A = _pentadiagonal()
+    b = np.random.default_rng(1).standard_normal(N)
+    tamanhos = [3, 10, 25, N]
+    familia = _operadores(A)[nome].solve_leading(b, tamanhos)
+    assert sorted(familia) == tamanhos
+    for n in tamanhos:
+        np.testing.assert_allclose(familia[n], np.linalg.solve(A[:n, :n], b[:n]), rtol=1e-8)
+
+
+def test_blocos_lideres_diagonal_trunca():
+    d = np.arange(1.0, N + 1)
+    familia = DiagonalOperator(d).solve_leading(np.ones(N), [5, N])
+    np.testing.assert_array_equal(familia[5], 1 / d[:5])
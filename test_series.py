@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Testes dos objetos de solução em série (core/series.py)
+"""
+
+import os
+import pickle
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'core'))
+
+import numpy as np
+import pytest
+
+from galerkin_solver import GalerkinSolver
+from problems import EDPCatalog
+from series import SeriesSolution, SeriesSolution2D, SplitSolution
+
+x = np.linspace(0, 1, 17)
+t = np.array([0.0, 0.05, 0.1])
+
+
+def _ida_e_volta(solucao):
+    copia = pickle.loads(pickle.dumps(solucao))
+    assert type(copia) is type(solucao)
+    return copia
+
+
+@pytest.mark.parametrize("nome", ["poisson_1d", "heat_1d", "wave_1d"])
+def test_pickle_series_solution(nome):
+    solucao = GalerkinSolver().solve(EDPCatalog().get_problem(nome), 24)
+    assert isinstance(solucao, SeriesSolution)
+    copia = _ida_e_volta(solucao)
+    np.testing.assert_array_equal(copia.coeffs, solucao.coeffs)
+    np.testing.assert_array_equal(copia.decay, solucao.decay)
+    assert copia.domain == solucao.domain
+    np.testing.assert_array_equal(copia.evaluate_grid(x, t), solucao.evaluate_grid(x, t))
+    np.testing.assert_array_equal(copia.dx(x, 0.05), solucao.dx(x, 0.05))
+
+
+def test_pickle_series_solution_2d():
+    solucao = GalerkinSolver().solve(EDPCatalog().get_problem('helmholtz_2d'), 12)
+    assert isinstance(solucao, SeriesSolution2D)
+    copia = _ida_e_volta(solucao)
+    np.testing.assert_array_equal(copia.coeffs, solucao.coeffs)
+    assert copia.kinds == solucao.kinds
+    for derivative in (None, "x", "y"):
+        np.testing.assert_array_equal(copia.evaluate_grid(x, x, derivative),
+                                      solucao.evaluate_grid(x, x, derivative))
+
+
+def test_pickle_split_solution():
+    solucao = GalerkinSolver().solve(EDPCatalog().get_problem('poisson_1d'), 24,
+                                     subtract_particular=True)
+    assert isinstance(solucao, SplitSolution)
+    copia = _ida_e_volta(solucao)
+    # A parte particular viaja por referência às funções de módulo do catálogo
+    assert copia.particular is solucao.particular
+    assert copia.particular_dx is solucao.particular_dx
+    assert copia.particular_source is solucao.particular_source
+    np.testing.assert_array_equal(copia.coeffs, solucao.coeffs)
+    x_interior = x[1:-1]
+    np.testing.assert_array_equal(copia(x_interior), solucao(x_interior))
+    np.testing.assert_array_equal(copia.dx(x_interior), solucao.dx(x_interior))
+    np.testing.assert_array_equal(copia.laplacian(x_interior), solucao.laplacian(x_interior))